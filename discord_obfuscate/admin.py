@@ -7,15 +7,21 @@ from collections.abc import Mapping
 # Django
 from django.contrib import admin, messages
 from django.contrib.auth.models import Group
-from django.http import JsonResponse
-from django.urls import path
+from django.db import transaction
+from django.db.models import Max
+from django.http import HttpResponse, JsonResponse
+from django.urls import path, reverse
+from django.utils import timezone
+from django.utils.html import format_html
 
 # Third Party
 from solo.admin import SingletonModelAdmin
 
 # Discord Obfuscate App
-from discord_obfuscate.constants import DEFAULT_OBFUSCATE_METHOD
-from discord_obfuscate.config import default_obfuscation_values, sync_on_save_enabled
+from discord_obfuscate import metrics
+from discord_obfuscate.cache import bump_mapping_version
+from discord_obfuscate.constants import ROLE_MATCH_NONE
+from discord_obfuscate.config import sync_on_save_enabled
 from discord_obfuscate.forms import (
     DiscordObfuscateConfigForm,
     DiscordRoleObfuscationForm,
@@ -28,6 +34,8 @@ from discord_obfuscate.models import (
     DiscordRoleObfuscation,
     DiscordRoleOrder,
     DiscordRoleOrderConfig,
+    RolesetSnapshot,
+    SyncRun,
 )
 from discord_obfuscate.obfuscation import (
     fetch_roleset,
@@ -35,7 +43,13 @@ from discord_obfuscate.obfuscation import (
     role_name_for_group,
 )
 from discord_obfuscate.role_colors import to_hex
-from discord_obfuscate.tasks import sync_all_roles, sync_group_role
+from discord_obfuscate.role_index import (
+    get_eligible_group_ids,
+    opt_out_role_configs,
+    store_eligible_groups,
+)
+
+DISCOVER_BACKGROUND_THRESHOLD = 200
 
 # Register your models here.
 
@@ -75,6 +89,9 @@ def _role_is_everyone(role) -> bool:
 @admin.register(DiscordRoleObfuscation)
 class DiscordRoleObfuscationAdmin(admin.ModelAdmin):
     form = DiscordRoleObfuscationForm
+    change_list_template = (
+        "admin/discord_obfuscate/discordroleobfuscation/change_list.html"
+    )
     list_display = (
         "group",
         "role_exists",
@@ -86,12 +103,13 @@ class DiscordRoleObfuscationAdmin(admin.ModelAdmin):
         "last_obfuscated_name",
     )
     search_fields = ("group__name", "custom_name")
-    list_filter = ("opt_out", "obfuscation_type")
+    list_filter = ("role_match", "opt_out", "obfuscation_type")
     actions = [
         "discover_roles",
         "toggle_opt_out",
         "sync_selected_roles",
         "sync_all_roles_action",
+        "refresh_role_status_action",
     ]
     fields = (
         "group",
@@ -113,87 +131,136 @@ class DiscordRoleObfuscationAdmin(admin.ModelAdmin):
         js = ("discord_obfuscate/admin_preview.js",)
 
     def get_queryset(self, request):
-        qs = super().get_queryset(request).select_related("group")
-        self._roleset = fetch_roleset(use_cache=True)
-        return qs
+        return super().get_queryset(request).select_related("group")
+
+    def changelist_view(self, request, extra_context=None):
+        extra_context = extra_context or {}
+        extra_context["role_status_refreshed_at"] = (
+            DiscordRoleObfuscation.objects.aggregate(
+                refreshed_at=Max("role_verified_at")
+            )["refreshed_at"]
+        )
+        return super().changelist_view(request, extra_context=extra_context)
 
     def role_exists(self, obj):
-        roleset = getattr(self, "_roleset", None) or fetch_roleset(use_cache=True)
-        desired = role_name_for_group(obj.group, obj)
-        if roleset.role_by_name(desired):
-            return True
-        if roleset.role_by_name(obj.group.name):
-            return True
-        if obj.role_id:
-            for role in roleset:
-                if role.id == obj.role_id:
-                    return True
-        return False
+        if not obj.role_match:
+            return None
+        return obj.role_match != ROLE_MATCH_NONE
 
     role_exists.boolean = True
     role_exists.short_description = "Role Exists"
+    role_exists.admin_order_field = "role_match"
 
     def get_form(self, request, obj=None, **kwargs):
         form = super().get_form(request, obj=obj, **kwargs)
-        roleset = fetch_roleset(use_cache=True)
-        role_names = {role.name for role in roleset}
-        qs = Group.objects.filter(name__in=role_names)
-        if obj and obj.group_id:
-            qs = (qs | Group.objects.filter(pk=obj.group_id)).distinct()
-        if "group" in form.base_fields:
-            form.base_fields["group"].queryset = qs
+        if "group" not in form.base_fields:
+            return form
+        group_ids = get_eligible_group_ids()
+        if group_ids is None:
+            # Not refreshed yet; compute once from the snapshot or Discord.
+            roleset = fetch_roleset(use_cache=True)
+            if roleset and len(roleset):
+                group_ids = store_eligible_groups(roleset)
+        if group_ids is None:
+            qs = Group.objects.all()
+        else:
+            group_ids = set(group_ids)
+            if obj and obj.group_id:
+                group_ids.add(obj.group_id)
+            qs = Group.objects.filter(pk__in=group_ids)
+        form.base_fields["group"].queryset = qs
         return form
 
     @admin.action(description="Discover groups from Discord roles")
     def discover_roles(self, request, queryset):
-        roleset = fetch_roleset(use_cache=True)
-        role_names = {role.name for role in roleset}
-        groups = Group.objects.filter(name__in=role_names)
-        defaults = default_obfuscation_values()
-        defaults.setdefault("obfuscation_type", DEFAULT_OBFUSCATE_METHOD)
-        created = 0
-        for group in groups:
-            _, was_created = DiscordRoleObfuscation.objects.get_or_create(
-                group=group,
-                defaults=defaults,
+        # Discord Obfuscate App
+        from discord_obfuscate.tasks import (
+            create_discovered_configs,
+            discover_groups_from_roles,
+            undiscovered_group_ids,
+        )
+
+        group_ids = get_eligible_group_ids()
+        if group_ids is None:
+            roleset = fetch_roleset(use_cache=True)
+            role_names = {role.name for role in roleset}
+            group_ids = Group.objects.filter(name__in=role_names).values_list(
+                "pk", flat=True
             )
-            if was_created:
-                created += 1
+        missing = undiscovered_group_ids(group_ids)
+        if len(missing) > DISCOVER_BACKGROUND_THRESHOLD:
+            discover_groups_from_roles.delay(missing)
+            messages.success(
+                request,
+                f"Discovering {len(missing)} new groups in the background; "
+                "progress is logged by the worker.",
+            )
+            return
+        created = create_discovered_configs(missing)
         messages.success(request, f"Discovered {created} new groups.")
 
     @admin.action(description="Toggle opt-out for selected roles")
     def toggle_opt_out(self, request, queryset):
-        toggled = 0
-        for config in queryset:
-            config.opt_out = not config.opt_out
-            config.save(update_fields=["opt_out", "updated_at"])
-            if sync_on_save_enabled():
-                sync_group_role.delay(config.group_id)
-            toggled += 1
-        if toggled:
-            messages.success(
-                request,
-                f"Toggled opt-out for {toggled} groups.",
-            )
+        rows = list(queryset.values_list("pk", "group_id", "opt_out"))
+        if not rows:
+            return
+        now = timezone.now()
+        opted_out = [pk for pk, _, opt_out in rows if opt_out]
+        opted_in = [pk for pk, _, opt_out in rows if not opt_out]
+        with transaction.atomic():
+            if opted_out:
+                DiscordRoleObfuscation.objects.filter(pk__in=opted_out).update(
+                    opt_out=False, updated_at=now
+                )
+            if opted_in:
+                DiscordRoleObfuscation.objects.filter(pk__in=opted_in).update(
+                    opt_out=True, updated_at=now
+                )
+        bump_mapping_version()
+        if sync_on_save_enabled():
+            # Discord Obfuscate App
+            from discord_obfuscate.tasks import sync_group_roles
+
+            sync_group_roles.delay([group_id for _, group_id, _ in rows])
+        messages.success(
+            request,
+            f"Toggled opt-out for {len(rows)} groups.",
+        )
 
     @admin.action(description="Sync selected roles now")
     def sync_selected_roles(self, request, queryset):
-        count = 0
-        for config in queryset:
-            sync_group_role.delay(config.group_id)
-            count += 1
-        messages.success(request, f"Queued sync for {count} groups.")
+        # Discord Obfuscate App
+        from discord_obfuscate.tasks import sync_group_roles
+
+        group_ids = list(queryset.values_list("group_id", flat=True))
+        if group_ids:
+            sync_group_roles.delay(group_ids)
+        messages.success(request, f"Queued sync for {len(group_ids)} groups.")
 
     @admin.action(description="Sync all roles now")
     def sync_all_roles_action(self, request, queryset):
+        # Discord Obfuscate App
+        from discord_obfuscate.tasks import sync_all_roles
+
         sync_all_roles.delay()
         messages.success(request, "Queued sync for all groups.")
 
+    @admin.action(description="Refresh role status from Discord")
+    def refresh_role_status_action(self, request, queryset):
+        # Discord Obfuscate App
+        from discord_obfuscate.tasks import refresh_role_status
+
+        refresh_role_status.delay()
+        messages.success(request, "Queued role status refresh.")
+
     def save_model(self, request, obj, form, change):
         super().save_model(request, obj, form, change)
         if not sync_on_save_enabled():
             return
         if form and form.has_changed():
+            # Discord Obfuscate App
+            from discord_obfuscate.tasks import sync_group_role
+
             sync_group_role.delay(obj.group_id)
 
     def get_urls(self):
@@ -204,16 +271,34 @@ class DiscordRoleObfuscationAdmin(admin.ModelAdmin):
                 self.admin_site.admin_view(self.preview_view),
                 name="discord_obfuscate_preview",
             ),
+            path(
+                "preview/batch/",
+                self.admin_site.admin_view(self.preview_batch_view),
+                name="discord_obfuscate_preview_batch",
+            ),
+            path(
+                "metrics/",
+                self.admin_site.admin_view(self.metrics_view),
+                name="discord_obfuscate_metrics",
+            ),
         ]
         return custom_urls + urls
 
+    def metrics_view(self, request):
+        if not self.has_view_permission(request):
+            return HttpResponse(status=403)
+        return HttpResponse(
+            metrics.render_prometheus(metrics.collect()),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )
+
     def preview_view(self, request):
         if request.method != "POST":
             return JsonResponse({"error": "POST required"}, status=405)
 
         group_id = request.POST.get("group")
-        group_name = ""
-        if group_id:
+        group_name = (request.POST.get("group_name") or "").strip()
+        if group_id and not group_name:
             try:
                 group_name = Group.objects.get(pk=group_id).name
             except Group.DoesNotExist:
@@ -222,33 +307,156 @@ class DiscordRoleObfuscationAdmin(admin.ModelAdmin):
         if not group_name:
             return JsonResponse({"preview": ""})
 
-        custom_name = (request.POST.get("custom_name") or "").strip()
-        use_random_key = request.POST.get("use_random_key") in {"on", "true", "1"}
-        random_key = (request.POST.get("random_key") or "").strip()
-        rotate_name = request.POST.get("random_key_rotate_name") in {"on", "true", "1"}
-        opt_out = request.POST.get("opt_out") in {"on", "true", "1"}
-        obfuscation_type = request.POST.get("obfuscation_type")
-        obfuscation_format = (request.POST.get("obfuscation_format") or "").strip()
-        min_chars = int(request.POST.get("min_chars_before_divider") or 0)
-        dividers = request.POST.getlist("divider_characters")
-
-        temp_group = Group(id=group_id, name=group_name)
-        temp_config = DiscordRoleObfuscation(
-            group=temp_group,
-            opt_out=opt_out,
-            obfuscation_type=obfuscation_type,
-            obfuscation_format=obfuscation_format,
-            custom_name=custom_name,
-            min_chars_before_divider=min_chars,
-            use_random_key=use_random_key,
-            random_key=random_key or (generate_random_key(16) if use_random_key else ""),
-            random_key_rotate_name=rotate_name if use_random_key else False,
+        temp_group = Group(id=group_id or None, name=group_name)
+        temp_config = _preview_config(
+            temp_group,
+            request.POST,
+            request.POST.getlist("divider_characters"),
         )
-        temp_config.set_dividers(dividers)
         preview = role_name_for_group(temp_group, temp_config)
 
         return JsonResponse({"preview": preview})
 
+    def preview_batch_view(self, request):
+        """Render many previews in one request.
+
+        Accepts a JSON body with either ``items`` (a list of objects with
+        ``group`` or ``group_name`` plus ``settings``) or ``defaults`` (candidate
+        global defaults applied to every existing config).
+        """
+        if request.method != "POST":
+            return JsonResponse({"error": "POST required"}, status=405)
+        try:
+            body = json.loads(request.body or b"{}")
+        except (TypeError, ValueError):
+            return JsonResponse({"error": "Invalid JSON body"}, status=400)
+        if not isinstance(body, Mapping):
+            return JsonResponse({"error": "Invalid JSON body"}, status=400)
+
+        defaults = body.get("defaults")
+        if isinstance(defaults, Mapping):
+            return JsonResponse({"previews": _default_previews(defaults)})
+
+        items = body.get("items")
+        if not isinstance(items, list):
+            return JsonResponse({"error": "items or defaults required"}, status=400)
+
+        group_ids = set()
+        for item in items:
+            if isinstance(item, Mapping) and not item.get("group_name"):
+                try:
+                    group_ids.add(int(item.get("group")))
+                except (TypeError, ValueError):
+                    continue
+        names_by_id = dict(
+            Group.objects.filter(pk__in=group_ids).values_list("id", "name")
+        )
+
+        previews = []
+        for item in items:
+            if not isinstance(item, Mapping):
+                previews.append({"preview": ""})
+                continue
+            group_id = item.get("group")
+            group_name = str(item.get("group_name") or "").strip()
+            if not group_name:
+                try:
+                    group_name = names_by_id.get(int(group_id), "")
+                except (TypeError, ValueError):
+                    group_name = ""
+            if not group_name:
+                previews.append({"group": group_id, "preview": ""})
+                continue
+            settings = item.get("settings")
+            if not isinstance(settings, Mapping):
+                settings = {}
+            temp_group = Group(id=group_id or None, name=group_name)
+            temp_config = _preview_config(
+                temp_group, settings, settings.get("divider_characters")
+            )
+            previews.append(
+                {
+                    "group": group_id,
+                    "group_name": group_name,
+                    "preview": role_name_for_group(temp_group, temp_config),
+                }
+            )
+        return JsonResponse({"previews": previews})
+
+
+def _truthy(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value or "").strip().lower() in {"on", "true", "1"}
+
+
+def _divider_list(value) -> list:
+    if isinstance(value, str):
+        return [d for d in value.split(",") if d]
+    return list(value or [])
+
+
+def _preview_config(group: Group, values, dividers) -> DiscordRoleObfuscation:
+    """Build an unsaved config from submitted preview settings."""
+    use_random_key = _truthy(values.get("use_random_key"))
+    random_key = str(values.get("random_key") or "").strip()
+    try:
+        min_chars = int(values.get("min_chars_before_divider") or 0)
+    except (TypeError, ValueError):
+        min_chars = 0
+    config = DiscordRoleObfuscation(
+        group=group,
+        opt_out=_truthy(values.get("opt_out")),
+        obfuscation_type=values.get("obfuscation_type"),
+        obfuscation_format=str(values.get("obfuscation_format") or "").strip(),
+        custom_name=str(values.get("custom_name") or "").strip(),
+        min_chars_before_divider=min_chars,
+        use_random_key=use_random_key,
+        random_key=random_key or (generate_random_key(16) if use_random_key else ""),
+        random_key_rotate_name=(
+            _truthy(values.get("random_key_rotate_name")) if use_random_key else False
+        ),
+    )
+    config.set_dividers(_divider_list(dividers))
+    return config
+
+
+def _default_previews(defaults) -> list[dict]:
+    """Preview every existing config as if it used the candidate defaults."""
+    previews = []
+    configs = DiscordRoleObfuscation.objects.select_related("group").order_by(
+        "group__name"
+    )
+    for config in configs:
+        if "divider_characters" in defaults:
+            dividers = _divider_list(defaults["divider_characters"])
+        else:
+            dividers = config.get_dividers()
+        values = {
+            "opt_out": defaults.get("opt_out", config.opt_out),
+            "custom_name": config.custom_name,
+            "use_random_key": defaults.get("use_random_key", config.use_random_key),
+            "random_key": config.random_key,
+            "random_key_rotate_name": config.random_key_rotate_name,
+            "obfuscation_type": defaults.get(
+                "obfuscation_type", config.obfuscation_type
+            ),
+            "obfuscation_format": config.obfuscation_format,
+            "min_chars_before_divider": defaults.get(
+                "min_chars_before_divider", config.min_chars_before_divider
+            ),
+        }
+        temp_config = _preview_config(config.group, values, dividers)
+        previews.append(
+            {
+                "group": config.group_id,
+                "group_name": config.group.name,
+                "current": role_name_for_group(config.group, config),
+                "preview": role_name_for_group(config.group, temp_config),
+            }
+        )
+    return previews
+
 
 @admin.register(DiscordObfuscateConfig)
 class DiscordObfuscateConfigAdmin(SingletonModelAdmin):
@@ -347,56 +555,63 @@ class DiscordRoleOrderConfigAdmin(SingletonModelAdmin):
             messages.error(request, "Invalid role ordering payload.")
             return
 
-        roleset = fetch_roleset(use_cache=False)
+        roleset = fetch_roleset(use_cache=True)
         roles_by_id = {role.id: role for role in roleset}
-        seen_ids: set[int] = set()
+        submitted: dict[int, dict] = {}
         for index, item in enumerate(payload, start=1):
             try:
                 role_id = int(item.get("role_id"))
-            except (TypeError, ValueError):
+            except (TypeError, ValueError, AttributeError):
                 continue
-            user_locked = bool(item.get("locked"))
             role = roles_by_id.get(role_id)
-            role_name = role.name if role else ""
             role_color = ""
             if role and getattr(role, "color", 0):
                 role_color = to_hex(int(role.color))
-            DiscordRoleOrder.objects.update_or_create(
-                role_id=role_id,
-                defaults={
-                    "sort_order": index,
-                    "locked": user_locked,
-                    "role_name": role_name,
-                    "role_color": role_color,
-                },
-            )
-            seen_ids.add(role_id)
+            submitted[role_id] = {
+                "sort_order": index,
+                "locked": bool(item.get("locked")),
+                "role_name": role.name if role else "",
+                "role_color": role_color,
+            }
+
+        if not submitted:
+            return
 
-        if seen_ids:
-            DiscordRoleOrder.objects.exclude(role_id__in=seen_ids).delete()
-            messages.success(request, "Saved role ordering.")
+        fields = ["sort_order", "locked", "role_name", "role_color"]
+        with transaction.atomic():
+            existing = {
+                entry.role_id: entry for entry in DiscordRoleOrder.objects.all()
+            }
+            to_create = []
+            to_update = []
+            now = timezone.now()
+            for role_id, values in submitted.items():
+                entry = existing.get(role_id)
+                if entry is None:
+                    to_create.append(DiscordRoleOrder(role_id=role_id, **values))
+                    continue
+                if all(getattr(entry, field) == values[field] for field in fields):
+                    continue
+                for field, value in values.items():
+                    setattr(entry, field, value)
+                entry.updated_at = now
+                to_update.append(entry)
+
+            stale_ids = set(existing) - set(submitted)
+            if stale_ids:
+                DiscordRoleOrder.objects.filter(role_id__in=stale_ids).delete()
+            if to_create:
+                DiscordRoleOrder.objects.bulk_create(to_create)
+            if to_update:
+                DiscordRoleOrder.objects.bulk_update(to_update, fields + ["updated_at"])
+        messages.success(request, "Saved role ordering.")
 
     def changeform_view(self, request, object_id=None, form_url="", extra_context=None):
         extra_context = extra_context or {}
         roleset = fetch_roleset(use_cache=False)
         roles = list(roleset)
         roles_by_id = {role.id: role for role in roles}
-        roles_by_name = {role.name: role for role in roles}
-        configs = list(DiscordRoleObfuscation.objects.select_related("group").filter(opt_out=True))
-        config_by_role_id = {}
-
-        for config in configs:
-            role_id = None
-            if config.role_id and config.role_id in roles_by_id:
-                role_id = config.role_id
-            else:
-                desired = role_name_for_group(config.group, config)
-                for name in (desired, config.last_obfuscated_name, config.group.name):
-                    if name and name in roles_by_name:
-                        role_id = roles_by_name[name].id
-                        break
-            if role_id and role_id not in config_by_role_id:
-                config_by_role_id[role_id] = config
+        config_by_role_id = opt_out_role_configs(roleset)
 
         order_entries = list(DiscordRoleOrder.objects.all())
         order_by_id = {entry.role_id: entry for entry in order_entries}
@@ -504,3 +719,131 @@ class DiscordRoleColorAssignmentAdmin(admin.ModelAdmin):
 
     def has_change_permission(self, request, obj=None):
         return False
+
+
+@admin.register(SyncRun)
+class SyncRunAdmin(admin.ModelAdmin):
+    list_display = (
+        "task_name",
+        "status",
+        "started_at",
+        "duration",
+        "configs_examined",
+        "renames_sent",
+        "recolors_sent",
+        "reorders_sent",
+        "noops_skipped",
+        "discord_requests",
+        "rate_limit_sleep",
+        "errors",
+        "profiled",
+    )
+    list_filter = ("task_name", "status", "profiler")
+    date_hierarchy = "started_at"
+    readonly_fields = [
+        field.name for field in SyncRun._meta.fields if field.name != "profile"
+    ] + ["profile_report"]
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).defer("profile")
+
+    def get_urls(self):
+        urls = super().get_urls()
+        custom_urls = [
+            path(
+                "<int:object_id>/profile/",
+                self.admin_site.admin_view(self.profile_download_view),
+                name="discord_obfuscate_syncrun_profile",
+            ),
+        ]
+        return custom_urls + urls
+
+    def profile_download_view(self, request, object_id):
+        run = SyncRun.objects.filter(pk=object_id).first()
+        if run is None or not self.has_view_permission(request, run):
+            return HttpResponse(status=404)
+        response = HttpResponse(run.profile, content_type="text/plain; charset=utf-8")
+        response["Content-Disposition"] = (
+            f'attachment; filename="sync-run-{run.pk}-{run.profiler or "profile"}.txt"'
+        )
+        return response
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def profiled(self, obj):
+        return bool(obj.profiler)
+
+    profiled.boolean = True
+    profiled.short_description = "Profiled"
+
+    def profile_report(self, obj):
+        if not obj or not obj.profile:
+            return "-"
+        url = reverse("admin:discord_obfuscate_syncrun_profile", args=[obj.pk])
+        return format_html(
+            '<a href="{}">Download</a><pre style="max-height: 40em; overflow: auto;">{}</pre>',
+            url,
+            obj.profile,
+        )
+
+    profile_report.short_description = "Profile"
+
+
+@admin.register(RolesetSnapshot)
+class RolesetSnapshotAdmin(admin.ModelAdmin):
+    list_display = ("last_seen_at", "created_at", "role_count", "fingerprint")
+    date_hierarchy = "last_seen_at"
+    readonly_fields = [
+        field.name for field in RolesetSnapshot._meta.fields if field.name != "roles"
+    ] + ["roles_download"]
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).defer("roles")
+
+    def get_urls(self):
+        urls = super().get_urls()
+        custom_urls = [
+            path(
+                "<int:object_id>/roles/",
+                self.admin_site.admin_view(self.roles_download_view),
+                name="discord_obfuscate_rolesetsnapshot_roles",
+            ),
+        ]
+        return custom_urls + urls
+
+    def roles_download_view(self, request, object_id):
+        snapshot = RolesetSnapshot.objects.filter(pk=object_id).first()
+        if snapshot is None or not self.has_view_permission(request, snapshot):
+            return HttpResponse(status=404)
+        response = JsonResponse(
+            {
+                "fingerprint": snapshot.fingerprint,
+                "last_seen_at": snapshot.last_seen_at.isoformat(),
+                "columns": ["id", "name", "position", "color", "managed"],
+                "roles": snapshot.roles,
+            }
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="roleset-{snapshot.fingerprint[:12]}.json"'
+        )
+        return response
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def roles_download(self, obj):
+        if not obj:
+            return "-"
+        url = reverse("admin:discord_obfuscate_rolesetsnapshot_roles", args=[obj.pk])
+        return format_html(
+            '<a href="{}">Download {} roles as JSON</a>', url, obj.role_count
+        )
+
+    roles_download.short_description = "Roles"
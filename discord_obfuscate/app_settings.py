@@ -8,3 +8,47 @@ DISCORD_OBFUSCATE_SECRET = getattr(
     "DISCORD_OBFUSCATE_SECRET",
     getattr(settings, "SECRET_KEY", ""),
 )
+
+DISCORD_OBFUSCATE_ASYNC_HTTP = getattr(settings, "DISCORD_OBFUSCATE_ASYNC_HTTP", False)
+
+DISCORD_OBFUSCATE_ROLE_UPDATE_CONCURRENCY = getattr(
+    settings,
+    "DISCORD_OBFUSCATE_ROLE_UPDATE_CONCURRENCY",
+    1,
+)
+
+DISCORD_OBFUSCATE_ROLE_UPDATE_RATE = getattr(
+    settings,
+    "DISCORD_OBFUSCATE_ROLE_UPDATE_RATE",
+    5.0,
+)
+
+DISCORD_OBFUSCATE_API_BASE_URL = getattr(
+    settings,
+    "DISCORD_OBFUSCATE_API_BASE_URL",
+    "https://discord.com/api/v10/",
+)
+
+DISCORD_OBFUSCATE_SYNC_RUN_RETENTION_DAYS = getattr(
+    settings,
+    "DISCORD_OBFUSCATE_SYNC_RUN_RETENTION_DAYS",
+    30,
+)
+
+DISCORD_OBFUSCATE_PROFILE_SAMPLE_RATE = getattr(
+    settings,
+    "DISCORD_OBFUSCATE_PROFILE_SAMPLE_RATE",
+    0.0,
+)
+
+DISCORD_OBFUSCATE_PROFILER = getattr(
+    settings,
+    "DISCORD_OBFUSCATE_PROFILER",
+    "cprofile",
+)
+
+DISCORD_OBFUSCATE_ROLESET_SNAPSHOT_MAX_AGE = getattr(
+    settings,
+    "DISCORD_OBFUSCATE_ROLESET_SNAPSHOT_MAX_AGE",
+    3600,
+)
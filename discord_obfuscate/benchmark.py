@@ -0,0 +1,264 @@
+"""Synthetic benchmarks for the obfuscation hot path and the Celery tasks.
+
+Every scenario builds its groups, users and configs inside a transaction that is
+rolled back afterwards, and talks to the in-repo fake guild instead of Discord.
+"""
+
+# Standard Library
+import platform
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+
+# Django
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+# Discord Obfuscate App
+from discord_obfuscate import __version__, tasks
+from discord_obfuscate.cache import bump_mapping_version
+from discord_obfuscate.models import (
+    DiscordRoleColorRule,
+    DiscordRoleObfuscation,
+    DiscordRoleOrder,
+    DiscordRoleOrderConfig,
+)
+from discord_obfuscate.obfuscation import (
+    generate_random_key,
+    name_cache,
+    obfuscated_names_for_role_names,
+)
+from discord_obfuscate.role_index import ELIGIBLE_GROUPS_KEY
+
+DEFAULT_ROLE_COUNTS = (50, 250)
+DEFAULT_GROUP_COUNTS = (100, 1000, 10000)
+GROUPS_PER_USER = 5
+BENCH_PREFIX = "Bench Group"
+BENCH_GUILD_ID = 1
+
+
+@dataclass
+class BenchResult:
+    """Measurements for one benchmarked call."""
+
+    scenario: str
+    name: str
+    roles: int
+    groups: int
+    users: int
+    wall_time: float
+    queries: int
+    api_calls: int
+    peak_memory: int
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _measure(scenario: dict, name: str, func, guild) -> BenchResult:
+    calls_before = len(guild.requests)
+    tracemalloc.start()
+    try:
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            func()
+            wall_time = time.perf_counter() - start
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return BenchResult(
+        scenario=scenario["label"],
+        name=name,
+        roles=scenario["roles"],
+        groups=scenario["groups"],
+        users=scenario["users"],
+        wall_time=round(wall_time, 6),
+        queries=len(queries.captured_queries),
+        api_calls=len(guild.requests) - calls_before,
+        peak_memory=peak,
+    )
+
+
+def build_fixture(
+    role_count: int, group_count: int, user_count: int, latency: float = 0.0
+):
+    """Create groups, configs, users, rules and role ordering plus a matching fake guild.
+
+    Returns ``(guild, user_role_names)`` where the second item lists each user's
+    group names, ready for ``obfuscated_names_for_role_names``.
+    """
+    # Discord Obfuscate App
+    from discord_obfuscate.fake_discord import FakeGuild
+
+    Group.objects.bulk_create(
+        [Group(name=f"{BENCH_PREFIX} {index}") for index in range(group_count)]
+    )
+    groups = list(Group.objects.filter(name__startswith=BENCH_PREFIX).order_by("pk"))
+    DiscordRoleObfuscation.objects.bulk_create(
+        [
+            DiscordRoleObfuscation(
+                group=group,
+                opt_out=False,
+                use_random_key=True,
+                random_key=generate_random_key(16),
+                random_key_rotate_name=True,
+            )
+            for group in groups
+        ],
+        batch_size=1000,
+    )
+
+    # The guild holds @everyone, the bot role and original-name roles for the first groups.
+    role_names = [group.name for group in groups[: max(role_count - 2, 0)]]
+    role_names.extend(
+        f"Bench Role {index}" for index in range(len(role_names), role_count - 2)
+    )
+    bot_role_id = BENCH_GUILD_ID + role_count
+    roles = [{"id": BENCH_GUILD_ID, "name": "@everyone", "position": 0}]
+    roles.extend(
+        {"id": BENCH_GUILD_ID + index, "name": name, "position": index}
+        for index, name in enumerate(role_names, start=1)
+    )
+    roles.append(
+        {
+            "id": bot_role_id,
+            "name": "Bench Bot",
+            "position": role_count,
+            "managed": True,
+        }
+    )
+    guild = FakeGuild(roles, guild_id=BENCH_GUILD_ID, latency=latency)
+
+    DiscordRoleColorRule.objects.create(name="Bench", pattern="*", enabled=True)
+    order_config = DiscordRoleOrderConfig.get_solo()
+    order_config.enabled = True
+    order_config.bot_role_id = bot_role_id
+    order_config.reorder_mode = "desired"
+    order_config.save()
+    DiscordRoleOrder.objects.bulk_create(
+        [
+            DiscordRoleOrder(
+                role_id=role["id"], role_name=role["name"], sort_order=rank
+            )
+            for rank, role in enumerate(reversed(roles[1:-1]), start=1)
+        ]
+    )
+
+    User.objects.bulk_create(
+        [User(username=f"bench-user-{index}") for index in range(user_count)],
+        batch_size=1000,
+    )
+    users = list(
+        User.objects.filter(username__startswith="bench-user-")
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    memberships = []
+    user_role_names = []
+    for offset, user_id in enumerate(users):
+        chosen = (
+            [groups[(offset + step) % len(groups)] for step in range(GROUPS_PER_USER)]
+            if groups
+            else []
+        )
+        memberships.extend(
+            User.groups.through(user_id=user_id, group_id=group.pk) for group in chosen
+        )
+        user_role_names.append([group.name for group in chosen])
+    User.groups.through.objects.bulk_create(
+        memberships, batch_size=5000, ignore_conflicts=True
+    )
+    return guild, user_role_names
+
+
+def run_scenario(
+    role_count: int, group_count: int, user_count: int, latency: float = 0.0
+) -> list[BenchResult]:
+    """Benchmark the hot path and every task for one guild size, then roll back."""
+    # Discord Obfuscate App
+    from discord_obfuscate.fake_discord import fake_bot_client
+
+    scenario = {
+        "label": f"{role_count}r-{group_count}g-{user_count}u",
+        "roles": role_count,
+        "groups": group_count,
+        "users": user_count,
+    }
+    results = []
+    try:
+        with transaction.atomic():
+            guild, user_role_names = build_fixture(
+                role_count, group_count, user_count, latency
+            )
+
+            def resolve_names():
+                for names in user_role_names:
+                    obfuscated_names_for_role_names(names)
+
+            with fake_bot_client(guild):
+                name_cache.clear()
+                bump_mapping_version()
+                results.append(_measure(scenario, "names_cold", resolve_names, guild))
+                results.append(_measure(scenario, "names_warm", resolve_names, guild))
+                results.append(
+                    _measure(scenario, "sync_all_roles", tasks.sync_all_roles, guild)
+                )
+                results.append(
+                    _measure(
+                        scenario,
+                        "sync_role_color_rules",
+                        tasks.sync_role_color_rules,
+                        guild,
+                    )
+                )
+                results.append(
+                    _measure(
+                        scenario,
+                        "rotate_random_keys_and_reorder_roles",
+                        tasks.rotate_random_keys_and_reorder_roles,
+                        guild,
+                    )
+                )
+            raise _Rollback
+    except _Rollback:
+        pass
+    finally:
+        # Cached state refers to rows that no longer exist.
+        name_cache.clear()
+        bump_mapping_version()
+        cache.delete(ELIGIBLE_GROUPS_KEY)
+    return results
+
+
+def run_benchmarks(
+    role_counts=DEFAULT_ROLE_COUNTS,
+    group_counts=DEFAULT_GROUP_COUNTS,
+    user_counts=None,
+    latency: float = 0.0,
+    progress=None,
+) -> dict:
+    """Run every (roles, groups) combination and return a JSON-serializable report."""
+    results = []
+    for role_count in role_counts:
+        for position, group_count in enumerate(group_counts):
+            user_count = user_counts[position] if user_counts else group_count
+            scenario_results = run_scenario(
+                role_count, group_count, user_count, latency
+            )
+            results.extend(scenario_results)
+            if progress:
+                progress(scenario_results)
+    return {
+        "version": __version__,
+        "python": platform.python_version(),
+        "database": connection.vendor,
+        "created_at": timezone.now().isoformat(),
+        "results": [result.as_dict() for result in results],
+    }
@@ -0,0 +1,94 @@
+"""Cache helpers."""
+
+# Standard Library
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+# Django
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+MAPPING_VERSION_KEY = "discord_obfuscate:mapping_version"
+
+
+def mapping_version() -> int:
+    """Return the current version of the group -> role name mapping."""
+    try:
+        value = cache.get(MAPPING_VERSION_KEY)
+    except Exception:
+        logger.exception("Failed to read mapping version from cache")
+        return 0
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def bump_mapping_version() -> int:
+    """Invalidate cached name resolutions in every process."""
+    try:
+        return int(cache.incr(MAPPING_VERSION_KEY))
+    except ValueError:
+        cache.set(MAPPING_VERSION_KEY, 1, timeout=None)
+        return 1
+    except Exception:
+        logger.exception("Failed to bump mapping version in cache")
+        return 0
+
+
+class FingerprintCache:
+    """Bounded in-process LRU cache with per-entry TTL and hit-rate counters."""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max(int(max_entries), 1)
+        self.ttl = float(ttl)
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            }
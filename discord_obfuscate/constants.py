@@ -9,6 +9,10 @@ DEFAULT_OBFUSCATE_PREFIX = ""
 DEFAULT_SYNC_ON_SAVE = True
 DEFAULT_PERIODIC_SYNC_ENABLED = False
 
+NAME_CACHE_MAX_ENTRIES = 2048
+NAME_CACHE_TTL = 300
+ROLE_INDEX_TTL = 3600
+
 ALLOWED_DIVIDERS = [
     "┃",
     "┇",
@@ -25,3 +29,15 @@ OBFUSCATION_METHODS = {
     "blake2s_hex": ("BLAKE2s + hex", "blake2s", "hex"),
     "blake2s_base32": ("BLAKE2s + base32", "blake2s", "base32"),
 }
+
+ROLE_MATCH_DESIRED = "desired"
+ROLE_MATCH_LAST = "last"
+ROLE_MATCH_ORIGINAL = "original"
+ROLE_MATCH_NONE = "none"
+
+ROLE_MATCH_CHOICES = [
+    (ROLE_MATCH_DESIRED, "Desired name"),
+    (ROLE_MATCH_LAST, "Last known role"),
+    (ROLE_MATCH_ORIGINAL, "Original name"),
+    (ROLE_MATCH_NONE, "No role"),
+]
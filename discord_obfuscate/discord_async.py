@@ -0,0 +1,230 @@
+"""Optional pooled async HTTP layer for Discord role updates.
+
+Requires ``httpx`` (and ``h2`` for HTTP/2). When the dependency is missing or
+``DISCORD_OBFUSCATE_ASYNC_HTTP`` is disabled, tasks fall back to the Alliance
+Auth bot client one request at a time.
+"""
+
+# Standard Library
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+# Django
+from django.conf import settings
+
+# Discord Obfuscate App
+from discord_obfuscate import metrics
+from discord_obfuscate.app_settings import (
+    DISCORD_OBFUSCATE_API_BASE_URL,
+    DISCORD_OBFUSCATE_ASYNC_HTTP,
+    DISCORD_OBFUSCATE_ROLE_UPDATE_CONCURRENCY,
+)
+
+try:
+    # Third Party
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+try:
+    # Third Party
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "aa-discord-obfuscate (https://github.com/BroodLK/aa-discord-obfuscate)"
+REQUEST_TIMEOUT = 15.0
+
+
+@dataclass(frozen=True)
+class RoleUpdate:
+    """A single PATCH guilds/{guild_id}/roles/{role_id} request."""
+
+    role_id: int
+    name: Optional[str] = None
+    color: Optional[int] = None
+
+    def payload(self) -> dict:
+        data = {}
+        if self.name is not None:
+            data["name"] = self.name
+        if self.color is not None:
+            data["color"] = self.color
+        return data
+
+
+def async_http_enabled() -> bool:
+    return bool(DISCORD_OBFUSCATE_ASYNC_HTTP) and httpx is not None
+
+
+class AsyncDiscordClient:
+    """Pooled keep-alive client that pipelines role PATCHes within rate limits."""
+
+    def __init__(
+        self,
+        token: str,
+        guild_id: int,
+        base_url: str = DISCORD_OBFUSCATE_API_BASE_URL,
+        max_concurrency: int = DISCORD_OBFUSCATE_ROLE_UPDATE_CONCURRENCY,
+        max_attempts: int = 3,
+        transport=None,
+    ):
+        if httpx is None:
+            raise RuntimeError("httpx is required for the async Discord client")
+        self.token = token
+        self.guild_id = guild_id
+        self.base_url = base_url.rstrip("/") + "/"
+        self.max_concurrency = max(int(max_concurrency), 1)
+        self.max_attempts = max_attempts
+        self._transport = transport
+        self._client = None
+        self._semaphore = None
+        self._blocked_until = 0.0
+
+    async def __aenter__(self):
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={
+                "Authorization": f"Bot {self.token}",
+                "User-Agent": USER_AGENT,
+            },
+            http2=HTTP2_AVAILABLE and self._transport is None,
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency,
+            ),
+            timeout=REQUEST_TIMEOUT,
+            transport=self._transport,
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._client.aclose()
+        self._client = None
+
+    async def _wait_for_bucket(self) -> None:
+        loop = asyncio.get_running_loop()
+        delay = self._blocked_until - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _block_for(self, seconds: float) -> None:
+        loop = asyncio.get_running_loop()
+        self._blocked_until = max(self._blocked_until, loop.time() + seconds)
+
+    def _track_bucket(self, response) -> None:
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset_after = response.headers.get("X-RateLimit-Reset-After")
+        if remaining is None or reset_after is None:
+            return
+        try:
+            if int(float(remaining)) <= 0:
+                self._block_for(float(reset_after))
+        except (TypeError, ValueError):
+            return
+
+    @staticmethod
+    def _retry_after(response) -> float:
+        try:
+            value = response.json().get("retry_after")
+        except Exception:
+            value = None
+        if value is None:
+            value = response.headers.get("Retry-After")
+        try:
+            return max(float(value), 0.0) + 0.25
+        except (TypeError, ValueError):
+            return 5.0
+
+    @staticmethod
+    def _count_request(result: str) -> None:
+        metrics.inc(
+            "discord_obfuscate_discord_requests_total",
+            method="PATCH",
+            route="guilds/{id}/roles/{id}",
+            result=result,
+        )
+
+    async def patch_role(self, update: RoleUpdate) -> bool:
+        data = update.payload()
+        if not data:
+            return True
+        route = f"guilds/{self.guild_id}/roles/{update.role_id}"
+        async with self._semaphore:
+            for attempt in range(1, self.max_attempts + 1):
+                await self._wait_for_bucket()
+                try:
+                    response = await self._client.patch(route, json=data)
+                except httpx.HTTPError:
+                    logger.exception("Failed to update role %s", update.role_id)
+                    self._count_request("error")
+                    return False
+                self._track_bucket(response)
+                if response.status_code == 429:
+                    self._count_request("rate_limited")
+                    delay = self._retry_after(response)
+                    metrics.inc(
+                        "discord_obfuscate_rate_limit_wait_seconds_total", delay
+                    )
+                    self._block_for(delay)
+                    logger.warning(
+                        "Rate limit hit; retrying in %.2fs (attempt %s/%s)",
+                        delay,
+                        attempt,
+                        self.max_attempts,
+                    )
+                    continue
+                self._count_request("ok" if response.is_success else "error")
+                if response.is_success:
+                    logger.info("Updated Discord role %s", update.role_id)
+                    return True
+                logger.error(
+                    "Failed to update role %s: HTTP %s",
+                    update.role_id,
+                    response.status_code,
+                )
+                return False
+        logger.error("Rate limit exhausted updating role %s", update.role_id)
+        return False
+
+    async def _patch_sequence(self, updates: List[RoleUpdate]) -> List[bool]:
+        return [await self.patch_role(update) for update in updates]
+
+    async def patch_roles(self, updates: List[RoleUpdate]) -> List[bool]:
+        """Send updates concurrently; updates for the same role keep their order."""
+        by_role: Dict[int, List[int]] = {}
+        for position, update in enumerate(updates):
+            by_role.setdefault(update.role_id, []).append(position)
+        role_ids = list(by_role)
+        sequences = await asyncio.gather(
+            *(
+                self._patch_sequence([updates[i] for i in by_role[role_id]])
+                for role_id in role_ids
+            )
+        )
+        results: List[bool] = [False] * len(updates)
+        for role_id, outcomes in zip(role_ids, sequences):
+            for position, outcome in zip(by_role[role_id], outcomes):
+                results[position] = outcome
+        return results
+
+
+def patch_roles(updates: List[RoleUpdate], **client_kwargs) -> List[bool]:
+    """Synchronous facade used by the Celery tasks."""
+    if not updates:
+        return []
+    token = client_kwargs.pop("token", getattr(settings, "DISCORD_BOT_TOKEN", ""))
+    guild_id = client_kwargs.pop("guild_id", getattr(settings, "DISCORD_GUILD_ID", 0))
+
+    async def _run():
+        async with AsyncDiscordClient(token, guild_id, **client_kwargs) as client:
+            return await client.patch_roles(updates)
+
+    return asyncio.run(_run())
@@ -0,0 +1,364 @@
+"""
+In-process stand-in for the Discord guild role endpoints, used by the tests and
+the obfuscate_bench command
+"""
+
+# Standard Library
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Discord Obfuscate App
+from discord_obfuscate import snapshots
+from discord_obfuscate.obfuscation import RawRole, bot_client_override
+
+MAX_GUILD_ROLES = 250
+
+ROLES_ROUTE = re.compile(r"^/?guilds/(?P<guild_id>\d+)/roles/?$")
+ROLE_ROUTE = re.compile(r"^/?guilds/(?P<guild_id>\d+)/roles/(?P<role_id>\d+)/?$")
+
+
+def _raw_role(role: dict) -> RawRole:
+    return RawRole(
+        id=int(role["id"]),
+        name=role["name"],
+        position=role["position"],
+        color=role["color"],
+        managed=role["managed"],
+        raw=role,
+    )
+
+
+class FakeDiscordError(Exception):
+    """Non rate-limit error response from the fake guild."""
+
+    def __init__(self, status: int, body: dict):
+        super().__init__(status, body)
+        self.status = status
+        self.body = body
+
+
+class FakeGuild:
+    """Thread-safe guild role state implementing the role routes of the Discord API.
+
+    Positions follow Discord: ``@everyone`` (id == guild id) stays at 0 and the
+    other roles are renumbered 1..n after every reorder, ties broken by id.
+    Roles in ``locked_role_ids`` answer 403 to edits, like roles above the bot's.
+    """
+
+    def __init__(
+        self,
+        roles=None,
+        guild_id: int = 1,
+        latency: float = 0.0,
+        rate_limit_first: int = 0,
+        bucket_size: int = 0,
+        bucket_window: float = 1.0,
+        max_roles: int = MAX_GUILD_ROLES,
+        locked_role_ids=(),
+    ):
+        self.guild_id = guild_id
+        self.latency = latency
+        self.rate_limit_first = rate_limit_first
+        self.bucket_size = bucket_size
+        self.bucket_window = bucket_window
+        self.max_roles = max_roles
+        self.locked_role_ids = set(locked_role_ids)
+        self.roles = {}
+        self.requests = []
+        self.rate_limited = 0
+        self._buckets = {}
+        self._lock = threading.Lock()
+        for position, role in enumerate(roles or [], start=1):
+            self._store_role(role, position)
+        self._normalize_positions()
+
+    @classmethod
+    def synthetic(cls, role_count: int, guild_id: int = 1, **kwargs) -> "FakeGuild":
+        """Build a guild with @everyone plus role_count numbered roles."""
+        roles = [{"id": str(guild_id), "name": "@everyone", "position": 0}]
+        roles.extend(
+            {"id": str(guild_id + index), "name": f"Role {index}", "position": index}
+            for index in range(1, role_count + 1)
+        )
+        return cls(roles, guild_id=guild_id, **kwargs)
+
+    def _store_role(self, role: dict, position: int) -> None:
+        role_id = int(role["id"])
+        self.roles[role_id] = {
+            "id": str(role_id),
+            "name": role.get("name", ""),
+            "color": int(role.get("color", 0)),
+            "position": int(role.get("position", position)),
+            "managed": bool(role.get("managed", False)),
+            "hoist": bool(role.get("hoist", False)),
+            "mentionable": bool(role.get("mentionable", False)),
+            "permissions": str(role.get("permissions", "0")),
+        }
+
+    def _normalize_positions(self) -> None:
+        ordered = sorted(
+            (role for role_id, role in self.roles.items() if role_id != self.guild_id),
+            key=lambda role: (role["position"], int(role["id"])),
+        )
+        for position, role in enumerate(ordered, start=1):
+            role["position"] = position
+        if self.guild_id in self.roles:
+            self.roles[self.guild_id]["position"] = 0
+
+    def ordered_roles(self) -> list[dict]:
+        """Roles in ascending position order, as copies."""
+        with self._lock:
+            return [
+                dict(role)
+                for role in sorted(
+                    self.roles.values(), key=lambda role: role["position"]
+                )
+            ]
+
+    def raw_roles(self) -> list[RawRole]:
+        return [_raw_role(role) for role in self.ordered_roles()]
+
+    def calls(self, method: str | None = None) -> list[tuple]:
+        """Recorded (method, route, payload) tuples, optionally filtered by method."""
+        with self._lock:
+            return [
+                call for call in self.requests if method is None or call[0] == method
+            ]
+
+    def _throttle(self, bucket: str):
+        if self.rate_limit_first > 0:
+            self.rate_limit_first -= 1
+            return 0.01
+        if not self.bucket_size:
+            return None
+        now = time.monotonic()
+        window_start, count = self._buckets.get(bucket, (now, 0))
+        if now - window_start >= self.bucket_window:
+            window_start, count = now, 0
+        if count >= self.bucket_size:
+            return self.bucket_window - (now - window_start)
+        self._buckets[bucket] = (window_start, count + 1)
+        return None
+
+    def handle(self, method: str, route: str, payload=None) -> tuple[int, object, dict]:
+        """Dispatch one request and return (status, body, headers)."""
+        if self.latency:
+            time.sleep(self.latency)
+        method = method.upper()
+        route = route.split("?", 1)[0].lstrip("/")
+        roles_match = ROLES_ROUTE.match(route)
+        role_match = ROLE_ROUTE.match(route)
+        match = roles_match or role_match
+        bucket = (
+            f"{method} {ROLES_ROUTE.pattern if roles_match else ROLE_ROUTE.pattern}"
+        )
+        with self._lock:
+            self.requests.append((method, route, payload))
+            if match is None or int(match["guild_id"]) != self.guild_id:
+                return 404, {"message": "Unknown Guild", "code": 10004}, {}
+            retry_after = self._throttle(bucket)
+            if retry_after is not None:
+                self.rate_limited += 1
+                body = {
+                    "message": "You are being rate limited.",
+                    "retry_after": retry_after,
+                    "global": False,
+                }
+                headers = {
+                    "Retry-After": f"{retry_after:.3f}",
+                    "X-RateLimit-Remaining": "0",
+                }
+                return 429, body, headers
+            if roles_match:
+                return self._handle_roles(method, payload)
+            return self._handle_role(method, int(role_match["role_id"]), payload)
+
+    def _handle_roles(self, method: str, payload) -> tuple[int, object, dict]:
+        if method == "GET":
+            return 200, self._sorted_copies(), {}
+        if method == "POST":
+            if len(self.roles) >= self.max_roles:
+                return (
+                    400,
+                    {
+                        "message": f"Maximum number of guild roles reached ({self.max_roles})",
+                        "code": 30005,
+                    },
+                    {},
+                )
+            role_id = max(self.roles, default=self.guild_id) + 1
+            self._store_role({"id": role_id, **(payload or {}), "position": 1}, 1)
+            for other_id, role in self.roles.items():
+                if other_id not in (role_id, self.guild_id):
+                    role["position"] += 1
+            self._normalize_positions()
+            return 200, dict(self.roles[role_id]), {}
+        if method == "PATCH":
+            if not isinstance(payload, list):
+                return 400, {"message": "Invalid Form Body", "code": 50035}, {}
+            for entry in payload:
+                role = self.roles.get(int(entry.get("id", 0)))
+                if role is None:
+                    return 400, {"message": "Unknown Role", "code": 10011}, {}
+            for entry in payload:
+                role_id = int(entry["id"])
+                if "position" in entry and role_id != self.guild_id:
+                    # Moved roles take the requested slot and push its occupant up.
+                    self.roles[role_id]["position"] = int(entry["position"]) - 0.5
+            self._normalize_positions()
+            return 200, self._sorted_copies(), {}
+        return 405, {"message": "405: Method Not Allowed", "code": 0}, {}
+
+    def _handle_role(
+        self, method: str, role_id: int, payload
+    ) -> tuple[int, object, dict]:
+        role = self.roles.get(role_id)
+        if role is None:
+            return 404, {"message": "Unknown Role", "code": 10011}, {}
+        if role_id in self.locked_role_ids:
+            return 403, {"message": "Missing Permissions", "code": 50013}, {}
+        if method == "PATCH":
+            for key in ("name", "color", "hoist", "mentionable", "permissions"):
+                if key in (payload or {}):
+                    role[key] = payload[key]
+            return 200, dict(role), {}
+        if method == "DELETE":
+            del self.roles[role_id]
+            self._normalize_positions()
+            return 204, None, {}
+        return 405, {"message": "405: Method Not Allowed", "code": 0}, {}
+
+    def _sorted_copies(self) -> list[dict]:
+        return [
+            dict(role)
+            for role in sorted(self.roles.values(), key=lambda role: role["position"])
+        ]
+
+
+class FakeBotClient:
+    """Drop-in for Alliance Auth's ``default_bot_client`` backed by a FakeGuild."""
+
+    def __init__(self, guild: FakeGuild, rate_limit_exc=None, roles_cache=None):
+        self.guild = guild
+        self.rate_limit_exc = rate_limit_exc or _rate_limit_exception()
+        self.invalidations = 0
+        # Shared between clients of one guild, like Alliance Auth's redis cache.
+        self._roles_cache = {} if roles_cache is None else roles_cache
+        self.spawned = []
+        self.threads = set()
+
+    def spawn(self) -> "FakeBotClient":
+        """Stand-in for ``create_bot_client``: a new client on the same guild."""
+        client = FakeBotClient(self.guild, self.rate_limit_exc, self._roles_cache)
+        self.spawned.append(client)
+        return client
+
+    def _api_request(self, method: str, route: str, data=None):
+        self.threads.add(threading.get_ident())
+        status, body, _headers = self.guild.handle(method, route, data)
+        if status == 429:
+            # Alliance Auth reports resets in milliseconds.
+            raise self.rate_limit_exc(body["retry_after"] * 1000)
+        if status >= 400:
+            raise FakeDiscordError(status, body)
+        return body
+
+    def guild_roles(self, guild_id: int, use_cache: bool = True):
+        """Alliance Auth ``Role`` objects (no position), cached until invalidated."""
+        # Alliance Auth
+        from allianceauth.services.modules.discord.discord_client.models import Role
+
+        roles = self._roles_cache.get(guild_id) if use_cache else None
+        if roles is None:
+            roles = self._api_request("get", f"guilds/{guild_id}/roles")
+            self._roles_cache[guild_id] = roles
+        return {Role.from_dict(role) for role in roles}
+
+    def _invalidate_guild_roles_cache(self, guild_id: int) -> None:
+        self.invalidations += 1
+        self._roles_cache.pop(guild_id, None)
+
+
+def _rate_limit_exception():
+    # Alliance Auth
+    from allianceauth.services.modules.discord.discord_client.exceptions import (
+        DiscordRateLimitExhausted,
+    )
+
+    return DiscordRateLimitExhausted
+
+
+@contextmanager
+def fake_bot_client(guild: FakeGuild):
+    """Send this context's Discord calls to a fake guild instead of Alliance Auth's bot.
+
+    The roleset snapshot this process holds belongs to another guild, so it is
+    dropped first.
+    """
+    snapshots._latest = None
+    client = FakeBotClient(guild)
+    with bot_client_override(client, guild.guild_id, spawn=client.spawn):
+        yield client
+
+
+class FakeDiscordServer:
+    """Threaded HTTP server exposing a FakeGuild on localhost."""
+
+    def __init__(self, roles=None, rate_limit_first=0, guild: FakeGuild | None = None):
+        self.guild = guild or FakeGuild(roles, rate_limit_first=rate_limit_first)
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def roles(self) -> dict:
+        return self.guild.roles
+
+    @property
+    def requests(self) -> list[tuple]:
+        return self.guild.requests
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        guild = self.guild
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                return
+
+            def _dispatch(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length)) if length else None
+                status, body, headers = guild.handle(self.command, self.path, payload)
+                data = json.dumps(body).encode("utf-8") if body is not None else b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = _dispatch
+            do_PATCH = _dispatch
+            do_POST = _dispatch
+            do_DELETE = _dispatch
+
+        return Handler
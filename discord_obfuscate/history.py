@@ -0,0 +1,62 @@
+"""Sync run history."""
+
+# Standard Library
+import datetime as dt
+import logging
+
+# Django
+from django.utils import timezone
+
+# Discord Obfuscate App
+from discord_obfuscate.app_settings import DISCORD_OBFUSCATE_SYNC_RUN_RETENTION_DAYS
+from discord_obfuscate.models import SyncRun
+
+logger = logging.getLogger(__name__)
+
+ERROR_MESSAGE_MAX_LEN = 2000
+
+
+def record_sync_run(
+    task_name: str,
+    run,
+    started_at,
+    duration: float,
+    status: str = SyncRun.STATUS_OK,
+    result=None,
+    error: str = "",
+) -> SyncRun:
+    """Store one run's totals with a single insert."""
+    counts = run.counts
+    errors = int(counts.get("errors", 0)) + (1 if status == SyncRun.STATUS_ERROR else 0)
+    return SyncRun.objects.create(
+        task_name=task_name,
+        status=status,
+        started_at=started_at,
+        finished_at=started_at + dt.timedelta(seconds=duration),
+        duration=round(duration, 6),
+        result=int(result) if isinstance(result, (int, bool)) else None,
+        configs_examined=int(counts.get("configs_examined", 0)),
+        renames_sent=int(counts.get("renames", 0)),
+        recolors_sent=int(counts.get("recolors", 0)),
+        reorders_sent=int(counts.get("reorders", 0)),
+        noops_skipped=int(counts.get("noops", 0)),
+        discord_requests=int(counts.get("discord_requests", 0)),
+        rate_limit_sleep=round(counts.get("rate_limit_wait_seconds", 0.0), 3),
+        errors=errors,
+        error_message=error[:ERROR_MESSAGE_MAX_LEN],
+        roleset_hash=run.info.get("roleset_hash", ""),
+        profiler=run.info.get("profiler", ""),
+        profile=run.info.get("profile", ""),
+    )
+
+
+def prune_sync_runs(days: int | None = None) -> int:
+    """Delete runs older than the retention window; returns the number removed."""
+    days = DISCORD_OBFUSCATE_SYNC_RUN_RETENTION_DAYS if days is None else days
+    if not days or days <= 0:
+        return 0
+    cutoff = timezone.now() - dt.timedelta(days=days)
+    deleted, _ = SyncRun.objects.filter(started_at__lt=cutoff).delete()
+    if deleted:
+        logger.info("Pruned %s sync runs older than %s days", deleted, days)
+    return deleted
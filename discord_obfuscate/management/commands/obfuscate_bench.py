@@ -0,0 +1,79 @@
+"""Benchmark the obfuscation hot path and tasks against a synthetic guild."""
+
+# Standard Library
+import json
+
+# Django
+from django.core.management.base import BaseCommand, CommandError
+
+# Discord Obfuscate App
+from discord_obfuscate.benchmark import (
+    DEFAULT_GROUP_COUNTS,
+    DEFAULT_ROLE_COUNTS,
+    run_benchmarks,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark name resolution and the sync, color rule and rotation tasks "
+        "against a fake Discord guild. All data is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--roles",
+            type=int,
+            nargs="+",
+            default=list(DEFAULT_ROLE_COUNTS),
+            help="Guild role counts to benchmark (max 250).",
+        )
+        parser.add_argument(
+            "--groups",
+            type=int,
+            nargs="+",
+            default=list(DEFAULT_GROUP_COUNTS),
+            help="Group counts to benchmark.",
+        )
+        parser.add_argument(
+            "--users",
+            type=int,
+            nargs="+",
+            help="User counts, one per --groups value. Defaults to the group count.",
+        )
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=0.0,
+            help="Simulated Discord latency per request in seconds.",
+        )
+        parser.add_argument(
+            "--output",
+            default="discord_obfuscate-bench.json",
+            help="Path of the JSON report.",
+        )
+
+    def handle(self, *args, **options):
+        if any(count < 3 or count > 250 for count in options["roles"]):
+            raise CommandError("--roles values must be between 3 and 250.")
+        if options["users"] and len(options["users"]) != len(options["groups"]):
+            raise CommandError("--users needs one value per --groups value.")
+
+        def progress(results):
+            for result in results:
+                self.stdout.write(
+                    f"{result.scenario:<22} {result.name:<38} "
+                    f"{result.wall_time * 1000:>10.1f} ms {result.queries:>6} queries "
+                    f"{result.api_calls:>5} api {result.peak_memory / 1024:>10.1f} KiB"
+                )
+
+        report = run_benchmarks(
+            role_counts=options["roles"],
+            group_counts=options["groups"],
+            user_counts=options["users"],
+            latency=options["latency"],
+            progress=progress,
+        )
+        with open(options["output"], "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
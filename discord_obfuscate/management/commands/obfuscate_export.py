@@ -0,0 +1,39 @@
+"""Export obfuscation configs, color rules and role order as JSON lines."""
+
+# Django
+from django.core.management.base import BaseCommand
+
+# Discord Obfuscate App
+from discord_obfuscate.transfer import MODELS, export_jsonl
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream obfuscation configs, color rules and role order to a JSONL file "
+        "for obfuscate_import."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default="-",
+            help="Path of the JSONL file, or - for stdout (default).",
+        )
+        parser.add_argument(
+            "--models",
+            nargs="+",
+            choices=list(MODELS),
+            default=list(MODELS),
+            help="Row types to export. Defaults to all.",
+        )
+
+    def handle(self, *args, **options):
+        if options["output"] == "-":
+            count = export_jsonl(self.stdout, options["models"])
+            self.stderr.write(f"Exported {count} rows.")
+            return
+        with open(options["output"], "w", encoding="utf-8") as handle:
+            count = export_jsonl(handle, options["models"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Exported {count} rows to {options['output']}")
+        )
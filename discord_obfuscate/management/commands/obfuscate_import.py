@@ -0,0 +1,47 @@
+"""Import obfuscation configs, color rules and role order from JSON lines."""
+
+# Standard Library
+import sys
+
+# Django
+from django.core.management.base import BaseCommand, CommandError
+
+# Discord Obfuscate App
+from discord_obfuscate.transfer import TransferError, import_jsonl
+
+
+class Command(BaseCommand):
+    help = (
+        "Upsert obfuscation configs (by group name), color rules (by name) and role "
+        "order entries (by role id) from a JSONL file written by obfuscate_export. "
+        "Nothing is saved if any line is invalid."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Path of the JSONL file, or - for stdin.")
+
+    def handle(self, *args, **options):
+        try:
+            if options["path"] == "-":
+                stats = import_jsonl(sys.stdin)
+            else:
+                with open(options["path"], encoding="utf-8") as handle:
+                    stats = import_jsonl(handle)
+        except OSError as exc:
+            raise CommandError(str(exc)) from exc
+        except TransferError as exc:
+            raise CommandError(f"{exc}; nothing was imported.") from exc
+
+        for tag, counts in stats.items():
+            self.stdout.write(
+                f"{tag:<12} {counts['created']:>6} created {counts['updated']:>6} updated "
+                f"{counts['skipped']:>6} skipped"
+            )
+        skipped = stats["obfuscation"]["skipped"]
+        if skipped:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Skipped {skipped} obfuscation configs whose group does not exist."
+                )
+            )
+        self.stdout.write(self.style.SUCCESS("Import finished."))
@@ -26,6 +26,14 @@ class Command(BaseCommand):
             "month_of_year": "*",
             "timezone": settings.TIME_ZONE,
         }
+        daily = {
+            "minute": "30",
+            "hour": "3",
+            "day_of_week": "*",
+            "day_of_month": "*",
+            "month_of_year": "*",
+            "timezone": settings.TIME_ZONE,
+        }
         every_three_days = {
             "minute": "0",
             "hour": "0",
@@ -56,6 +64,20 @@ class Command(BaseCommand):
             "discord_obfuscate.tasks.periodic_sync_role_colors",
             hourly,
         )
+        self._ensure_periodic_task(
+            PeriodicTask,
+            CrontabSchedule,
+            "Obfuscate Discord: Refresh role status",
+            "discord_obfuscate.tasks.refresh_role_status",
+            hourly,
+        )
+        self._ensure_periodic_task(
+            PeriodicTask,
+            CrontabSchedule,
+            "Obfuscate Discord: Prune sync run history",
+            "discord_obfuscate.tasks.prune_sync_run_history",
+            daily,
+        )
 
     def _ensure_periodic_task(
         self,
@@ -0,0 +1,111 @@
+"""Run the sync, color rule and rotation pipelines in-process."""
+
+# Django
+from django.core.management.base import BaseCommand, CommandError
+
+# Discord Obfuscate App
+from discord_obfuscate.snapshots import load_roleset_snapshot
+from discord_obfuscate.sync_runner import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_PHASES,
+    PHASES,
+    run_sync,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Sync role names, color rules and key rotation synchronously in this "
+        "process instead of on a Celery worker, with progress and per-phase timings."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--phases",
+            nargs="+",
+            choices=PHASES,
+            default=list(DEFAULT_PHASES),
+            help="Phases to run, always in sync, colors, rotate order. "
+            "Rotation changes every random key and only runs when listed.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Configs planned, sent and saved per batch.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            help="Parallel role updates. Defaults to "
+            "DISCORD_OBFUSCATE_ROLE_UPDATE_CONCURRENCY.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Read roles from Discord and report planned changes without "
+            "sending them; all database changes are rolled back.",
+        )
+        parser.add_argument(
+            "--only-changed",
+            action="store_true",
+            help="Skip configs whose stored match state shows the role already "
+            "carries its desired name.",
+        )
+        parser.add_argument(
+            "--from-snapshot",
+            action="store_true",
+            help="With --dry-run, plan against the latest stored roleset snapshot "
+            "instead of fetching roles from Discord.",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        if options["concurrency"] is not None and options["concurrency"] < 1:
+            raise CommandError("--concurrency must be at least 1.")
+        roleset = None
+        if options["from_snapshot"]:
+            if not options["dry_run"]:
+                raise CommandError("--from-snapshot requires --dry-run.")
+            roleset = load_roleset_snapshot()
+            if roleset is None:
+                raise CommandError("No roleset snapshot has been stored yet.")
+            self.stdout.write(f"Using roleset snapshot with {len(roleset)} roles.")
+
+        def progress(result):
+            percent = 100 * result.processed / result.total if result.total else 100
+            self.stdout.write(
+                f"{result.phase:<7} {result.processed:>6}/{result.total:<6} "
+                f"{percent:>5.1f}% {result.throughput:>9.1f}/s "
+                f"{result.elapsed:>8.2f}s"
+            )
+
+        results = run_sync(
+            phases=options["phases"],
+            batch_size=options["batch_size"],
+            concurrency=options["concurrency"],
+            dry_run=options["dry_run"],
+            only_changed=options["only_changed"],
+            progress=progress,
+            roleset=roleset,
+        )
+
+        self.stdout.write(
+            f"{'phase':<7} {'seconds':>9} {'configs':>8} {'result':>8} "
+            f"{'renames':>8} {'recolors':>9} {'reorders':>9} {'errors':>7}"
+        )
+        for result in results:
+            self.stdout.write(
+                f"{result.phase:<7} {result.duration:>9.2f} {result.processed:>8} "
+                f"{result.count:>8} {result.renames:>8} {result.recolors:>9} "
+                f"{result.reorders:>9} {result.errors:>7}"
+            )
+        if options["dry_run"]:
+            self.stdout.write(
+                self.style.WARNING(
+                    "Dry run: nothing was sent and all changes were rolled back."
+                )
+            )
+        else:
+            self.stdout.write(self.style.SUCCESS("Sync finished."))
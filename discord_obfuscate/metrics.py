@@ -0,0 +1,324 @@
+"""Lightweight counters and histograms for the patched hook and the tasks.
+
+Each process keeps its own registry and periodically flushes a snapshot to the
+Django cache. The admin metrics endpoint merges every live snapshot into the
+Prometheus text format.
+"""
+
+# Standard Library
+import contextvars
+import functools
+import json
+import logging
+import os
+import random
+import re
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+# Django
+from django.core.cache import cache
+from django.utils import timezone
+
+# Discord Obfuscate App
+from discord_obfuscate.app_settings import DISCORD_OBFUSCATE_PROFILE_SAMPLE_RATE
+
+logger = logging.getLogger(__name__)
+
+METRICS_PROCESSES_KEY = "discord_obfuscate:metrics:processes"
+METRICS_SNAPSHOT_KEY = "discord_obfuscate:metrics:snapshot:{process}"
+METRICS_TTL = 24 * 60 * 60
+FLUSH_INTERVAL = 30.0
+BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+_ROUTE_ID = re.compile(r"/\d+")
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+_lock = threading.Lock()
+_counters: Dict[Tuple[str, LabelKey], float] = {}
+_histograms: Dict[Tuple[str, LabelKey], list] = {}
+_caches: Dict[str, object] = {}
+_last_flush = 0.0
+_current_run: contextvars.ContextVar = contextvars.ContextVar(
+    "discord_obfuscate_run", default=None
+)
+
+
+def _labels(labels: dict) -> LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def normalize_route(route: str) -> str:
+    """Collapse ids so routes group by endpoint, e.g. guilds/{id}/roles/{id}."""
+    return _ROUTE_ID.sub("/{id}", "/" + route.lstrip("/"))[1:]
+
+
+class RunStats:
+    """Thread-safe per-run totals, shared with worker threads of the same run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts: Dict[str, float] = {}
+        self.info: Dict[str, str] = {}
+
+    def add(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + value
+
+    def get(self, name: str, default: float = 0) -> float:
+        with self._lock:
+            return self.counts.get(name, default)
+
+
+def current_run() -> Optional[RunStats]:
+    return _current_run.get()
+
+
+def run_stat(name: str, value: float = 1) -> None:
+    """Add to the active run's totals without touching the registry."""
+    run = _current_run.get()
+    if run is not None:
+        run.add(name, value)
+
+
+def run_info(name: str, value: str) -> None:
+    """Attach a descriptive value, such as the roleset hash, to the active run."""
+    run = _current_run.get()
+    if run is not None:
+        run.info[name] = value
+
+
+def inc(name: str, value: float = 1, **labels) -> None:
+    """Increment a counter; the active run also accumulates it across labels."""
+    key = (name, _labels(labels))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+    run_stat(name.removeprefix("discord_obfuscate_").removesuffix("_total"), value)
+    maybe_flush()
+
+
+def observe(name: str, value: float, **labels) -> None:
+    """Record one histogram observation in seconds."""
+    key = (name, _labels(labels))
+    with _lock:
+        entry = _histograms.get(key)
+        if entry is None:
+            entry = _histograms[key] = [[0] * len(BUCKETS), 0.0, 0]
+        for position, bound in enumerate(BUCKETS):
+            if value <= bound:
+                entry[0][position] += 1
+                break
+        entry[1] += value
+        entry[2] += 1
+    maybe_flush()
+
+
+@contextmanager
+def timer(name: str, **labels):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start, **labels)
+
+
+def register_cache(name: str, fingerprint_cache) -> None:
+    """Export a FingerprintCache's hit/miss/eviction counters."""
+    _caches[name] = fingerprint_cache
+
+
+def snapshot() -> dict:
+    """JSON-serializable copy of this process's metrics."""
+    with _lock:
+        counters = [
+            [name, dict(labels), value] for (name, labels), value in _counters.items()
+        ]
+        histograms = [
+            [name, dict(labels), list(entry[0]), entry[1], entry[2]]
+            for (name, labels), entry in _histograms.items()
+        ]
+    for cache_name, fingerprint_cache in _caches.items():
+        stats = fingerprint_cache.stats()
+        for result in ("hits", "misses", "evictions"):
+            counters.append(
+                [
+                    "discord_obfuscate_cache_events_total",
+                    {"cache": cache_name, "event": result},
+                    stats[result],
+                ]
+            )
+    return {"counters": counters, "histograms": histograms}
+
+
+def _process_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def flush() -> None:
+    """Publish this process's snapshot to the shared cache."""
+    global _last_flush
+    _last_flush = time.monotonic()
+    process = _process_id()
+    try:
+        cache.set(METRICS_SNAPSHOT_KEY.format(process=process), snapshot(), METRICS_TTL)
+        processes = cache.get(METRICS_PROCESSES_KEY) or []
+        if process not in processes:
+            cache.set(METRICS_PROCESSES_KEY, processes + [process], METRICS_TTL)
+    except Exception:
+        logger.exception("Failed to flush metrics")
+
+
+def maybe_flush() -> None:
+    if time.monotonic() - _last_flush >= FLUSH_INTERVAL:
+        flush()
+
+
+def collect() -> list[dict]:
+    """Snapshots from every process that flushed within the retention window."""
+    flush()
+    processes = cache.get(METRICS_PROCESSES_KEY) or []
+    keys = {
+        process: METRICS_SNAPSHOT_KEY.format(process=process) for process in processes
+    }
+    found = cache.get_many(list(keys.values()))
+    live = [process for process, key in keys.items() if key in found]
+    if len(live) != len(processes):
+        cache.set(METRICS_PROCESSES_KEY, live, METRICS_TTL)
+    return [found[keys[process]] for process in live]
+
+
+def _format_labels(labels: dict, extra: Optional[dict] = None) -> str:
+    merged = dict(labels)
+    merged.update(extra or {})
+    if not merged:
+        return ""
+    body = ",".join(
+        '{}="{}"'.format(key, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+        for key, value in sorted(merged.items())
+    )
+    return "{" + body + "}"
+
+
+def render_prometheus(snapshots: list[dict]) -> str:
+    """Merge process snapshots into the Prometheus text exposition format."""
+    counters: Dict[Tuple[str, LabelKey], float] = {}
+    histograms: Dict[Tuple[str, LabelKey], list] = {}
+    for data in snapshots:
+        for name, labels, value in data.get("counters", []):
+            key = (name, _labels(labels))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, buckets, total, count in data.get("histograms", []):
+            key = (name, _labels(labels))
+            entry = histograms.setdefault(key, [[0] * len(BUCKETS), 0.0, 0])
+            entry[0] = [a + b for a, b in zip(entry[0], buckets)]
+            entry[1] += total
+            entry[2] += count
+
+    lines = []
+    typed = set()
+    for (name, labels), value in sorted(counters.items()):
+        if name not in typed:
+            lines.append(f"# TYPE {name} counter")
+            typed.add(name)
+        lines.append(f"{name}{_format_labels(dict(labels))} {value:g}")
+    for (name, labels), (buckets, total, count) in sorted(histograms.items()):
+        if name not in typed:
+            lines.append(f"# TYPE {name} histogram")
+            typed.add(name)
+        cumulative = 0
+        for bound, bucket in zip(BUCKETS, buckets):
+            cumulative += bucket
+            lines.append(
+                f"{name}_bucket{_format_labels(dict(labels), {'le': f'{bound:g}'})} {cumulative}"
+            )
+        lines.append(
+            f"{name}_bucket{_format_labels(dict(labels), {'le': '+Inf'})} {count}"
+        )
+        lines.append(f"{name}_sum{_format_labels(dict(labels))} {total:.6f}")
+        lines.append(f"{name}_count{_format_labels(dict(labels))} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def should_profile(rate: Optional[float] = None) -> bool:
+    rate = DISCORD_OBFUSCATE_PROFILE_SAMPLE_RATE if rate is None else rate
+    return bool(rate) and random.random() < float(rate)
+
+
+def instrumented(func):
+    """Time a task, collect its per-run totals and log them as one JSON line."""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        run = RunStats()
+        parent = _current_run.get()
+        token = _current_run.set(run)
+        started_at = timezone.now()
+        session = None
+        if parent is None and should_profile():
+            # Discord Obfuscate App
+            from discord_obfuscate import profiling
+
+            session = profiling.start_profile(True)
+        start = time.perf_counter()
+        status = "ok"
+        error = ""
+        result = None
+        try:
+            result = func(*args, **kwargs)
+            return result
+        except Exception as exc:
+            status = "error"
+            error = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            if session is not None:
+                run.info["profiler"], run.info["profile"] = session.stop()
+            _current_run.reset(token)
+            if parent is not None:
+                for name, value in run.counts.items():
+                    parent.add(name, value)
+            observe("discord_obfuscate_task_seconds", duration, task=func.__name__)
+            inc("discord_obfuscate_task_runs_total", task=func.__name__, status=status)
+            logger.info(
+                "task_metrics %s",
+                json.dumps(
+                    {
+                        "task": func.__name__,
+                        "status": status,
+                        "duration": round(duration, 6),
+                        "result": result if isinstance(result, (int, bool)) else None,
+                        **run.counts,
+                    },
+                    sort_keys=True,
+                ),
+            )
+            if parent is None:
+                _record_run(
+                    func.__name__, run, started_at, duration, status, result, error
+                )
+            flush()
+
+    return wrapper
+
+
+def _record_run(task_name, run, started_at, duration, status, result, error) -> None:
+    # Discord Obfuscate App
+    from discord_obfuscate.history import record_sync_run
+
+    try:
+        record_sync_run(
+            task_name,
+            run,
+            started_at=started_at,
+            duration=duration,
+            status=status,
+            result=result,
+            error=error,
+        )
+    except Exception:
+        logger.exception("Failed to record sync run for %s", task_name)
@@ -0,0 +1,26 @@
+# Generated by Discord Obfuscate on 2026-10-19
+
+# Django
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("discord_obfuscate", "0006_role_order_default_shuffle"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="discordroleobfuscation",
+            name="pending_random_key",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text=(
+                    "Staged random key awaiting a successful rename during rotation. "
+                    "Promoted to the random key once Discord accepts the new name."
+                ),
+                max_length=16,
+            ),
+        ),
+    ]
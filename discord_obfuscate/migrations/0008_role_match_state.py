@@ -0,0 +1,50 @@
+# Generated by Discord Obfuscate on 2026-10-19
+
+# Django
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("discord_obfuscate", "0007_pending_random_key"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="discordroleobfuscation",
+            name="role_id",
+            field=models.BigIntegerField(
+                blank=True,
+                db_index=True,
+                help_text="Cached Discord role ID for rename operations.",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="discordroleobfuscation",
+            name="role_match",
+            field=models.CharField(
+                blank=True,
+                choices=[
+                    ("desired", "Desired name"),
+                    ("last", "Last known role"),
+                    ("original", "Original name"),
+                    ("none", "No role"),
+                ],
+                db_index=True,
+                default="",
+                help_text="How the Discord role was matched at the last verification.",
+                max_length=16,
+            ),
+        ),
+        migrations.AddField(
+            model_name="discordroleobfuscation",
+            name="role_verified_at",
+            field=models.DateTimeField(
+                blank=True,
+                db_index=True,
+                help_text="When the role match was last verified against Discord.",
+                null=True,
+            ),
+        ),
+    ]
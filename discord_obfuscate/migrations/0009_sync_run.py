@@ -0,0 +1,64 @@
+# Generated by Discord Obfuscate on 2026-10-19
+
+# Django
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("discord_obfuscate", "0008_role_match_state"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SyncRun",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("task_name", models.CharField(db_index=True, max_length=100)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("ok", "OK"), ("error", "Error")],
+                        default="ok",
+                        max_length=16,
+                    ),
+                ),
+                ("started_at", models.DateTimeField(db_index=True)),
+                ("finished_at", models.DateTimeField()),
+                ("duration", models.FloatField(help_text="Wall time in seconds.")),
+                ("result", models.IntegerField(blank=True, null=True)),
+                ("configs_examined", models.PositiveIntegerField(default=0)),
+                ("renames_sent", models.PositiveIntegerField(default=0)),
+                ("recolors_sent", models.PositiveIntegerField(default=0)),
+                ("reorders_sent", models.PositiveIntegerField(default=0)),
+                ("noops_skipped", models.PositiveIntegerField(default=0)),
+                ("discord_requests", models.PositiveIntegerField(default=0)),
+                (
+                    "rate_limit_sleep",
+                    models.FloatField(
+                        default=0.0,
+                        help_text="Seconds spent waiting on Discord rate limits.",
+                    ),
+                ),
+                ("errors", models.PositiveIntegerField(default=0)),
+                ("error_message", models.TextField(blank=True, default="")),
+                (
+                    "roleset_hash",
+                    models.CharField(blank=True, default="", max_length=64),
+                ),
+            ],
+            options={
+                "verbose_name": "Sync Run",
+                "verbose_name_plural": "Sync Runs",
+                "ordering": ["-started_at"],
+            },
+        ),
+    ]
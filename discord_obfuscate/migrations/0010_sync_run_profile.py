@@ -0,0 +1,27 @@
+# Generated by Discord Obfuscate on 2026-10-19
+
+# Django
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("discord_obfuscate", "0009_sync_run"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="syncrun",
+            name="profiler",
+            field=models.CharField(blank=True, default="", max_length=16),
+        ),
+        migrations.AddField(
+            model_name="syncrun",
+            name="profile",
+            field=models.TextField(
+                blank=True,
+                default="",
+                help_text="Aggregated profile for sampled runs.",
+            ),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Discord Obfuscate on 2026-10-19
+
+# Django
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("discord_obfuscate", "0010_sync_run_profile"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RolesetSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("fingerprint", models.CharField(max_length=40, unique=True)),
+                (
+                    "roles",
+                    models.JSONField(
+                        default=list,
+                        help_text="[id, name, position, color, managed] per role.",
+                    ),
+                ),
+                ("role_count", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "last_seen_at",
+                    models.DateTimeField(
+                        db_index=True,
+                        help_text="Last time a fetch from Discord returned this roleset.",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Roleset Snapshot",
+                "verbose_name_plural": "Roleset Snapshots",
+                "ordering": ["-last_seen_at"],
+            },
+        ),
+    ]
@@ -9,7 +9,11 @@ from django.core.validators import MaxValueValidator, MinValueValidator
 from solo.models import SingletonModel
 
 # Discord Obfuscate App
-from discord_obfuscate.constants import ALLOWED_DIVIDERS, OBFUSCATION_METHODS
+from discord_obfuscate.constants import (
+    ALLOWED_DIVIDERS,
+    OBFUSCATION_METHODS,
+    ROLE_MATCH_CHOICES,
+)
 
 
 class General(models.Model):
@@ -75,6 +79,15 @@ class DiscordRoleObfuscation(models.Model):
         default="",
         help_text="Random 16-character key used for obfuscation when enabled.",
     )
+    pending_random_key = models.CharField(
+        max_length=16,
+        blank=True,
+        default="",
+        help_text=(
+            "Staged random key awaiting a successful rename during rotation. "
+            "Promoted to the random key once Discord accepts the new name."
+        ),
+    )
     random_key_rotate_name = models.BooleanField(
         default=True,
         help_text=(
@@ -98,8 +111,23 @@ class DiscordRoleObfuscation(models.Model):
     role_id = models.BigIntegerField(
         null=True,
         blank=True,
+        db_index=True,
         help_text="Cached Discord role ID for rename operations.",
     )
+    role_match = models.CharField(
+        max_length=16,
+        blank=True,
+        default="",
+        choices=ROLE_MATCH_CHOICES,
+        db_index=True,
+        help_text="How the Discord role was matched at the last verification.",
+    )
+    role_verified_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text="When the role match was last verified against Discord.",
+    )
     last_obfuscated_name = models.CharField(
         max_length=100,
         blank=True,
@@ -326,3 +354,72 @@ class DiscordRoleColorAssignment(models.Model):
 
     def __str__(self):
         return f"{self.role_name} ({self.color})"
+
+
+class SyncRun(models.Model):
+    """One task run with its performance stats."""
+
+    STATUS_OK = "ok"
+    STATUS_ERROR = "error"
+    STATUS_CHOICES = (
+        (STATUS_OK, "OK"),
+        (STATUS_ERROR, "Error"),
+    )
+
+    task_name = models.CharField(max_length=100, db_index=True)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_OK)
+    started_at = models.DateTimeField(db_index=True)
+    finished_at = models.DateTimeField()
+    duration = models.FloatField(help_text="Wall time in seconds.")
+    result = models.IntegerField(null=True, blank=True)
+    configs_examined = models.PositiveIntegerField(default=0)
+    renames_sent = models.PositiveIntegerField(default=0)
+    recolors_sent = models.PositiveIntegerField(default=0)
+    reorders_sent = models.PositiveIntegerField(default=0)
+    noops_skipped = models.PositiveIntegerField(default=0)
+    discord_requests = models.PositiveIntegerField(default=0)
+    rate_limit_sleep = models.FloatField(
+        default=0.0,
+        help_text="Seconds spent waiting on Discord rate limits.",
+    )
+    errors = models.PositiveIntegerField(default=0)
+    error_message = models.TextField(blank=True, default="")
+    roleset_hash = models.CharField(max_length=64, blank=True, default="")
+    profiler = models.CharField(max_length=16, blank=True, default="")
+    profile = models.TextField(
+        blank=True,
+        default="",
+        help_text="Aggregated profile for sampled runs.",
+    )
+
+    class Meta:
+        ordering = ["-started_at"]
+        verbose_name = "Sync Run"
+        verbose_name_plural = "Sync Runs"
+
+    def __str__(self):
+        return f"{self.task_name} @ {self.started_at:%Y-%m-%d %H:%M:%S}"
+
+
+class RolesetSnapshot(models.Model):
+    """One distinct normalized Discord roleset and when a fetch last returned it."""
+
+    fingerprint = models.CharField(max_length=40, unique=True)
+    roles = models.JSONField(
+        default=list,
+        help_text="[id, name, position, color, managed] per role.",
+    )
+    role_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_seen_at = models.DateTimeField(
+        db_index=True,
+        help_text="Last time a fetch from Discord returned this roleset.",
+    )
+
+    class Meta:
+        ordering = ["-last_seen_at"]
+        verbose_name = "Roleset Snapshot"
+        verbose_name_plural = "Roleset Snapshots"
+
+    def __str__(self):
+        return f"{self.role_count} roles @ {self.last_seen_at:%Y-%m-%d %H:%M:%S}"
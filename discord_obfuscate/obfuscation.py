@@ -2,6 +2,8 @@
 
 # Standard Library
 import base64
+import contextvars
+import functools
 import hashlib
 import hmac
 import itertools
@@ -12,16 +14,19 @@ import time
 import json
 from dataclasses import dataclass, field
 from collections.abc import Mapping
-from typing import Dict, Iterable, List, Optional
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
 
 # Django
 from django.contrib.auth.models import Group, User
 
-# Alliance Auth
-from allianceauth.services.modules.discord.discord_client.helpers import RolesSet
-
 # Discord Obfuscate App
-from discord_obfuscate.app_settings import DISCORD_OBFUSCATE_SECRET
+from discord_obfuscate import metrics
+from discord_obfuscate.app_settings import (
+    DISCORD_OBFUSCATE_ROLESET_SNAPSHOT_MAX_AGE,
+    DISCORD_OBFUSCATE_SECRET,
+)
+from discord_obfuscate.cache import FingerprintCache, mapping_version
 from discord_obfuscate.config import require_existing_role
 from discord_obfuscate.constants import (
     ALLOWED_DIVIDERS,
@@ -29,11 +34,18 @@ from discord_obfuscate.constants import (
     DEFAULT_OBFUSCATE_FORMAT,
     DEFAULT_OBFUSCATE_METHOD,
     DEFAULT_OBFUSCATE_PREFIX,
+    NAME_CACHE_MAX_ENTRIES,
+    NAME_CACHE_TTL,
     OBFUSCATION_METHODS,
+    ROLE_MATCH_NONE,
     ROLE_NAME_MAX_LEN,
 )
 from discord_obfuscate.models import DiscordRoleObfuscation
 
+if TYPE_CHECKING:
+    # Alliance Auth
+    from allianceauth.services.modules.discord.discord_client.helpers import RolesSet
+
 logger = logging.getLogger(__name__)
 
 RANDOM_KEY_CHARS = string.ascii_letters + string.digits
@@ -109,13 +121,20 @@ def _method_info(method: str) -> tuple:
     return algo, encoding
 
 
-def _hash_bytes(name: str, secret: str, algo: str) -> bytes:
+@functools.lru_cache(maxsize=16)
+def _keyed_hmac(secret: str, algo: str):
+    """Return an HMAC already keyed with the secret; callers must copy() it."""
     secret_bytes = str(secret or "").encode("utf-8")
-    name_bytes = str(name).encode("utf-8")
     digestmod = hashlib.sha256
     if algo == "blake2s":
         digestmod = hashlib.blake2s
-    return hmac.new(secret_bytes, name_bytes, digestmod).digest()
+    return hmac.new(secret_bytes, digestmod=digestmod)
+
+
+def _hash_bytes(name: str, secret: str, algo: str) -> bytes:
+    mac = _keyed_hmac(str(secret or ""), algo).copy()
+    mac.update(str(name).encode("utf-8"))
+    return mac.digest()
 
 
 def _encode_hash(hash_bytes: bytes, encoding: str) -> str:
@@ -253,10 +272,23 @@ def _normalize_role_id(value) -> int:
 
 def _fetch_raw_roles(client, guild_id):
     try:
-        return client._api_request(method="get", route=f"guilds/{guild_id}/roles")
+        raw_roles = client._api_request(method="get", route=f"guilds/{guild_id}/roles")
     except Exception:
+        metrics.inc(
+            "discord_obfuscate_discord_requests_total",
+            method="GET",
+            route="guilds/{id}/roles",
+            result="error",
+        )
         logger.exception("Failed to fetch raw roles from Discord API")
         return None
+    metrics.inc(
+        "discord_obfuscate_discord_requests_total",
+        method="GET",
+        route="guilds/{id}/roles",
+        result="ok",
+    )
+    return raw_roles
 
 
 def _raw_role_from_payload(payload: dict) -> RawRole:
@@ -307,19 +339,107 @@ def _normalize_raw_roles(raw_roles):
     return None
 
 
-def fetch_roleset(use_cache: bool = True, max_attempts: int = 3) -> RolesSet:
-    """Fetch roles for the configured guild as RolesSet."""
+def _roles_set(roles: list) -> "RolesSet":
+    """Wrap roles in Alliance Auth's RolesSet, importing the Discord client on first use."""
+    # Alliance Auth
+    from allianceauth.services.modules.discord.discord_client.helpers import RolesSet
+
+    return RolesSet(roles)
+
+
+_roleset_override: contextvars.ContextVar = contextvars.ContextVar(
+    "discord_obfuscate_roleset_override", default=None
+)
+
+
+@contextmanager
+def roleset_override(roleset):
+    """Serve fetch_roleset from a fixed roleset, such as a stored snapshot."""
+    token = _roleset_override.set(roleset)
+    try:
+        yield roleset
+    finally:
+        _roleset_override.reset(token)
+
+
+_bot_client_override: contextvars.ContextVar = contextvars.ContextVar(
+    "discord_obfuscate_bot_client_override", default=None
+)
+
+
+@contextmanager
+def bot_client_override(client, guild_id: int, spawn=None):
+    """Send Discord calls in this context to ``client`` for ``guild_id``.
+
+    ``spawn`` creates the per-thread clients for threaded role updates and
+    defaults to sharing ``client``.
+    """
+    token = _bot_client_override.set((client, guild_id, spawn or (lambda: client)))
+    try:
+        yield client
+    finally:
+        _bot_client_override.reset(token)
+
+
+def bot_client():
+    """Return ``(client, guild_id)``: the override or Alliance Auth's bot client."""
+    override = _bot_client_override.get()
+    if override is not None:
+        return override[0], override[1]
+    # Alliance Auth
+    from allianceauth.services.modules.discord.core import (
+        DISCORD_GUILD_ID,
+        default_bot_client,
+    )
+
+    return default_bot_client, DISCORD_GUILD_ID
+
+
+def create_bot_client():
+    """Return a new bot client, for worker threads that must not share one."""
+    override = _bot_client_override.get()
+    if override is not None:
+        return override[2]()
+    # Alliance Auth
+    from allianceauth.services.modules.discord import core
+
+    return core.create_bot_client()
+
+
+def _fresh_snapshot():
+    """Latest roleset snapshot seen within the max age, or None; see snapshots.py."""
+    # Discord Obfuscate App
+    from discord_obfuscate.snapshots import load_roleset_snapshot
+
+    return load_roleset_snapshot(max_age=DISCORD_OBFUSCATE_ROLESET_SNAPSHOT_MAX_AGE)
+
+
+def fetch_roleset(use_cache: bool = True, max_attempts: int = 3) -> "RolesSet":
+    """Fetch roles for the configured guild as RolesSet.
+
+    With ``use_cache`` a fresh roleset snapshot is served before asking Discord.
+    The sync tasks store those snapshots; this function never writes them.
+    """
+    override = _roleset_override.get()
+    if override is not None:
+        return override
+    if use_cache:
+        roleset = _fresh_snapshot()
+        if roleset is not None:
+            metrics.inc("discord_obfuscate_roleset_fetches_total", source="snapshot")
+            return roleset
     try:
-        from allianceauth.services.modules.discord.core import (
-            default_bot_client,
-            DISCORD_GUILD_ID,
-        )
         from allianceauth.services.modules.discord.discord_client.exceptions import (
             DiscordRateLimitExhausted,
         )
 
+        default_bot_client, DISCORD_GUILD_ID = bot_client()
         for attempt in range(1, max_attempts + 1):
             try:
+                metrics.inc(
+                    "discord_obfuscate_roleset_fetches_total",
+                    source="cache" if use_cache else "api",
+                )
                 roles = default_bot_client.guild_roles(
                     guild_id=DISCORD_GUILD_ID, use_cache=use_cache
                 )
@@ -340,11 +460,12 @@ def fetch_roleset(use_cache: bool = True, max_attempts: int = 3) -> RolesSet:
                         "Raw role fetch did not return a list; position data unavailable."
                     )
                     return SimpleRolesSet(roles)
-                return RolesSet(roles)
+                return _roles_set(roles)
             except DiscordRateLimitExhausted as exc:
                 if attempt >= max_attempts:
                     raise
                 delay = _rate_limit_delay(exc)
+                metrics.inc("discord_obfuscate_rate_limit_wait_seconds_total", delay)
                 logger.warning(
                     "Rate limit hit fetching roles; retrying in %.2fs (attempt %s/%s)",
                     delay,
@@ -354,13 +475,13 @@ def fetch_roleset(use_cache: bool = True, max_attempts: int = 3) -> RolesSet:
                 time.sleep(delay)
     except Exception:
         logger.exception("Failed to fetch roles from Discord")
-        return RolesSet([])
-    return RolesSet([])
+        return _roles_set([])
+    return _roles_set([])
 
 
 def resolve_group_role_name(
     group: Group,
-    roleset: RolesSet,
+    roleset: "RolesSet",
     config: Optional[DiscordRoleObfuscation] = None,
 ) -> RoleNameResolution:
     """Resolve role name to be used for a group."""
@@ -411,6 +532,19 @@ def resolve_group_role_name(
     )
 
 
+def resolve_state_role_name(state_name: str, roleset: "RolesSet") -> Optional[str]:
+    """Resolve the role Alliance Auth adds for a user's state."""
+    if roleset.role_by_name(state_name):
+        return state_name
+    if not require_existing_role():
+        return state_name
+    logger.debug(
+        "Skipping state %s because no matching role exists in Discord",
+        state_name,
+    )
+    return None
+
+
 def obfuscated_user_group_names(
     user: User,
     state_name: Optional[str] = None,
@@ -430,10 +564,12 @@ def obfuscated_names_for_groups(groups: Iterable[Group]) -> List[str]:
     if roleset is None:
         return [group.name for group in groups]
 
+    configs = get_group_configs(groups)
     role_names: List[str] = []
     for group in groups:
-        config = DiscordRoleObfuscation.objects.filter(group=group).first()
-        resolution = resolve_group_role_name(group, roleset, config=config)
+        resolution = resolve_group_role_name(
+            group, roleset, config=configs.get(group.id)
+        )
         if resolution.used_name:
             if resolution.used_name != group.name:
                 logger.debug(
@@ -453,27 +589,95 @@ def obfuscated_names_for_groups(groups: Iterable[Group]) -> List[str]:
     return role_names
 
 
-def obfuscated_names_for_role_names(role_names: Iterable[str]) -> List[str]:
-    """Obfuscate matching group names within an arbitrary list of role names."""
-    role_names = list(role_names)
-    if not role_names:
-        return []
-    if not DEFAULT_OBFUSCATE_ENABLED:
-        return role_names
+name_cache = FingerprintCache(NAME_CACHE_MAX_ENTRIES, NAME_CACHE_TTL)
+metrics.register_cache("names", name_cache)
 
+
+def _role_name_fingerprint(role_names: List[str]) -> str:
+    digest = hashlib.sha1()
+    for name in role_names:
+        digest.update(name.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _resolve_name_map(
+    role_names: List[str],
+    state_name: Optional[str] = None,
+    require_role: bool = True,
+) -> Optional[Dict[str, Optional[str]]]:
     groups = list(Group.objects.filter(name__in=role_names))
-    if not groups:
-        return role_names
+    group_names = {group.name for group in groups}
+    state_role = None
+    if state_name and state_name in role_names and state_name not in group_names:
+        state_role = state_name
+    if not groups and not state_role:
+        return {}
+
+    configs = get_group_configs(groups)
+    name_map: Dict[str, Optional[str]] = {}
+    if require_role:
+        unmatched = [
+            group
+            for group in groups
+            if configs.get(group.id) and configs[group.id].role_match == ROLE_MATCH_NONE
+        ]
+        for group in unmatched:
+            logger.debug(
+                "Skipping group %s because its role was verified missing",
+                group.name,
+            )
+            name_map[group.name] = None
+        if unmatched:
+            groups = [group for group in groups if group.name not in name_map]
+        if not groups and not state_role:
+            return name_map
 
     roleset = _load_roleset_with_retry()
     if roleset is None:
-        return role_names
+        return None
 
-    name_map: Dict[str, Optional[str]] = {}
     for group in groups:
-        config = DiscordRoleObfuscation.objects.filter(group=group).first()
-        resolution = resolve_group_role_name(group, roleset, config=config)
+        resolution = resolve_group_role_name(
+            group, roleset, config=configs.get(group.id)
+        )
         name_map[group.name] = resolution.used_name
+    if state_role:
+        name_map[state_role] = resolve_state_role_name(state_role, roleset)
+    return name_map
+
+
+def obfuscated_names_for_role_names(
+    role_names: Iterable[str],
+    state_name: Optional[str] = None,
+) -> List[str]:
+    """Obfuscate matching group and state names within an arbitrary list of role names.
+
+    Name maps are cached by (mapping version, Require existing role, state,
+    fingerprint of the sorted role names) so users sharing the same memberships
+    resolve once; the output keeps the order of ``role_names``.
+    """
+    role_names = list(role_names)
+    if not role_names:
+        return []
+    if not DEFAULT_OBFUSCATE_ENABLED:
+        return role_names
+
+    require_role = require_existing_role()
+    key = (
+        mapping_version(),
+        require_role,
+        state_name or "",
+        _role_name_fingerprint(sorted(role_names)),
+    )
+    name_map = name_cache.get(key)
+    if name_map is None:
+        name_map = _resolve_name_map(
+            role_names, state_name=state_name, require_role=require_role
+        )
+        if name_map is None:
+            return role_names
+        name_cache.set(key, name_map)
 
     output: List[str] = []
     for name in role_names:
@@ -486,11 +690,12 @@ def obfuscated_names_for_role_names(role_names: Iterable[str]) -> List[str]:
     return output
 
 
-def _load_roleset_with_retry() -> Optional[RolesSet]:
+def _load_roleset_with_retry() -> Optional["RolesSet"]:
     roleset = fetch_roleset(use_cache=True)
     if roleset and len(roleset):
         return roleset
     logger.warning("Roleset cache empty; refetching from Discord API.")
+    metrics.inc("discord_obfuscate_fallbacks_total", kind="roleset_refetch")
     roleset = None
     for attempt in range(1, 4):
         roleset = fetch_roleset(use_cache=False)
@@ -505,6 +710,7 @@ def _load_roleset_with_retry() -> Optional[RolesSet]:
     logger.warning(
         "Roleset unavailable; returning original group names to avoid role creation."
     )
+    metrics.inc("discord_obfuscate_fallbacks_total", kind="roleset_unavailable")
     return None
 
 
@@ -3,15 +3,16 @@
 # Standard Library
 import logging
 
+# Django
+from django.apps import apps
+
 # Discord Obfuscate App
-from discord_obfuscate.obfuscation import (
-    obfuscated_names_for_role_names,
-    obfuscated_user_group_names,
-)
+from discord_obfuscate import metrics
 
 logger = logging.getLogger(__name__)
 
 _PATCHED = False
+DISCORD_SERVICE_APP = "allianceauth.services.modules.discord"
 
 
 def patch_discord_user_group_names() -> None:
@@ -20,6 +21,10 @@ def patch_discord_user_group_names() -> None:
     if _PATCHED:
         return
 
+    if not apps.is_installed(DISCORD_SERVICE_APP):
+        logger.info("Discord service not installed; skipping patch")
+        return
+
     try:
         from allianceauth.services.modules.discord import core as discord_core
     except Exception:
@@ -30,12 +35,21 @@ def patch_discord_user_group_names() -> None:
     logger.info("Patching Alliance Auth Discord _user_group_names")
 
     def _patched_user_group_names(user, state_name=None):
-        try:
-            original_names = original(user, state_name=state_name)
-            return obfuscated_names_for_role_names(original_names)
-        except Exception:
-            logger.exception("Failed to obfuscate group names, falling back")
-            return original(user, state_name=state_name)
+        with metrics.timer("discord_obfuscate_hook_seconds"):
+            try:
+                # The obfuscation module is loaded on the first sync, not at startup.
+                from discord_obfuscate.obfuscation import (
+                    obfuscated_names_for_role_names,
+                )
+
+                original_names = original(user, state_name=state_name)
+                return obfuscated_names_for_role_names(
+                    original_names, state_name=state_name
+                )
+            except Exception:
+                logger.exception("Failed to obfuscate group names, falling back")
+                metrics.inc("discord_obfuscate_fallbacks_total", kind="hook_error")
+                return original(user, state_name=state_name)
 
     discord_core._user_group_names = _patched_user_group_names
     logger.info("Patched Alliance Auth Discord _user_group_names")
@@ -0,0 +1,64 @@
+"""Sampled profiling of task runs.
+
+Disabled unless ``DISCORD_OBFUSCATE_PROFILE_SAMPLE_RATE`` is above 0. Runs that
+are not sampled only pay for one ``random.random()`` call in
+``metrics.should_profile``; this module is imported by the first sampled run.
+"""
+
+# Standard Library
+import cProfile
+import io
+import logging
+import pstats
+from typing import Optional, Tuple
+
+# Discord Obfuscate App
+from discord_obfuscate.app_settings import DISCORD_OBFUSCATE_PROFILER
+
+try:
+    # Third Party
+    import pyinstrument
+except ImportError:  # pragma: no cover
+    pyinstrument = None
+
+logger = logging.getLogger(__name__)
+
+PROFILE_TOP_FUNCTIONS = 40
+
+
+class ProfileSession:
+    """One running profiler; stop() returns (profiler name, text report)."""
+
+    def __init__(self, profiler: str = DISCORD_OBFUSCATE_PROFILER):
+        self.name = (
+            "pyinstrument"
+            if profiler == "pyinstrument" and pyinstrument
+            else "cprofile"
+        )
+        if self.name == "pyinstrument":
+            self._profiler = pyinstrument.Profiler()
+            self._profiler.start()
+        else:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def stop(self) -> Tuple[str, str]:
+        if self.name == "pyinstrument":
+            self._profiler.stop()
+            return self.name, self._profiler.output_text(unicode=False, color=False)
+        self._profiler.disable()
+        stream = io.StringIO()
+        stats = pstats.Stats(self._profiler, stream=stream)
+        stats.strip_dirs().sort_stats("cumulative").print_stats(PROFILE_TOP_FUNCTIONS)
+        return self.name, stream.getvalue()
+
+
+def start_profile(enabled: bool) -> Optional[ProfileSession]:
+    """Start a profiler when enabled; returns None if disabled or another profiler is active."""
+    if not enabled:
+        return None
+    try:
+        return ProfileSession()
+    except Exception:
+        logger.warning("Could not start profiler; running unprofiled", exc_info=True)
+        return None
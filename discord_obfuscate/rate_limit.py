@@ -0,0 +1,34 @@
+"""Shared rate limiter for concurrent Discord requests."""
+
+# Standard Library
+import threading
+import time
+
+
+class RateLimiter:
+    """Thread-safe limiter spacing request starts and honoring shared back-off."""
+
+    def __init__(self, rate_per_second: float):
+        self.interval = (
+            1.0 / rate_per_second if rate_per_second and rate_per_second > 0 else 0.0
+        )
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+        self._blocked_until = 0.0
+        self.waited = 0.0
+
+    def wait(self) -> None:
+        """Block until the caller may send its next request."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_slot, self._blocked_until)
+            self._next_slot = start + self.interval
+            delay = start - now
+            self.waited += delay
+        if delay > 0:
+            time.sleep(delay)
+
+    def block_for(self, seconds: float) -> None:
+        """Pause every caller, e.g. after a 429 response."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
@@ -0,0 +1,265 @@
+"""Reverse index from Discord roles to obfuscation configs."""
+
+# Standard Library
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional
+
+# Django
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.utils import timezone
+
+# Discord Obfuscate App
+from discord_obfuscate import metrics
+from discord_obfuscate.cache import (
+    FingerprintCache,
+    bump_mapping_version,
+    mapping_version,
+)
+from discord_obfuscate.constants import (
+    ROLE_INDEX_TTL,
+    ROLE_MATCH_DESIRED,
+    ROLE_MATCH_LAST,
+    ROLE_MATCH_NONE,
+    ROLE_MATCH_ORIGINAL,
+)
+from discord_obfuscate.models import DiscordRoleObfuscation
+from discord_obfuscate.obfuscation import role_name_for_group
+
+logger = logging.getLogger(__name__)
+
+ROLE_INDEX_KEY = "discord_obfuscate:role_index:{version}:{fingerprint}"
+ELIGIBLE_GROUPS_KEY = "discord_obfuscate:eligible_group_ids"
+
+
+@dataclass(frozen=True)
+class RoleMatch:
+    """Role currently backing a config."""
+
+    config_id: int
+    group_id: int
+    group_name: str
+    opt_out: bool
+    desired_name: str
+    role_id: Optional[int]
+    match_kind: str
+
+
+@dataclass(frozen=True)
+class RoleIndex:
+    """Config <-> role lookups for one roleset."""
+
+    fingerprint: str
+    matches: Dict[int, RoleMatch] = field(default_factory=dict)
+    by_role_id: Dict[int, int] = field(default_factory=dict)
+    by_role_name: Dict[str, int] = field(default_factory=dict)
+
+    def match_for_config(self, config_id: int) -> Optional[RoleMatch]:
+        return self.matches.get(config_id)
+
+    def match_for_role(self, role_id: int) -> Optional[RoleMatch]:
+        config_id = self.by_role_id.get(role_id)
+        if config_id is None:
+            return None
+        return self.matches.get(config_id)
+
+    def role_exists(self, config_id: int) -> bool:
+        match = self.matches.get(config_id)
+        return bool(match and match.match_kind != ROLE_MATCH_NONE)
+
+
+def roleset_fingerprint(roleset) -> str:
+    """Stable hash of role ids and names."""
+    digest = hashlib.sha1()
+    for role_id, name in sorted((role.id, role.name or "") for role in roleset or []):
+        digest.update(f"{role_id}:{name}".encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _match_role(
+    config: DiscordRoleObfuscation, desired: str, roles_by_id, roles_by_name
+):
+    # The stored role id wins over names, as other roles may share a name.
+    if config.role_id and config.role_id in roles_by_id:
+        role = roles_by_id[config.role_id]
+        if role.name == desired:
+            return role, ROLE_MATCH_DESIRED
+        if role.name == config.group.name:
+            return role, ROLE_MATCH_ORIGINAL
+        return role, ROLE_MATCH_LAST
+    role = roles_by_name.get(desired)
+    if role:
+        return role, ROLE_MATCH_DESIRED
+    if config.last_obfuscated_name and config.last_obfuscated_name in roles_by_name:
+        return roles_by_name[config.last_obfuscated_name], ROLE_MATCH_LAST
+    role = roles_by_name.get(config.group.name)
+    if role:
+        return role, ROLE_MATCH_ORIGINAL
+    return None, ROLE_MATCH_NONE
+
+
+def build_role_index(
+    roleset,
+    configs: Optional[Iterable[DiscordRoleObfuscation]] = None,
+) -> RoleIndex:
+    """Match every config to its Discord role once."""
+    if configs is None:
+        configs = DiscordRoleObfuscation.objects.select_related("group")
+    roles = list(roleset or [])
+    roles_by_id = {role.id: role for role in roles}
+    roles_by_name = {role.name: role for role in roles}
+    index = RoleIndex(fingerprint=roleset_fingerprint(roles))
+
+    for config in configs:
+        desired = role_name_for_group(config.group, config)
+        role, kind = _match_role(config, desired, roles_by_id, roles_by_name)
+        index.matches[config.pk] = RoleMatch(
+            config_id=config.pk,
+            group_id=config.group_id,
+            group_name=config.group.name,
+            opt_out=bool(config.opt_out),
+            desired_name=desired,
+            role_id=role.id if role else None,
+            match_kind=kind,
+        )
+        if role:
+            index.by_role_id.setdefault(role.id, config.pk)
+            index.by_role_name.setdefault(role.name, config.pk)
+
+    return index
+
+
+def _index_key(fingerprint: str) -> str:
+    return ROLE_INDEX_KEY.format(version=mapping_version(), fingerprint=fingerprint)
+
+
+def _cache_role_index(index: RoleIndex) -> RoleIndex:
+    try:
+        cache.set(_index_key(index.fingerprint), index, timeout=ROLE_INDEX_TTL)
+    except Exception:
+        logger.exception("Failed to store role index in cache")
+    return index
+
+
+def refresh_role_index(roleset) -> RoleIndex:
+    """Rebuild and cache the index, then persist match state and eligible groups.
+
+    Writes to every config row, so only tasks and sync runs call this; reads go
+    through get_role_index.
+    """
+    index = build_role_index(roleset)
+    if len(roleset or []):
+        # May bump the mapping version, so the index is cached afterwards.
+        store_match_state(index)
+        store_eligible_groups(roleset)
+    return _cache_role_index(index)
+
+
+def store_eligible_groups(roleset) -> list[int]:
+    """Cache ids of groups whose name matches a Discord role."""
+    role_names = {role.name for role in roleset or [] if role.name}
+    group_ids = sorted(
+        Group.objects.filter(name__in=role_names).values_list("id", flat=True)
+    )
+    try:
+        cache.set(ELIGIBLE_GROUPS_KEY, group_ids, timeout=None)
+    except Exception:
+        logger.exception("Failed to store eligible groups in cache")
+    return group_ids
+
+
+def get_eligible_group_ids() -> Optional[list[int]]:
+    """Return cached eligible group ids, or None if never refreshed."""
+    try:
+        group_ids = cache.get(ELIGIBLE_GROUPS_KEY)
+    except Exception:
+        logger.exception("Failed to read eligible groups from cache")
+        return None
+    if isinstance(group_ids, list):
+        return group_ids
+    return None
+
+
+def store_match_state(index: RoleIndex) -> int:
+    """Persist matched role, match kind and verification time on each config.
+
+    Name resolution skips groups by match kind, so a changed kind bumps the
+    mapping version.
+    """
+    now = timezone.now()
+    configs = list(
+        DiscordRoleObfuscation.objects.filter(pk__in=list(index.matches)).only(
+            "id", "role_id", "role_match", "role_verified_at"
+        )
+    )
+    changed = False
+    for config in configs:
+        match = index.matches[config.pk]
+        changed = changed or config.role_match != match.match_kind
+        config.role_match = match.match_kind
+        config.role_verified_at = now
+        if match.role_id is not None:
+            config.role_id = match.role_id
+    DiscordRoleObfuscation.objects.bulk_update(
+        configs,
+        ["role_id", "role_match", "role_verified_at"],
+        batch_size=500,
+    )
+    if changed:
+        bump_mapping_version()
+    return len(configs)
+
+
+def get_role_index(roleset, fingerprint: Optional[str] = None) -> RoleIndex:
+    """Return the cached index for a roleset, building and caching it on a miss.
+
+    A miss does not persist match state, so admin pages never write configs.
+    """
+    key = _index_key(fingerprint or roleset_fingerprint(roleset))
+    try:
+        index = cache.get(key)
+    except Exception:
+        logger.exception("Failed to read role index from cache")
+        index = None
+    if isinstance(index, RoleIndex):
+        return index
+    return _cache_role_index(build_role_index(roleset))
+
+
+role_config_maps = FingerprintCache(max_entries=8, ttl=ROLE_INDEX_TTL)
+metrics.register_cache("role_config_maps", role_config_maps)
+
+
+def role_configs_by_role_id(
+    roleset,
+    opt_out: Optional[bool] = None,
+) -> Dict[int, RoleMatch]:
+    """Map role id -> matched config, memoized per roleset content hash.
+
+    When ``opt_out`` is given only configs with that opt-out value are included.
+    The first config matched to a role wins.
+    """
+    fingerprint = roleset_fingerprint(roleset)
+    key = (mapping_version(), fingerprint, opt_out)
+    cached = role_config_maps.get(key)
+    if cached is not None:
+        return cached
+
+    index = get_role_index(roleset, fingerprint=fingerprint)
+    mapping: Dict[int, RoleMatch] = {}
+    for match in index.matches.values():
+        if match.role_id is None:
+            continue
+        if opt_out is not None and match.opt_out != opt_out:
+            continue
+        mapping.setdefault(match.role_id, match)
+    role_config_maps.set(key, mapping)
+    return mapping
+
+
+def opt_out_role_configs(roleset) -> Dict[int, RoleMatch]:
+    """Map role id -> opt-out config for roles that must keep their position."""
+    return role_configs_by_role_id(roleset, opt_out=True)
@@ -6,14 +6,14 @@ import logging
 # Django
 from django.contrib.auth.models import Group
 from django.db import transaction
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 # Discord Obfuscate App
+from discord_obfuscate.cache import bump_mapping_version
 from discord_obfuscate.config import default_obfuscation_values, role_color_rule_sync_enabled
 from discord_obfuscate.constants import DEFAULT_OBFUSCATE_METHOD
 from discord_obfuscate.models import DiscordRoleObfuscation
-from discord_obfuscate.tasks import sync_role_color_rules
 
 logger = logging.getLogger(__name__)
 
@@ -43,9 +43,21 @@ def schedule_role_color_sync(sender, instance: Group, created: bool, **kwargs):
             logger.debug("Obfuscation config already exists for group %s.", group.name)
 
         if role_color_rule_sync_enabled():
+            # Discord Obfuscate App
+            from discord_obfuscate.tasks import sync_role_color_rules
+
             logger.info(
                 "Scheduling role color sync after 30s for group %s.", group.name
             )
             sync_role_color_rules.apply_async(countdown=30)
 
     transaction.on_commit(_after_commit)
+
+
+@receiver(post_save, sender=DiscordRoleObfuscation)
+@receiver(post_delete, sender=DiscordRoleObfuscation)
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_name_mapping(sender, instance, **kwargs):
+    """Invalidate cached role name resolutions once the change is committed."""
+    transaction.on_commit(bump_mapping_version)
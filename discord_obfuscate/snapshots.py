@@ -0,0 +1,184 @@
+"""Persisted roleset snapshots.
+
+The sync tasks store the roleset they fetched from Discord, with their own
+changes applied, once per distinct content; later runs with the same roleset only
+refresh ``last_seen_at``. ``fetch_roleset(use_cache=True)`` serves the latest
+snapshot seen within ``DISCORD_OBFUSCATE_ROLESET_SNAPSHOT_MAX_AGE`` instead of
+calling Discord, workers load it when they start, and dry runs can plan against
+one offline.
+"""
+
+# Standard Library
+import datetime as dt
+import hashlib
+import json
+import logging
+import time
+from typing import Optional
+
+# Django
+from django.utils import timezone
+
+# Discord Obfuscate App
+from discord_obfuscate.app_settings import DISCORD_OBFUSCATE_SYNC_RUN_RETENTION_DAYS
+from discord_obfuscate.models import RolesetSnapshot
+from discord_obfuscate.obfuscation import RawRole, SimpleRolesSet
+from discord_obfuscate.role_index import get_eligible_group_ids, store_eligible_groups
+
+logger = logging.getLogger(__name__)
+
+# Seconds this process trusts its copy of the latest roleset before reading or
+# refreshing the stored row again.
+TOUCH_INTERVAL = 60.0
+
+# Latest roleset this process stored or loaded: (fingerprint, roleset, seen_at, synced).
+_latest: Optional[tuple] = None
+
+
+def normalize_roleset(roleset) -> list[list]:
+    """Compact [id, name, position, color, managed] rows sorted by role id."""
+    return sorted(
+        [
+            int(role.id),
+            role.name or "",
+            int(getattr(role, "position", 0) or 0),
+            int(getattr(role, "color", 0) or 0),
+            bool(getattr(role, "managed", False)),
+        ]
+        for role in roleset or []
+    )
+
+
+def snapshot_fingerprint(roles: list[list]) -> str:
+    payload = json.dumps(roles, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def roleset_from_rows(roles: list[list]) -> SimpleRolesSet:
+    return SimpleRolesSet(
+        [
+            RawRole(
+                id=role_id,
+                name=name,
+                position=position,
+                color=color,
+                managed=managed,
+                raw={
+                    "id": role_id,
+                    "name": name,
+                    "position": position,
+                    "color": color,
+                    "managed": managed,
+                },
+            )
+            for role_id, name, position, color, managed in roles
+        ]
+    )
+
+
+def _remember(fingerprint: str, roleset, seen_at) -> None:
+    global _latest
+    _latest = (fingerprint, roleset, seen_at, time.monotonic())
+
+
+def save_roleset_snapshot(roleset) -> bool:
+    """Store a roleset read from Discord; returns True if it was not stored before.
+
+    Unchanged rolesets cost nothing until the touch interval passes, then one
+    UPDATE. A new roleset costs an UPDATE and an INSERT. Rolesets without
+    positions, as Alliance Auth's own Role objects come, are not stored.
+    """
+    roles = normalize_roleset(roleset)
+    if not roles or not all(hasattr(role, "position") for role in roleset):
+        return False
+    fingerprint = snapshot_fingerprint(roles)
+    if (
+        _latest is not None
+        and _latest[0] == fingerprint
+        and time.monotonic() - _latest[3] < TOUCH_INTERVAL
+    ):
+        return False
+
+    now = timezone.now()
+    created = False
+    try:
+        updated = RolesetSnapshot.objects.filter(fingerprint=fingerprint).update(
+            last_seen_at=now
+        )
+        if not updated:
+            # Another process may store the same roleset at the same time.
+            RolesetSnapshot.objects.bulk_create(
+                [
+                    RolesetSnapshot(
+                        fingerprint=fingerprint,
+                        roles=roles,
+                        role_count=len(roles),
+                        last_seen_at=now,
+                    )
+                ],
+                ignore_conflicts=True,
+            )
+            created = True
+    except Exception:
+        logger.exception("Failed to store roleset snapshot")
+        return False
+    _remember(fingerprint, roleset, now)
+    return created
+
+
+def load_roleset_snapshot(max_age: Optional[float] = None) -> Optional[SimpleRolesSet]:
+    """Return the most recently seen roleset, or None if missing or older than max_age.
+
+    This process reuses its copy for up to TOUCH_INTERVAL seconds, then reads the
+    latest row again so snapshots stored by other processes are picked up.
+    """
+    cutoff = (
+        timezone.now() - dt.timedelta(seconds=max_age) if max_age is not None else None
+    )
+    if (
+        _latest is not None
+        and time.monotonic() - _latest[3] < TOUCH_INTERVAL
+        and (cutoff is None or _latest[2] >= cutoff)
+    ):
+        return _latest[1]
+    try:
+        snapshot = RolesetSnapshot.objects.first()
+    except Exception:
+        logger.exception("Failed to load roleset snapshot")
+        return None
+    if snapshot is None or (cutoff is not None and snapshot.last_seen_at < cutoff):
+        return None
+    if _latest is not None and _latest[0] == snapshot.fingerprint:
+        roleset = _latest[1]
+    else:
+        roleset = roleset_from_rows(snapshot.roles)
+    _remember(snapshot.fingerprint, roleset, snapshot.last_seen_at)
+    return roleset
+
+
+def warm_from_snapshot() -> bool:
+    """Load the latest snapshot into this process and seed the eligible group cache."""
+    roleset = load_roleset_snapshot()
+    if roleset is None:
+        return False
+    if get_eligible_group_ids() is None:
+        store_eligible_groups(roleset)
+    logger.info("Loaded roleset snapshot with %s roles", len(roleset))
+    return True
+
+
+def prune_roleset_snapshots(days: int | None = None) -> int:
+    """Delete snapshots not seen within the retention window, always keeping the latest."""
+    days = DISCORD_OBFUSCATE_SYNC_RUN_RETENTION_DAYS if days is None else days
+    if not days or days <= 0:
+        return 0
+    latest = RolesetSnapshot.objects.values_list("pk", flat=True).first()
+    cutoff = timezone.now() - dt.timedelta(days=days)
+    deleted, _ = (
+        RolesetSnapshot.objects.filter(last_seen_at__lt=cutoff)
+        .exclude(pk=latest)
+        .delete()
+    )
+    if deleted:
+        logger.info("Pruned %s roleset snapshots older than %s days", deleted, days)
+    return deleted
@@ -34,6 +34,10 @@
 
     if (group) {
       formData.append("group", group.value || "");
+      var selected = group.options ? group.options[group.selectedIndex] : null;
+      if (selected && group.value) {
+        formData.append("group_name", selected.text || "");
+      }
     }
     if (optOut && optOut.checked) {
       formData.append("opt_out", "1");
@@ -122,32 +126,73 @@
     row.style.display = visible ? "" : "none";
   }
 
-  function updatePreview() {
+  var PREVIEW_DEBOUNCE_MS = 250;
+  var previewCache = {};
+  var previewTimer = null;
+  var previewController = null;
+
+  function formStateKey(formData) {
+    var parts = [];
+    formData.forEach(function (value, key) {
+      parts.push(key + "=" + value);
+    });
+    return parts.join("&");
+  }
+
+  function requestPreview() {
     var previewField = document.getElementById("id_preview");
     if (!previewField) {
       return;
     }
     var formData = collectFormData();
-    var url = getPreviewUrl();
-    fetch(url, {
+    var key = formStateKey(formData);
+    if (Object.prototype.hasOwnProperty.call(previewCache, key)) {
+      previewField.value = previewCache[key];
+      return;
+    }
+    if (previewController) {
+      previewController.abort();
+    }
+    var controller = window.AbortController ? new AbortController() : null;
+    previewController = controller;
+    fetch(getPreviewUrl(), {
       method: "POST",
       headers: {
         "X-CSRFToken": getCsrfToken(),
       },
       body: formData,
       credentials: "same-origin",
+      signal: controller ? controller.signal : undefined,
     })
       .then(function (response) {
         return response.json();
       })
       .then(function (data) {
-        previewField.value = data.preview || "";
+        var preview = data.preview || "";
+        previewCache[key] = preview;
+        if (previewController === controller) {
+          previewField.value = preview;
+          previewController = null;
+        }
       })
-      .catch(function () {
+      .catch(function (error) {
+        if (error && error.name === "AbortError") {
+          return;
+        }
         previewField.value = "";
       });
   }
 
+  function updatePreview() {
+    if (previewTimer) {
+      window.clearTimeout(previewTimer);
+    }
+    previewTimer = window.setTimeout(function () {
+      previewTimer = null;
+      requestPreview();
+    }, PREVIEW_DEBOUNCE_MS);
+  }
+
   function findForm() {
     var groupField = document.getElementById("id_group");
     if (groupField && groupField.form) {
@@ -179,7 +224,7 @@
     var randomKey = document.getElementById("id_random_key");
     var rotateName = document.getElementById("id_random_key_rotate_name");
     toggleRandomKeyFields(useRandomKey, randomKey, rotateName);
-    updatePreview();
+    requestPreview();
   }
 
   if (document.readyState === "loading") {
@@ -0,0 +1,203 @@
+"""Run the sync, color rule and rotation pipelines in-process.
+
+Used by the ``obfuscate_sync`` management command for large one-off syncs, for
+example the initial migration of every group during a maintenance window.
+Each phase is recorded as a Sync Run like the Celery tasks.
+"""
+
+# Standard Library
+import time
+from dataclasses import dataclass, field
+
+# Django
+from django.db import transaction
+
+# Discord Obfuscate App
+from discord_obfuscate import metrics
+from discord_obfuscate.cache import bump_mapping_version
+from discord_obfuscate.config import role_ordering_enabled
+from discord_obfuscate.models import DiscordRoleObfuscation
+from discord_obfuscate.obfuscation import fetch_roleset, name_cache, roleset_override
+from discord_obfuscate.role_index import role_config_maps
+from discord_obfuscate.tasks import (
+    needs_sync,
+    role_update_options,
+    rotate_and_reorder,
+    sync_configs,
+    sync_role_color_rules,
+)
+
+PHASES = ("sync", "colors", "rotate")
+DEFAULT_PHASES = ("sync", "colors")
+DEFAULT_BATCH_SIZE = 100
+
+
+@dataclass
+class PhaseResult:
+    """Timings and totals for one pipeline phase.
+
+    ``count`` is the phase's return value, as the matching task reports it.
+    """
+
+    phase: str
+    total: int = 0
+    processed: int = 0
+    count: int = 0
+    duration: float = 0.0
+    renames: int = 0
+    recolors: int = 0
+    reorders: int = 0
+    errors: int = 0
+    started: float = field(default_factory=time.perf_counter, repr=False)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def throughput(self) -> float:
+        """Processed configs per second."""
+        elapsed = self.duration or self.elapsed
+        return self.processed / elapsed if elapsed else 0.0
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _collect_stats(result: PhaseResult) -> None:
+    run = metrics.current_run()
+    for name in ("renames", "recolors", "reorders", "errors"):
+        setattr(result, name, int(run.get(name)))
+
+
+@metrics.instrumented
+def obfuscate_sync_names(
+    result: PhaseResult, batch_size: int, only_changed: bool, progress=None
+) -> int:
+    """Sync role names in batches against one roleset fetch."""
+    configs = list(
+        DiscordRoleObfuscation.objects.select_related("group").order_by("pk")
+    )
+    if not configs:
+        return 0
+    roleset = fetch_roleset(use_cache=False)
+    if only_changed:
+        configs = [config for config in configs if needs_sync(config, roleset)]
+    result.total = len(configs)
+    if not configs:
+        return 0
+
+    def _progress(done, total):
+        result.processed = done
+        if progress:
+            progress(result)
+
+    count = sync_configs(configs, roleset, batch_size=batch_size, progress=_progress)
+    _collect_stats(result)
+    return count
+
+
+@metrics.instrumented
+def obfuscate_sync_colors(result: PhaseResult, progress=None) -> int:
+    """Assign colors from the color rules."""
+    created = sync_role_color_rules()
+    result.total = result.processed = int(metrics.current_run().get("configs_examined"))
+    if progress:
+        progress(result)
+    _collect_stats(result)
+    return created
+
+
+@metrics.instrumented
+def obfuscate_sync_rotation(result: PhaseResult, batch_size: int, progress=None) -> int:
+    """Rotate random keys in batches, then apply the role ordering."""
+    configs = list(
+        DiscordRoleObfuscation.objects.select_related("group").filter(
+            use_random_key=True
+        )
+    )
+    result.total = sum(1 for config in configs if config.random_key_rotate_name)
+    if not configs and not role_ordering_enabled():
+        return 0
+
+    def _progress(done, total):
+        result.processed = done
+        if progress:
+            progress(result)
+
+    updated = rotate_and_reorder(configs, batch_size=batch_size, progress=_progress)
+    _collect_stats(result)
+    return updated
+
+
+def _run_phase(phase: str, options: dict, progress) -> PhaseResult:
+    result = PhaseResult(phase)
+    with (
+        role_update_options(
+            concurrency=options["concurrency"], dry_run=options["dry_run"]
+        ) as captured,
+        roleset_override(options["roleset"]),
+    ):
+        if phase == "sync":
+            result.count = obfuscate_sync_names(
+                result, options["batch_size"], options["only_changed"], progress
+            )
+        elif phase == "colors":
+            result.count = obfuscate_sync_colors(result, progress)
+        else:
+            result.count = obfuscate_sync_rotation(
+                result, options["batch_size"], progress
+            )
+    if captured is not None:
+        result.renames = sum(
+            1 for update in captured.updates if update.name is not None
+        )
+        result.recolors = sum(
+            1 for update in captured.updates if update.color is not None
+        )
+        result.reorders = sum(len(payload) for payload in captured.reorders)
+    result.duration = result.elapsed
+    return result
+
+
+def run_sync(
+    phases=DEFAULT_PHASES,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    concurrency: int | None = None,
+    dry_run: bool = False,
+    only_changed: bool = False,
+    progress=None,
+    roleset=None,
+) -> list[PhaseResult]:
+    """Run the selected phases in order and return one PhaseResult per phase.
+
+    A dry run reads roles from Discord but captures every write and rolls back
+    all database changes, including the Sync Run records. A ``roleset``, such as a
+    stored snapshot, replaces every role fetch so a dry run can work offline.
+    """
+    options = {
+        "batch_size": batch_size,
+        "concurrency": concurrency,
+        "dry_run": dry_run,
+        "only_changed": only_changed,
+        "roleset": roleset,
+    }
+    selected = [phase for phase in PHASES if phase in phases]
+    if not dry_run:
+        return [_run_phase(phase, options, progress) for phase in selected]
+
+    results = []
+    try:
+        with transaction.atomic():
+            for phase in selected:
+                results.append(_run_phase(phase, options, progress))
+            raise _Rollback
+    except _Rollback:
+        pass
+    finally:
+        # Cached state may refer to changes that were rolled back.
+        name_cache.clear()
+        role_config_maps.clear()
+        bump_mapping_version()
+    return results
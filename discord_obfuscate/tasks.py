@@ -1,20 +1,38 @@
 """App Tasks"""
 
 # Standard Library
+import contextvars
+import copy
 import logging
 import random
+import threading
 import time
 from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
 from fnmatch import fnmatchcase
 
 # Third Party
 from celery import shared_task
+from celery.signals import worker_process_init
 
+# Django
 from django.contrib.auth.models import Group
+from django.utils import timezone
 
 # Alliance Auth
 # Discord Obfuscate App
-from discord_obfuscate.constants import DEFAULT_OBFUSCATE_METHOD
+from discord_obfuscate.app_settings import (
+    DISCORD_OBFUSCATE_ROLE_UPDATE_CONCURRENCY,
+    DISCORD_OBFUSCATE_ROLE_UPDATE_RATE,
+)
+from discord_obfuscate.cache import bump_mapping_version
+from discord_obfuscate.constants import (
+    DEFAULT_OBFUSCATE_METHOD,
+    ROLE_MATCH_DESIRED,
+    ROLE_MATCH_NONE,
+)
 from discord_obfuscate.config import (
     default_obfuscation_values,
     periodic_sync_enabled,
@@ -24,7 +42,17 @@ from discord_obfuscate.config import (
     role_order_mode,
     role_color_rule_sync_enabled,
 )
+from discord_obfuscate import metrics
+from discord_obfuscate.discord_async import (
+    RoleUpdate,
+    async_http_enabled,
+    patch_roles,
+)
+from discord_obfuscate.history import prune_sync_runs
 from discord_obfuscate.obfuscation import (
+    SimpleRolesSet,
+    bot_client,
+    create_bot_client,
     fetch_roleset,
     generate_random_key,
     role_name_for_group,
@@ -42,9 +70,30 @@ from discord_obfuscate.models import (
     DiscordRoleObfuscation,
     DiscordRoleOrder,
 )
+from discord_obfuscate.rate_limit import RateLimiter
+from discord_obfuscate.role_index import (
+    opt_out_role_configs,
+    refresh_role_index,
+    roleset_fingerprint,
+)
+from discord_obfuscate.snapshots import (
+    prune_roleset_snapshots,
+    save_roleset_snapshot,
+    warm_from_snapshot,
+)
 
 logger = logging.getLogger(__name__)
 
+ROTATION_BATCH_SIZE = 25
+DISCOVER_BATCH_SIZE = 500
+
+_role_update_concurrency: contextvars.ContextVar = contextvars.ContextVar(
+    "discord_obfuscate_role_update_concurrency", default=None
+)
+_captured_writes: contextvars.ContextVar = contextvars.ContextVar(
+    "discord_obfuscate_captured_writes", default=None
+)
+
 # Create your tasks here
 
 
@@ -88,17 +137,21 @@ def _find_role_by_id(roleset, role_id):
     return None
 
 
-def _update_role(role_id: int, name: str | None = None, color: int | None = None) -> bool:
-    """Update a Discord role via bot client."""
+def _update_role(
+    role_id: int,
+    name: str | None = None,
+    color: int | None = None,
+    limiter: RateLimiter | None = None,
+    client=None,
+) -> bool:
+    """Update a Discord role via ``client`` or the default bot client."""
     try:
-        from allianceauth.services.modules.discord.core import (
-            default_bot_client,
-            DISCORD_GUILD_ID,
-        )
         from allianceauth.services.modules.discord.discord_client.exceptions import (
             DiscordRateLimitExhausted,
         )
 
+        default_bot_client, DISCORD_GUILD_ID = bot_client()
+        client = client or default_bot_client
         route = f"guilds/{DISCORD_GUILD_ID}/roles/{role_id}"
         data = {}
         if name is not None:
@@ -108,13 +161,14 @@ def _update_role(role_id: int, name: str | None = None, color: int | None = None
         if not data:
             return True
         _api_request_with_retry(
-            default_bot_client,
+            client,
             DiscordRateLimitExhausted,
             method="patch",
             route=route,
             data=data,
+            limiter=limiter,
         )
-        default_bot_client._invalidate_guild_roles_cache(DISCORD_GUILD_ID)
+        client._invalidate_guild_roles_cache(DISCORD_GUILD_ID)
         logger.info("Updated Discord role %s", role_id)
         return True
     except Exception:
@@ -122,23 +176,149 @@ def _update_role(role_id: int, name: str | None = None, color: int | None = None
         return False
 
 
-def _rename_role(role_id: int, new_name: str, color: int | None = None) -> bool:
-    """Rename a Discord role via bot client."""
-    return _update_role(role_id, name=new_name, color=color)
+def _invalidate_roles_cache() -> None:
+    try:
+        default_bot_client, DISCORD_GUILD_ID = bot_client()
+        default_bot_client._invalidate_guild_roles_cache(DISCORD_GUILD_ID)
+    except Exception:
+        logger.exception("Failed to invalidate guild roles cache")
+
+
+@dataclass
+class CapturedWrites:
+    """Role updates and reorders that a dry run would have sent to Discord."""
+
+    updates: list[RoleUpdate] = field(default_factory=list)
+    reorders: list[list[dict]] = field(default_factory=list)
+
+
+@contextmanager
+def role_update_options(concurrency: int | None = None, dry_run: bool = False):
+    """Override the role update concurrency and optionally capture Discord writes.
+
+    Yields a CapturedWrites for a dry run, otherwise None. Role reads still go to
+    Discord; callers are responsible for rolling back database changes.
+    """
+    captured = CapturedWrites() if dry_run else None
+    concurrency_token = _role_update_concurrency.set(concurrency)
+    captured_token = _captured_writes.set(captured)
+    try:
+        yield captured
+    finally:
+        _captured_writes.reset(captured_token)
+        _role_update_concurrency.reset(concurrency_token)
+
+
+def _apply_role_updates(updates: list[RoleUpdate]) -> list[bool]:
+    """Send role PATCHes; pipelined over the async HTTP layer when enabled."""
+    if not updates:
+        return []
+    captured = _captured_writes.get()
+    if captured is not None:
+        captured.updates.extend(updates)
+        return [True] * len(updates)
+    concurrency = max(
+        int(
+            _role_update_concurrency.get()
+            or DISCORD_OBFUSCATE_ROLE_UPDATE_CONCURRENCY
+            or 1
+        ),
+        1,
+    )
+    if async_http_enabled():
+        try:
+            results = patch_roles(updates, max_concurrency=concurrency)
+        except Exception:
+            logger.exception("Async role updates failed")
+            metrics.inc("discord_obfuscate_fallbacks_total", kind="async_http_error")
+            results = [False] * len(updates)
+        _invalidate_roles_cache()
+    else:
+        if concurrency == 1 or len(updates) == 1:
+            results = [
+                _update_role(update.role_id, name=update.name, color=update.color)
+                for update in updates
+            ]
+        else:
+            results = _apply_role_updates_threaded(updates, concurrency)
+    for update, succeeded in zip(updates, results):
+        metrics.inc(
+            "discord_obfuscate_role_updates_total",
+            kind="name" if update.name is not None else "color",
+            result="ok" if succeeded else "failed",
+        )
+        if update.name is not None:
+            metrics.run_stat("renames")
+        if update.color is not None:
+            metrics.run_stat("recolors")
+        if not succeeded:
+            metrics.run_stat("errors")
+    return results
+
+
+def _apply_role_updates_threaded(
+    updates: list[RoleUpdate], concurrency: int
+) -> list[bool]:
+    """Send updates from a bounded thread pool sharing one rate limiter.
+
+    Updates for the same role run sequentially in one worker so they keep their
+    order. Workers only talk to Discord; callers do all DB writes afterwards.
+
+    Alliance Auth's DiscordClient keeps its rate-limit and roles cache state in
+    redis, which is how it coordinates concurrent Celery workers, but nothing
+    documents a single instance as thread-safe. Each worker thread therefore
+    creates its own client instead of sharing ``default_bot_client``.
+    """
+    limiter = RateLimiter(DISCORD_OBFUSCATE_ROLE_UPDATE_RATE)
+    by_role: dict[int, list[int]] = {}
+    for position, update in enumerate(updates):
+        by_role.setdefault(update.role_id, []).append(position)
+    local = threading.local()
+
+    def _client():
+        if not hasattr(local, "client"):
+            local.client = create_bot_client()
+        return local.client
+
+    def _run(positions: list[int]) -> list[bool]:
+        client = _client()
+        return [
+            _update_role(
+                updates[i].role_id,
+                name=updates[i].name,
+                color=updates[i].color,
+                limiter=limiter,
+                client=client,
+            )
+            for i in positions
+        ]
+
+    results = [False] * len(updates)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        # Each worker runs in a copy of this context so it reports to the same run.
+        futures = {
+            executor.submit(contextvars.copy_context().run, _run, positions): positions
+            for positions in by_role.values()
+        }
+        for future in as_completed(futures):
+            for position, outcome in zip(futures[future], future.result()):
+                results[position] = outcome
+    return results
 
 
 def _reorder_roles_payload(payload: list[dict]) -> bool:
     if not payload:
         return True
+    captured = _captured_writes.get()
+    if captured is not None:
+        captured.reorders.append(payload)
+        return True
     try:
-        from allianceauth.services.modules.discord.core import (
-            default_bot_client,
-            DISCORD_GUILD_ID,
-        )
         from allianceauth.services.modules.discord.discord_client.exceptions import (
             DiscordRateLimitExhausted,
         )
 
+        default_bot_client, DISCORD_GUILD_ID = bot_client()
         route = f"guilds/{DISCORD_GUILD_ID}/roles"
         _api_request_with_retry(
             default_bot_client,
@@ -149,9 +329,11 @@ def _reorder_roles_payload(payload: list[dict]) -> bool:
         )
         default_bot_client._invalidate_guild_roles_cache(DISCORD_GUILD_ID)
         logger.info("Reordered %s roles via manual ordering", len(payload))
+        metrics.run_stat("reorders", len(payload))
         return True
     except Exception:
         logger.exception("Failed to reorder roles via manual ordering")
+        metrics.run_stat("errors")
         return False
 
 
@@ -249,29 +431,21 @@ def _build_manual_order_payload(
 
 
 def _opt_out_role_ids(roleset) -> set[int]:
-    configs = list(
-        DiscordRoleObfuscation.objects.select_related("group").filter(opt_out=True)
-    )
-    if not configs:
-        return set()
-    roles_by_id = {role.id: role for role in roleset}
-    roles_by_name = {role.name: role for role in roleset}
-    role_ids: set[int] = set()
+    return set(opt_out_role_configs(roleset))
 
-    for config in configs:
-        role_id = None
-        if config.role_id and config.role_id in roles_by_id:
-            role_id = config.role_id
-        else:
-            desired = role_name_for_group(config.group, config)
-            for name in (desired, config.last_obfuscated_name, config.group.name):
-                if name and name in roles_by_name:
-                    role_id = roles_by_name[name].id
-                    break
-        if role_id:
-            role_ids.add(role_id)
 
-    return role_ids
+def _note_roleset(roleset) -> None:
+    if metrics.current_run() is not None:
+        metrics.run_info("roleset_hash", roleset_fingerprint(roleset))
+
+
+def _store_roleset(roleset) -> None:
+    """Store the roleset a task ends with as the snapshot fetch_roleset serves.
+
+    Dry runs change nothing in Discord, so they store nothing either.
+    """
+    if _captured_writes.get() is None:
+        save_roleset_snapshot(roleset)
 
 
 def _api_request_with_retry(
@@ -281,22 +455,50 @@ def _api_request_with_retry(
     route: str,
     data: dict | list,
     max_attempts: int = 3,
+    limiter: RateLimiter | None = None,
 ) -> None:
+    route_name = metrics.normalize_route(route)
     for attempt in range(1, max_attempts + 1):
         try:
+            if limiter:
+                limiter.wait()
             client._api_request(method=method, route=route, data=data)
+            metrics.inc(
+                "discord_obfuscate_discord_requests_total",
+                method=method.upper(),
+                route=route_name,
+                result="ok",
+            )
             return
         except rate_limit_exc as exc:
+            metrics.inc(
+                "discord_obfuscate_discord_requests_total",
+                method=method.upper(),
+                route=route_name,
+                result="rate_limited",
+            )
             if attempt >= max_attempts:
                 raise
             delay = _rate_limit_delay(exc)
+            metrics.inc("discord_obfuscate_rate_limit_wait_seconds_total", delay)
             logger.warning(
                 "Rate limit hit; retrying in %.2fs (attempt %s/%s)",
                 delay,
                 attempt,
                 max_attempts,
             )
-            time.sleep(delay)
+            if limiter:
+                limiter.block_for(delay)
+            else:
+                time.sleep(delay)
+        except Exception:
+            metrics.inc(
+                "discord_obfuscate_discord_requests_total",
+                method=method.upper(),
+                route=route_name,
+                result="error",
+            )
+            raise
 
 
 def _rate_limit_delay(exc) -> float:
@@ -318,6 +520,7 @@ def _rate_limit_delay(exc) -> float:
 
 
 @shared_task
+@metrics.instrumented
 def sync_group_role(group_id: int) -> bool:
     """Sync role name for a single group."""
     try:
@@ -332,90 +535,281 @@ def sync_group_role(group_id: int) -> bool:
     return _sync_config(config)
 
 
-def _sync_config(config: DiscordRoleObfuscation, roleset=None) -> bool:
-    if config.use_random_key and not config.random_key:
-        config.random_key = generate_random_key(16)
-        config.save(update_fields=["random_key", "updated_at"])
-    desired_name = role_name_for_group(config.group, config)
-    logger.debug("Sync role for group %s -> %s", config.group.name, desired_name)
-    color_value = None
-    if config and config.role_color:
-        value = config.role_color.strip()
-        if value.startswith("#"):
-            value = value[1:]
-        if len(value) == 6:
-            try:
-                color_value = int(value, 16)
-            except ValueError:
-                color_value = None
+def _role_color_value(config: DiscordRoleObfuscation) -> int | None:
+    if not config or not config.role_color:
+        return None
+    value = config.role_color.strip()
+    if value.startswith("#"):
+        value = value[1:]
+    if len(value) != 6:
+        return None
+    try:
+        return int(value, 16)
+    except ValueError:
+        return None
+
+
+def _locate_role(config: DiscordRoleObfuscation, roleset, *names):
+    """Find the role currently backing a config, falling back through known names."""
+    role = None
+    if config.role_id:
+        role = _find_role_by_id(roleset, config.role_id)
+    if not role and config.last_obfuscated_name:
+        role = roleset.role_by_name(config.last_obfuscated_name)
+    for name in names:
+        if role:
+            break
+        if name:
+            role = roleset.role_by_name(name)
+    if not role:
+        role = roleset.role_by_name(config.group.name)
+    return role
+
+
+MATCH_FIELDS = [
+    "role_id",
+    "last_obfuscated_name",
+    "role_match",
+    "role_verified_at",
+    "updated_at",
+]
 
-    if roleset is None:
-        roleset = fetch_roleset(use_cache=True)
+
+@dataclass
+class _SyncPlan:
+    """Planned Discord update for one config, applied later in a batch."""
+
+    config: DiscordRoleObfuscation
+    desired_name: str
+    role_id: int | None = None
+    update: RoleUpdate | None = None
+    name_matches: bool = False
+    offline: bool = False
+
+
+def _plan_sync(
+    config: DiscordRoleObfuscation,
+    roleset,
+    desired_name: str | None = None,
+    fallback_names: tuple = (),
+) -> _SyncPlan:
+    if desired_name is None:
+        if config.use_random_key and not config.random_key:
+            config.random_key = generate_random_key(16)
+            config.save(update_fields=["random_key", "updated_at"])
+        desired_name = role_name_for_group(config.group, config)
+    logger.debug("Sync role for group %s -> %s", config.group.name, desired_name)
+    color_value = _role_color_value(config)
 
     if not roleset or not len(roleset):
-        if config.role_id and _rename_role(config.role_id, desired_name, color=color_value):
-            config.last_obfuscated_name = desired_name
-            config.save(update_fields=["last_obfuscated_name", "updated_at"])
-            return True
-        logger.info(
-            "Skipping sync for group %s because roles could not be loaded",
-            config.group.name,
+        if not config.role_id:
+            logger.info(
+                "Skipping sync for group %s because roles could not be loaded",
+                config.group.name,
+            )
+            return _SyncPlan(config, desired_name, offline=True)
+        return _SyncPlan(
+            config,
+            desired_name,
+            role_id=config.role_id,
+            update=RoleUpdate(config.role_id, name=desired_name, color=color_value),
+            offline=True,
         )
-        return False
 
-    desired_role = roleset.role_by_name(desired_name)
-    if desired_role:
-        config.role_id = desired_role.id
-        config.last_obfuscated_name = desired_name
-        config.save(update_fields=["role_id", "last_obfuscated_name", "updated_at"])
+    role = roleset.role_by_name(desired_name)
+    if role:
         logger.info("Role already matches desired name for group %s", config.group.name)
-        if color_value is None:
-            return True
-        return _rename_role(desired_role.id, desired_name, color=color_value)
+    else:
+        role = _locate_role(config, roleset, *fallback_names)
+        if not role:
+            logger.info("No matching role found for group %s", config.group.name)
+            return _SyncPlan(config, desired_name)
+        if role.name == desired_name:
+            logger.info("Role name already set for group %s", config.group.name)
+
+    if role.name == desired_name:
+        update = None
+        if color_value is not None:
+            update = RoleUpdate(role.id, name=desired_name, color=color_value)
+        return _SyncPlan(config, desired_name, role.id, update, name_matches=True)
+    return _SyncPlan(
+        config,
+        desired_name,
+        role.id,
+        RoleUpdate(role.id, name=desired_name, color=color_value),
+    )
 
-    role_to_rename = None
-    if config.role_id:
-        role_to_rename = _find_role_by_id(roleset, config.role_id)
 
-    if not role_to_rename and config.last_obfuscated_name:
-        role_to_rename = roleset.role_by_name(config.last_obfuscated_name)
+def _resolve_plan(plan: _SyncPlan, succeeded: bool) -> tuple[bool, list[str]]:
+    """Apply a plan's outcome to its config; returns (success, fields to save)."""
+    config = plan.config
+    now = timezone.now()
+    if plan.offline:
+        if plan.update and succeeded:
+            config.last_obfuscated_name = plan.desired_name
+            config.updated_at = now
+            return True, ["last_obfuscated_name", "updated_at"]
+        return False, []
+
+    if plan.role_id is None:
+        config.role_match = ROLE_MATCH_NONE
+        config.role_verified_at = now
+        config.updated_at = now
+        return False, ["role_match", "role_verified_at", "updated_at"]
+
+    if not (plan.name_matches or succeeded):
+        return False, []
+    config.role_id = plan.role_id
+    config.last_obfuscated_name = plan.desired_name
+    config.role_match = ROLE_MATCH_DESIRED
+    config.role_verified_at = now
+    config.updated_at = now
+    return succeeded, list(MATCH_FIELDS)
 
-    if not role_to_rename:
-        role_to_rename = roleset.role_by_name(config.group.name)
 
-    if not role_to_rename:
-        logger.info("No matching role found for group %s", config.group.name)
-        return False
+def _sync_config(config: DiscordRoleObfuscation, roleset=None) -> bool:
+    if roleset is None:
+        roleset = fetch_roleset(use_cache=True)
+    plan = _plan_sync(config, roleset)
+    succeeded = True
+    if plan.update:
+        succeeded = _apply_role_updates([plan.update])[0]
+    success, fields = _resolve_plan(plan, succeeded)
+    if fields:
+        config.save(update_fields=fields)
+    return success
+
+
+def _note_changes(changes: dict | None, updates: list[RoleUpdate], outcomes) -> None:
+    """Record successful updates in ``changes`` as role id -> {field: new value}."""
+    if changes is None:
+        return
+    for update, succeeded in zip(updates, outcomes):
+        if not succeeded:
+            continue
+        fields = changes.setdefault(update.role_id, {})
+        if update.name is not None:
+            fields["name"] = update.name
+        if update.color is not None:
+            fields["color"] = update.color
+
+
+def _changed_roleset(roleset, changes: dict):
+    """The roleset as Discord holds it once the recorded ``changes`` were applied."""
+    if not changes:
+        return roleset
+    roles = []
+    for role in roleset:
+        fields = {
+            name: value
+            for name, value in changes.get(role.id, {}).items()
+            if hasattr(role, name)
+        }
+        roles.append(replace(role, **fields) if fields else role)
+    return SimpleRolesSet(roles)
+
+
+def _sync_configs(
+    configs: list[DiscordRoleObfuscation], roleset, changes: dict | None = None
+) -> int:
+    """Plan every config, send the PATCHes as one batch, then save in bulk.
+
+    Successful updates are recorded in ``changes`` when given; see _note_changes.
+    """
+    plans = [_plan_sync(config, roleset) for config in configs]
+    pending = [plan for plan in plans if plan.update]
+    metrics.run_stat("configs_examined", len(plans))
+    metrics.run_stat("noops", len(plans) - len(pending))
+    outcomes = _apply_role_updates([plan.update for plan in pending])
+    results = {id(plan): outcome for plan, outcome in zip(pending, outcomes)}
+    _note_changes(changes, [plan.update for plan in pending], outcomes)
+
+    count = 0
+    to_save = []
+    fields: set[str] = set()
+    for plan in plans:
+        success, changed = _resolve_plan(plan, results.get(id(plan), True))
+        if changed:
+            to_save.append(plan.config)
+            fields.update(changed)
+        if success:
+            count += 1
+
+    if to_save:
+        DiscordRoleObfuscation.objects.bulk_update(
+            to_save, sorted(fields), batch_size=500
+        )
+        bump_mapping_version()
+    return count
 
-    if role_to_rename.name == desired_name:
-        config.role_id = role_to_rename.id
-        config.last_obfuscated_name = desired_name
-        config.save(update_fields=["role_id", "last_obfuscated_name", "updated_at"])
-        logger.info("Role name already set for group %s", config.group.name)
-        if color_value is None:
-            return True
-        return _rename_role(role_to_rename.id, desired_name, color=color_value)
 
-    if _rename_role(role_to_rename.id, desired_name, color=color_value):
-        config.role_id = role_to_rename.id
-        config.last_obfuscated_name = desired_name
-        config.save(update_fields=["role_id", "last_obfuscated_name", "updated_at"])
+def needs_sync(config: DiscordRoleObfuscation, roleset) -> bool:
+    """Whether a sync would change the config's role or its stored match state."""
+    if config.role_id is None or config.role_match != ROLE_MATCH_DESIRED:
         return True
+    if config.role_verified_at is None:
+        return True
+    if config.use_random_key and not config.random_key:
+        return True
+    role = roleset.role_by_id(config.role_id)
+    if role is None or role.name != role_name_for_group(config.group, config):
+        return True
+    color_value = _role_color_value(config)
+    return color_value is not None and (getattr(role, "color", 0) or 0) != color_value
 
-    return False
+
+def sync_configs(
+    configs: list[DiscordRoleObfuscation],
+    roleset,
+    batch_size: int | None = None,
+    progress=None,
+) -> int:
+    """Sync configs against one fetched roleset in batches, then refresh the role index.
+
+    The roleset with the renames applied is stored as the latest snapshot.
+    """
+    _note_roleset(roleset)
+    batch_size = batch_size or len(configs) or 1
+    changes = {}
+    count = 0
+    for start in range(0, len(configs), batch_size):
+        batch = configs[start : start + batch_size]
+        count += _sync_configs(batch, roleset, changes)
+        if progress:
+            progress(start + len(batch), len(configs))
+    roleset = _changed_roleset(roleset, changes)
+    refresh_role_index(roleset)
+    _store_roleset(roleset)
+    return count
 
 
 @shared_task
+@metrics.instrumented
+def sync_group_roles(group_ids: list[int]) -> int:
+    """Sync role names for a batch of groups against one roleset fetch."""
+    configs = list(
+        DiscordRoleObfuscation.objects.select_related("group").filter(
+            group_id__in=group_ids
+        )
+    )
+    if not configs:
+        return 0
+    roleset = fetch_roleset(use_cache=False)
+    _note_roleset(roleset)
+    changes = {}
+    count = _sync_configs(configs, roleset, changes)
+    _store_roleset(_changed_roleset(roleset, changes))
+    return count
+
+
+@shared_task
+@metrics.instrumented
 def sync_all_roles() -> int:
     """Sync role names for all groups with configs."""
     count = 0
     configs = list(DiscordRoleObfuscation.objects.select_related("group"))
     if configs:
-        roleset = fetch_roleset(use_cache=False)
-        for config in configs:
-            if _sync_config(config, roleset=roleset):
-                count += 1
-        return count
+        return sync_configs(configs, fetch_roleset(use_cache=False))
 
     group_ids = list(Group.objects.values_list("id", flat=True))
     for group_id in group_ids:
@@ -424,6 +818,77 @@ def sync_all_roles() -> int:
     return count
 
 
+def undiscovered_group_ids(group_ids) -> list[int]:
+    """Return ids from group_ids that do not have an obfuscation config yet."""
+    return list(
+        Group.objects.filter(pk__in=group_ids, discord_obfuscation__isnull=True)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+
+
+def create_discovered_configs(group_ids: list[int], progress=None) -> int:
+    """Create default configs for groups in chunks with bulk_create."""
+    defaults = default_obfuscation_values()
+    defaults.setdefault("obfuscation_type", DEFAULT_OBFUSCATE_METHOD)
+    total = len(group_ids)
+    created = 0
+    for start in range(0, total, DISCOVER_BATCH_SIZE):
+        chunk = group_ids[start : start + DISCOVER_BATCH_SIZE]
+        existing = set(
+            DiscordRoleObfuscation.objects.filter(group_id__in=chunk).values_list(
+                "group_id", flat=True
+            )
+        )
+        new_ids = [group_id for group_id in chunk if group_id not in existing]
+        DiscordRoleObfuscation.objects.bulk_create(
+            [
+                DiscordRoleObfuscation(group_id=group_id, **defaults)
+                for group_id in new_ids
+            ],
+            ignore_conflicts=True,
+        )
+        created += len(new_ids)
+        if progress:
+            progress(start + len(chunk), total)
+    if created:
+        bump_mapping_version()
+    return created
+
+
+@shared_task
+@metrics.instrumented
+def discover_groups_from_roles(group_ids: list[int] | None = None) -> int:
+    """Create configs for groups that match Discord roles but have none."""
+    if group_ids is None:
+        roleset = fetch_roleset(use_cache=True)
+        role_names = {role.name for role in roleset}
+        group_ids = Group.objects.filter(name__in=role_names).values_list(
+            "pk", flat=True
+        )
+    missing = undiscovered_group_ids(group_ids)
+
+    def _log_progress(done, total):
+        logger.info("Discovered %s/%s groups from Discord roles", done, total)
+
+    return create_discovered_configs(missing, progress=_log_progress)
+
+
+@shared_task
+@metrics.instrumented
+def refresh_role_status() -> int:
+    """Refresh the cached role index and role status map from Discord."""
+    roleset = fetch_roleset(use_cache=False)
+    if not roleset or not len(roleset):
+        logger.info("Skipping role status refresh because roles could not be loaded")
+        return 0
+    _note_roleset(roleset)
+    index = refresh_role_index(roleset)
+    _store_roleset(roleset)
+    metrics.run_stat("configs_examined", len(index.matches))
+    return len(index.matches)
+
+
 def _role_name_matches(rule: DiscordRoleColorRule, role_name: str) -> bool:
     pattern = rule.pattern or ""
     if not pattern:
@@ -434,6 +899,7 @@ def _role_name_matches(rule: DiscordRoleColorRule, role_name: str) -> bool:
 
 
 @shared_task
+@metrics.instrumented
 def sync_role_color_rules() -> int:
     """Assign colors to roles based on matching rules."""
     rules = list(
@@ -453,7 +919,10 @@ def sync_role_color_rules() -> int:
     }
 
     roleset = fetch_roleset(use_cache=False)
+    _note_roleset(roleset)
     roles_by_id = {role.id: role for role in roleset}
+    refresh_role_index(roleset)
+    metrics.run_stat("configs_examined", len(configs_with_roles))
 
     existing_assignments = list(DiscordRoleColorAssignment.objects.all())
     stale_assignments = [
@@ -486,7 +955,8 @@ def sync_role_color_rules() -> int:
 
     palette = build_palette()
     available = available_colors(palette, used_colors)
-    created = 0
+    planned = []
+    exhausted = False
 
     for rule in rules:
         for role in roleset:
@@ -502,19 +972,36 @@ def sync_role_color_rules() -> int:
             color_value = select_random_color(available)
             if color_value is None:
                 logger.warning("No available colors left for rule %s", rule.name)
-                return created
-            if _update_role(role.id, color=color_value):
-                DiscordRoleColorAssignment.objects.create(
-                    rule=rule,
-                    obfuscation=obfuscation_by_role_id.get(role.id),
-                    role_id=role.id,
-                    role_name=role.name,
-                    color=to_hex(color_value),
-                )
-                assigned_role_ids.add(role.id)
-                used_colors.add(color_value)
-                available.remove(color_value)
-                created += 1
+                exhausted = True
+                break
+            planned.append((rule, role, color_value))
+            assigned_role_ids.add(role.id)
+            used_colors.add(color_value)
+            available.remove(color_value)
+        if exhausted:
+            break
+
+    updates = [RoleUpdate(role.id, color=color_value) for _, role, color_value in planned]
+    outcomes = _apply_role_updates(updates)
+    changes = {}
+    _note_changes(changes, updates, outcomes)
+    _store_roleset(_changed_roleset(roleset, changes))
+    assignments = [
+        DiscordRoleColorAssignment(
+            rule=rule,
+            obfuscation=obfuscation_by_role_id.get(role.id),
+            role_id=role.id,
+            role_name=role.name,
+            color=to_hex(color_value),
+        )
+        for (rule, role, color_value), succeeded in zip(planned, outcomes)
+        if succeeded
+    ]
+    if assignments:
+        DiscordRoleColorAssignment.objects.bulk_create(assignments)
+    created = len(assignments)
+    if exhausted:
+        return created
 
     for assignment in existing_assignments:
         role = roles_by_id.get(assignment.role_id)
@@ -526,7 +1013,107 @@ def sync_role_color_rules() -> int:
     return created
 
 
+def _stage_pending_keys(configs: list[DiscordRoleObfuscation]) -> None:
+    """Generate new random keys into the pending column without touching live keys."""
+    if not configs:
+        return
+    now = timezone.now()
+    for config in configs:
+        config.pending_random_key = generate_random_key(16)
+        config.updated_at = now
+    DiscordRoleObfuscation.objects.bulk_update(
+        configs,
+        ["pending_random_key", "updated_at"],
+        batch_size=ROTATION_BATCH_SIZE,
+    )
+
+
+def _pending_role_name(config: DiscordRoleObfuscation) -> str:
+    staged = copy.copy(config)
+    staged.random_key = config.pending_random_key
+    return role_name_for_group(config.group, staged)
+
+
+def _rotate_pending_keys(
+    configs: list[DiscordRoleObfuscation],
+    roleset,
+    batch_size: int | None = None,
+    progress=None,
+    changes: dict | None = None,
+) -> int:
+    """Rename staged roles in batches and promote each key once its rename succeeds."""
+    batch_size = batch_size or ROTATION_BATCH_SIZE
+    promoted = 0
+    for start in range(0, len(configs), batch_size):
+        batch = configs[start : start + batch_size]
+        plans = [
+            _plan_sync(
+                config,
+                roleset,
+                desired_name=_pending_role_name(config),
+                fallback_names=(role_name_for_group(config.group, config),),
+            )
+            for config in batch
+        ]
+        pending = [plan for plan in plans if plan.update]
+        metrics.run_stat("configs_examined", len(plans))
+        metrics.run_stat("noops", len(plans) - len(pending))
+        outcomes = _apply_role_updates([plan.update for plan in pending])
+        results = {id(plan): outcome for plan, outcome in zip(pending, outcomes)}
+        _note_changes(changes, [plan.update for plan in pending], outcomes)
+
+        now = timezone.now()
+        succeeded = []
+        failed = []
+        missing = []
+        for plan in plans:
+            config = plan.config
+            config.updated_at = now
+            if plan.role_id is None or not results.get(id(plan), True):
+                config.pending_random_key = ""
+                if plan.role_id is None and not plan.offline:
+                    config.role_match = ROLE_MATCH_NONE
+                    config.role_verified_at = now
+                    missing.append(config)
+                else:
+                    failed.append(config)
+                continue
+            config.random_key = config.pending_random_key
+            config.pending_random_key = ""
+            config.role_id = plan.role_id
+            config.last_obfuscated_name = plan.desired_name
+            config.role_match = ROLE_MATCH_DESIRED
+            config.role_verified_at = now
+            succeeded.append(config)
+
+        if succeeded:
+            DiscordRoleObfuscation.objects.bulk_update(
+                succeeded,
+                ["random_key", "pending_random_key"] + MATCH_FIELDS,
+            )
+        if failed:
+            logger.warning(
+                "Rotation rename failed for %s groups; keeping their current keys.",
+                len(failed),
+            )
+        if missing:
+            logger.info(
+                "No Discord role found for %s groups; keeping their current keys.",
+                len(missing),
+            )
+        if failed or missing:
+            fields = ["pending_random_key", "updated_at"]
+            if missing:
+                fields += ["role_match", "role_verified_at"]
+            DiscordRoleObfuscation.objects.bulk_update(failed + missing, fields)
+        promoted += len(succeeded)
+        if progress:
+            progress(start + len(batch), len(configs))
+    return promoted
+
+
 @shared_task
+@metrics.instrumented
 def rotate_random_keys_and_reorder_roles() -> int:
     """Rotate random keys, sync role names, and reorder roles via role ordering config."""
     configs = list(
@@ -536,23 +1123,38 @@ def rotate_random_keys_and_reorder_roles() -> int:
     )
     if not configs and not role_ordering_enabled():
         return 0
+    return rotate_and_reorder(configs)
+
 
+def rotate_and_reorder(
+    configs: list[DiscordRoleObfuscation], batch_size: int | None = None, progress=None
+) -> int:
+    """Rotate the configs' keys in batches, then apply the role ordering."""
     rename_targets = [config for config in configs if config.random_key_rotate_name]
-    for config in rename_targets:
-        config.random_key = generate_random_key(16)
-        config.save(update_fields=["random_key", "updated_at"])
+    _stage_pending_keys(rename_targets)
 
-    updated = 0
     roleset = fetch_roleset(use_cache=False)
-    for config in rename_targets:
-        if _sync_config(config, roleset=roleset):
-            updated += 1
+    _note_roleset(roleset)
+    changes = {}
+    updated = _rotate_pending_keys(
+        rename_targets,
+        roleset,
+        batch_size=batch_size,
+        progress=progress,
+        changes=changes,
+    )
+    renamed = _changed_roleset(roleset, changes)
+    if updated:
+        bump_mapping_version()
+        refresh_role_index(renamed)
 
     if role_ordering_enabled():
         bot_role_id = role_order_bot_role_id()
-        payload = _build_manual_order_payload(roleset, bot_role_id, role_order_mode())
-        if payload:
-            _reorder_roles_payload(payload)
+        payload = _build_manual_order_payload(renamed, bot_role_id, role_order_mode())
+        if payload and _reorder_roles_payload(payload):
+            for item in payload:
+                changes.setdefault(item["id"], {})["position"] = item["position"]
+    _store_roleset(_changed_roleset(roleset, changes))
     return updated
 
 
@@ -575,3 +1177,18 @@ def periodic_rotate_random_keys() -> int:
     if not random_key_rotation_enabled():
         return 0
     return rotate_random_keys_and_reorder_roles()
+
+
+@shared_task
+def prune_sync_run_history() -> int:
+    """Delete sync runs and roleset snapshots older than the retention window."""
+    return prune_sync_runs() + prune_roleset_snapshots()
+
+
+@worker_process_init.connect
+def warm_worker_caches(**kwargs) -> None:
+    """Start each worker process from the latest roleset snapshot."""
+    try:
+        warm_from_snapshot()
+    except Exception:
+        logger.exception("Failed to warm caches from the roleset snapshot")
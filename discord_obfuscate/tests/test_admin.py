@@ -0,0 +1,197 @@
+"""
+Discord Obfuscate admin tests
+"""
+
+# Standard Library
+import json
+from unittest import mock
+
+# Django
+from django.contrib.admin.sites import AdminSite
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+
+# Discord Obfuscate App
+from discord_obfuscate.admin import (
+    DiscordRoleObfuscationAdmin,
+    DiscordRoleOrderConfigAdmin,
+)
+from discord_obfuscate.fake_discord import FakeGuild, fake_bot_client
+from discord_obfuscate.models import (
+    DiscordRoleObfuscation,
+    DiscordRoleOrder,
+    DiscordRoleOrderConfig,
+)
+from discord_obfuscate.obfuscation import RawRole, SimpleRolesSet, role_name_for_group
+from discord_obfuscate.role_index import ELIGIBLE_GROUPS_KEY, get_eligible_group_ids
+
+
+class TestRoleOrderSave(TestCase):
+    """
+    TestRoleOrderSave
+    """
+
+    def test_save_model_applies_ordering_diff(self):
+        DiscordRoleOrder.objects.create(role_id=1, role_name="One", sort_order=1)
+        DiscordRoleOrder.objects.create(role_id=2, role_name="Two", sort_order=2)
+        DiscordRoleOrder.objects.create(role_id=3, role_name="Gone", sort_order=3)
+        roleset = SimpleRolesSet(
+            [
+                RawRole(id=1, name="One"),
+                RawRole(id=2, name="Two", color=0xFF0000),
+                RawRole(id=4, name="Four"),
+            ]
+        )
+        payload = [
+            {"role_id": 2, "locked": True},
+            {"role_id": 1, "locked": False},
+            {"role_id": 4, "locked": False},
+        ]
+        request = RequestFactory().post("/", {"role_order_data": json.dumps(payload)})
+        config = DiscordRoleOrderConfig.get_solo()
+        config.enabled = True
+        model_admin = DiscordRoleOrderConfigAdmin(DiscordRoleOrderConfig, AdminSite())
+
+        with (
+            mock.patch(
+                "discord_obfuscate.admin.fetch_roleset", return_value=roleset
+            ) as fetch,
+            mock.patch("discord_obfuscate.admin.messages"),
+        ):
+            model_admin.save_model(request, config, form=None, change=True)
+
+        fetch.assert_called_once_with(use_cache=True)
+        entries = {entry.role_id: entry for entry in DiscordRoleOrder.objects.all()}
+        self.assertEqual(set(entries), {1, 2, 4})
+        self.assertEqual(entries[2].sort_order, 1)
+        self.assertTrue(entries[2].locked)
+        self.assertEqual(entries[2].role_color, "#ff0000")
+        self.assertEqual(entries[1].sort_order, 2)
+        self.assertEqual(entries[4].role_name, "Four")
+
+
+class TestPreviewBatch(TestCase):
+    """
+    TestPreviewBatch
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        self.client.force_login(self.user)
+        self.url = reverse("admin:discord_obfuscate_preview_batch")
+
+    def test_items_render_in_one_request(self):
+        group = Group.objects.create(name="Alpha")
+        body = {
+            "items": [
+                {"group": group.pk, "settings": {"obfuscation_type": "sha256_hex"}},
+                {"group_name": "Beta", "settings": {"opt_out": True}},
+            ]
+        }
+
+        response = self.client.post(
+            self.url, json.dumps(body), content_type="application/json"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        previews = response.json()["previews"]
+        expected = role_name_for_group(
+            group,
+            DiscordRoleObfuscation(
+                group=group, opt_out=False, obfuscation_type="sha256_hex"
+            ),
+        )
+        self.assertEqual(previews[0]["preview"], expected)
+        self.assertEqual(previews[1]["preview"], "Beta")
+
+    def test_defaults_preview_every_config(self):
+        DiscordRoleObfuscation.objects.create(
+            group=Group.objects.create(name="Alpha"), opt_out=True
+        )
+        DiscordRoleObfuscation.objects.create(
+            group=Group.objects.create(name="Beta"), opt_out=True
+        )
+        body = {"defaults": {"opt_out": False, "obfuscation_type": "blake2s_hex"}}
+
+        response = self.client.post(
+            self.url, json.dumps(body), content_type="application/json"
+        )
+
+        previews = response.json()["previews"]
+        self.assertEqual([row["group_name"] for row in previews], ["Alpha", "Beta"])
+        self.assertEqual(previews[0]["current"], "Alpha")
+        self.assertNotEqual(previews[0]["preview"], "Alpha")
+
+    def test_defaults_without_dividers_keep_config_dividers(self):
+        config = DiscordRoleObfuscation.objects.create(
+            group=Group.objects.create(name="Alpha"),
+            opt_out=False,
+            divider_characters="┃",
+            min_chars_before_divider=2,
+        )
+        body = {"defaults": {"obfuscation_type": config.obfuscation_type}}
+
+        response = self.client.post(
+            self.url, json.dumps(body), content_type="application/json"
+        )
+
+        preview = response.json()["previews"][0]
+        self.assertIn("┃", preview["current"])
+        self.assertEqual(preview["preview"], preview["current"])
+
+
+class TestToggleOptOut(TestCase):
+    """
+    TestToggleOptOut
+    """
+
+    def test_toggle_flips_both_ways_and_queues_one_sync(self):
+        on = DiscordRoleObfuscation.objects.create(
+            group=Group.objects.create(name="On"), opt_out=True
+        )
+        off = DiscordRoleObfuscation.objects.create(
+            group=Group.objects.create(name="Off"), opt_out=False
+        )
+        model_admin = DiscordRoleObfuscationAdmin(DiscordRoleObfuscation, AdminSite())
+        request = RequestFactory().post("/")
+
+        with (
+            mock.patch("discord_obfuscate.tasks.sync_group_roles") as task,
+            mock.patch("discord_obfuscate.admin.messages"),
+        ):
+            model_admin.toggle_opt_out(request, DiscordRoleObfuscation.objects.all())
+
+        on.refresh_from_db()
+        off.refresh_from_db()
+        self.assertFalse(on.opt_out)
+        self.assertTrue(off.opt_out)
+        task.delay.assert_called_once()
+        self.assertEqual(
+            sorted(task.delay.call_args.args[0]), sorted([on.group_id, off.group_id])
+        )
+
+
+class TestGroupChoices(TestCase):
+    """
+    TestGroupChoices
+    """
+
+    def test_cold_cache_computes_and_stores_eligible_groups(self):
+        alpha = Group.objects.create(name="Alpha")
+        Group.objects.create(name="Unmatched")
+        guild = FakeGuild([{"id": 10, "name": "Alpha", "position": 1}])
+        model_admin = DiscordRoleObfuscationAdmin(DiscordRoleObfuscation, AdminSite())
+        request = RequestFactory().get("/")
+        request.user = User.objects.create_superuser("admin", "a@example.com", "x")
+        cache.delete(ELIGIBLE_GROUPS_KEY)
+
+        with fake_bot_client(guild):
+            form = model_admin.get_form(request)
+            requests = len(guild.requests)
+            model_admin.get_form(request)
+
+        self.assertEqual(list(form.base_fields["group"].queryset), [alpha])
+        self.assertEqual(get_eligible_group_ids(), [alpha.pk])
+        self.assertEqual(len(guild.requests), requests)
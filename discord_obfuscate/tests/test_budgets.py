@@ -0,0 +1,217 @@
+"""
+Discord Obfuscate query and Discord API call budgets
+
+Each entry point runs against a small and a larger fixture guild. Query counts
+must stay within budget and must not grow with the number of groups, so a new
+per-row query or save shows up as a failure here.
+
+Every measurement starts with cold caches. A roleset fetch is then two GETs: Alliance
+Auth's guild_roles and the raw roles request that carries positions.
+"""
+
+# Standard Library
+from unittest import mock
+
+# Django
+from django.contrib.auth.models import Group, User
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+# Discord Obfuscate App
+from discord_obfuscate import snapshots, tasks
+from discord_obfuscate.cache import bump_mapping_version
+from discord_obfuscate.fake_discord import FakeGuild, fake_bot_client
+from discord_obfuscate.models import (
+    DiscordObfuscateConfig,
+    DiscordRoleColorAssignment,
+    DiscordRoleColorRule,
+    DiscordRoleObfuscation,
+    DiscordRoleOrder,
+    DiscordRoleOrderConfig,
+)
+from discord_obfuscate.obfuscation import (
+    generate_random_key,
+    name_cache,
+    obfuscated_names_for_role_names,
+)
+from discord_obfuscate.role_index import role_config_maps
+
+SMALL = 5
+LARGE = 20
+BOT_ROLE_ID = 9
+# Storing a roleset snapshot the first time a roleset is seen: UPDATE + INSERT.
+SNAPSHOT_WRITE_QUERIES = 2
+# Looking for a fresh roleset snapshot before asking Discord.
+SNAPSHOT_READ_QUERIES = 1
+
+
+class BudgetTestCase(TestCase):
+    """
+    Builds fixture guilds and measures queries and Discord calls
+    """
+
+    def setUp(self):
+        # Create the singletons up front so the first run does not pay for it.
+        DiscordObfuscateConfig.get_solo()
+        DiscordRoleOrderConfig.get_solo()
+
+    def build(self, count: int) -> FakeGuild:
+        DiscordRoleColorAssignment.objects.all().delete()
+        DiscordRoleObfuscation.objects.all().delete()
+        DiscordRoleOrder.objects.all().delete()
+        Group.objects.all().delete()
+        Group.objects.bulk_create(
+            [Group(name=f"Group {index}") for index in range(count)]
+        )
+        groups = list(Group.objects.order_by("pk"))
+        DiscordRoleObfuscation.objects.bulk_create(
+            [
+                DiscordRoleObfuscation(
+                    group=group,
+                    opt_out=False,
+                    use_random_key=True,
+                    random_key=generate_random_key(16),
+                    random_key_rotate_name=True,
+                )
+                for group in groups
+            ]
+        )
+        roles = [{"id": 1, "name": "@everyone", "position": 0}]
+        roles.extend(
+            {"id": 10 + index, "name": group.name, "position": index + 1}
+            for index, group in enumerate(groups)
+        )
+        roles.append({"id": BOT_ROLE_ID, "name": "Bot", "position": count + 1})
+        DiscordRoleOrder.objects.bulk_create(
+            [
+                DiscordRoleOrder(
+                    role_id=10 + index, role_name=group.name, sort_order=index
+                )
+                for index, group in enumerate(reversed(groups))
+            ]
+        )
+        cache.clear()
+        ContentType.objects.clear_cache()
+        name_cache.clear()
+        role_config_maps.clear()
+        snapshots._latest = None
+        bump_mapping_version()
+        return FakeGuild(roles)
+
+    def measure(self, guild: FakeGuild, func) -> tuple[int, int]:
+        calls_before = len(guild.requests)
+        with fake_bot_client(guild), CaptureQueriesContext(connection) as queries:
+            func()
+        return len(queries.captured_queries), len(guild.requests) - calls_before
+
+    def assertBudget(self, func, max_queries: int, api_calls):
+        """Run func at both sizes; api_calls maps the group count to the allowed calls."""
+        counts = []
+        for count in (SMALL, LARGE):
+            guild = self.build(count)
+            queries, calls = self.measure(guild, func)
+            self.assertLessEqual(queries, max_queries, f"{count} groups")
+            self.assertLessEqual(calls, api_calls(count), f"{count} groups")
+            counts.append(queries)
+        self.assertEqual(counts[0], counts[1], "query count grows with groups")
+
+
+class TestNameResolutionBudget(BudgetTestCase):
+    """
+    TestNameResolutionBudget
+    """
+
+    def test_cold_and_warm_resolution(self):
+        names = [f"Group {index}" for index in range(SMALL)]
+        self.assertBudget(
+            lambda: obfuscated_names_for_role_names(names),
+            max_queries=3 + SNAPSHOT_READ_QUERIES,
+            api_calls=lambda count: 2,
+        )
+
+        # Warm lookups only read the Require existing role flag, part of the key.
+        guild = self.build(SMALL)
+        self.measure(guild, lambda: obfuscated_names_for_role_names(names))
+        self.assertEqual(
+            self.measure(guild, lambda: obfuscated_names_for_role_names(names)), (1, 0)
+        )
+
+    def test_resolution_from_stored_snapshot(self):
+        names = [f"Group {index}" for index in range(SMALL)]
+        guild = self.build(SMALL)
+        self.measure(guild, tasks.refresh_role_status)
+        name_cache.clear()
+
+        queries, calls = self.measure(
+            guild, lambda: obfuscated_names_for_role_names(names)
+        )
+
+        self.assertLessEqual(queries, 3 + SNAPSHOT_READ_QUERIES)
+        self.assertEqual(calls, 0)
+
+
+class TestTaskBudgets(BudgetTestCase):
+    """
+    TestTaskBudgets
+    """
+
+    def test_sync_all_roles(self):
+        # The role index is built from the fetched roleset plus the renames.
+        self.assertBudget(
+            tasks.sync_all_roles,
+            max_queries=7 + SNAPSHOT_WRITE_QUERIES,
+            api_calls=lambda count: count + 2,
+        )
+
+    def test_sync_role_color_rules(self):
+        DiscordRoleColorRule.objects.create(name="Groups", pattern="Group *")
+        self.assertBudget(
+            tasks.sync_role_color_rules,
+            max_queries=9 + SNAPSHOT_WRITE_QUERIES,
+            api_calls=lambda count: count + 2,
+        )
+
+    def test_rotate_random_keys_and_reorder_roles(self):
+        config = DiscordRoleOrderConfig.get_solo()
+        config.enabled = True
+        config.bot_role_id = BOT_ROLE_ID
+        config.reorder_mode = "desired"
+        config.save()
+
+        with mock.patch.object(tasks, "ROTATION_BATCH_SIZE", LARGE):
+            self.assertBudget(
+                tasks.rotate_random_keys_and_reorder_roles,
+                max_queries=12 + SNAPSHOT_WRITE_QUERIES,
+                api_calls=lambda count: count + 3,
+            )
+
+
+class TestAdminBudgets(BudgetTestCase):
+    """
+    TestAdminBudgets
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        self.client.force_login(self.user)
+
+    def test_obfuscation_changelist(self):
+        url = reverse("admin:discord_obfuscate_discordroleobfuscation_changelist")
+        self.assertBudget(
+            lambda: self.assertEqual(self.client.get(url).status_code, 200),
+            max_queries=12,
+            api_calls=lambda count: 0,
+        )
+
+    def test_role_order_page(self):
+        url = reverse("admin:discord_obfuscate_discordroleorderconfig_change")
+        self.assertBudget(
+            lambda: self.assertEqual(self.client.get(url).status_code, 200),
+            max_queries=13 + SNAPSHOT_READ_QUERIES,
+            api_calls=lambda count: 3,
+        )
@@ -0,0 +1,122 @@
+"""
+Discord Obfuscate cache tests
+"""
+
+# Standard Library
+from unittest import mock
+
+# Django
+from django.contrib.auth.models import Group
+from django.test import TestCase
+
+# Discord Obfuscate App
+from discord_obfuscate.cache import (
+    FingerprintCache,
+    bump_mapping_version,
+    mapping_version,
+)
+from discord_obfuscate.constants import ROLE_MATCH_NONE
+from discord_obfuscate.fake_discord import FakeGuild, fake_bot_client
+from discord_obfuscate.models import DiscordObfuscateConfig, DiscordRoleObfuscation
+from discord_obfuscate.obfuscation import (
+    RawRole,
+    SimpleRolesSet,
+    name_cache,
+    obfuscated_names_for_role_names,
+    role_name_for_group,
+)
+from discord_obfuscate.role_index import build_role_index, store_match_state
+
+
+class TestFingerprintCache(TestCase):
+    """
+    TestFingerprintCache
+    """
+
+    def test_evicts_least_recently_used(self):
+        cache = FingerprintCache(max_entries=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.set("c", 3)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+        stats = cache.stats()
+        self.assertEqual(stats["entries"], 2)
+        self.assertEqual(stats["evictions"], 1)
+        self.assertEqual(stats["hits"], 3)
+        self.assertEqual(stats["misses"], 1)
+
+    def test_expired_entries_are_misses(self):
+        cache = FingerprintCache(max_entries=10, ttl=5)
+        with mock.patch("discord_obfuscate.cache.time.monotonic", return_value=100.0):
+            cache.set("a", 1)
+        with mock.patch("discord_obfuscate.cache.time.monotonic", return_value=106.0):
+            self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats()["entries"], 0)
+
+
+class TestNameCache(TestCase):
+    """
+    TestNameCache
+    """
+
+    def test_cached_names_keep_caller_order(self):
+        config = DiscordRoleObfuscation.objects.create(
+            group=Group.objects.create(name="Alpha"), opt_out=False
+        )
+        Group.objects.create(name="Zulu")
+        obfuscated = role_name_for_group(config.group, config)
+        guild = FakeGuild(
+            [
+                {"id": 1, "name": "@everyone", "position": 0},
+                {"id": 10, "name": obfuscated, "position": 1},
+                {"id": 11, "name": "Zulu", "position": 2},
+            ]
+        )
+        name_cache.clear()
+        bump_mapping_version()
+
+        with fake_bot_client(guild):
+            first = obfuscated_names_for_role_names(["Zulu", "Alpha", "Mike"])
+            # Only the Require existing role flag is read.
+            with self.assertNumQueries(1):
+                second = obfuscated_names_for_role_names(["Mike", "Alpha", "Zulu"])
+
+        self.assertEqual(first, ["Zulu", obfuscated, "Mike"])
+        self.assertEqual(second, ["Mike", obfuscated, "Zulu"])
+
+    def test_require_existing_role_is_part_of_the_key(self):
+        Group.objects.create(name="Alpha")
+        guild = FakeGuild([{"id": 1, "name": "@everyone", "position": 0}])
+        settings = DiscordObfuscateConfig.get_solo()
+        name_cache.clear()
+
+        with fake_bot_client(guild):
+            settings.require_existing_role = False
+            settings.save()
+            kept = obfuscated_names_for_role_names(["Guest"], state_name="Guest")
+            settings.require_existing_role = True
+            settings.save()
+            dropped = obfuscated_names_for_role_names(["Guest"], state_name="Guest")
+
+        self.assertEqual(kept, ["Guest"])
+        self.assertEqual(dropped, [])
+
+    def test_changed_match_state_bumps_mapping_version(self):
+        config = DiscordRoleObfuscation.objects.create(
+            group=Group.objects.create(name="Alpha"), opt_out=False
+        )
+        roleset = SimpleRolesSet([RawRole(id=10, name="Alpha")])
+        store_match_state(build_role_index(roleset))
+        version = mapping_version()
+
+        store_match_state(build_role_index(roleset))
+        self.assertEqual(mapping_version(), version)
+
+        store_match_state(build_role_index(SimpleRolesSet([])))
+        self.assertGreater(mapping_version(), version)
+        config.refresh_from_db()
+        self.assertEqual(config.role_match, ROLE_MATCH_NONE)
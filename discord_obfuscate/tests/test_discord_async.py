@@ -0,0 +1,50 @@
+"""
+Discord Obfuscate async client tests
+"""
+
+# Standard Library
+from unittest import skipUnless
+
+# Django
+from django.test import SimpleTestCase
+
+# Discord Obfuscate App
+from discord_obfuscate.discord_async import RoleUpdate, httpx, patch_roles
+from discord_obfuscate.fake_discord import FakeDiscordServer
+
+
+@skipUnless(httpx, "httpx is not installed")
+class TestAsyncDiscordClient(SimpleTestCase):
+    """
+    TestAsyncDiscordClient
+    """
+
+    def test_patch_roles_against_fake_server(self):
+        roles = [
+            {"id": str(role_id), "name": f"Role {role_id}"} for role_id in range(1, 6)
+        ]
+        updates = [
+            RoleUpdate(role_id, name=f"Renamed {role_id}") for role_id in range(1, 6)
+        ]
+        updates.append(RoleUpdate(1, color=0xFF0000))
+        updates.append(RoleUpdate(99, name="Missing"))
+
+        with FakeDiscordServer(roles, rate_limit_first=1) as server:
+            results = patch_roles(
+                updates,
+                token="token",
+                guild_id=1,
+                base_url=server.url,
+                max_concurrency=3,
+            )
+
+        self.assertEqual(results, [True] * 6 + [False])
+        self.assertEqual(server.roles[1]["name"], "Renamed 1")
+        self.assertEqual(server.roles[1]["color"], 0xFF0000)
+        self.assertEqual(server.roles[5]["name"], "Renamed 5")
+        role_one = [
+            payload
+            for _method, route, payload in server.requests
+            if route.endswith("/roles/1")
+        ]
+        self.assertEqual(role_one[-1], {"color": 0xFF0000})
@@ -2,11 +2,26 @@
 Discord Obfuscate test
 """
 
+# Standard Library
+import base64
+import hashlib
+import hmac
+
 # Django
+from django.contrib.auth.models import Group
 from django.test import TestCase
 
 # Discord Obfuscate App
-from discord_obfuscate.obfuscation import obfuscate_name
+from discord_obfuscate.cache import bump_mapping_version
+from discord_obfuscate.fake_discord import FakeGuild, fake_bot_client
+from discord_obfuscate.models import DiscordObfuscateConfig
+from discord_obfuscate.obfuscation import (
+    RawRole,
+    SimpleRolesSet,
+    obfuscate_name,
+    obfuscated_names_for_role_names,
+    resolve_state_role_name,
+)
 
 class TestDiscordObfuscate(TestCase):
     """
@@ -39,3 +54,63 @@ class TestDiscordObfuscate(TestCase):
         )
         self.assertTrue(result.startswith("grp"))
         self.assertEqual(len(result), len("grp") + 8)
+
+    def test_obfuscate_name_matches_plain_hmac(self):
+        for name in ("Alpha", "Beta"):
+            expected = base64.b32encode(
+                hmac.new(b"secret", name.encode("utf-8"), hashlib.sha256).digest()
+            ).decode("ascii")
+            result = obfuscate_name(
+                name, "sha256_base32", "secret", format_str="{hash16}"
+            )
+            self.assertEqual(result, expected[:16])
+
+
+class TestStateRoleName(TestCase):
+    """
+    TestStateRoleName
+    """
+
+    def setUp(self):
+        self.roleset = SimpleRolesSet([RawRole(id=10, name="Member")])
+
+    def set_require_existing_role(self, value: bool) -> None:
+        config = DiscordObfuscateConfig.get_solo()
+        config.require_existing_role = value
+        config.save()
+        bump_mapping_version()
+
+    def test_state_with_role_is_kept(self):
+        for value in (False, True):
+            self.set_require_existing_role(value)
+            self.assertEqual(resolve_state_role_name("Member", self.roleset), "Member")
+
+    def test_state_without_role_is_kept_by_default(self):
+        self.set_require_existing_role(False)
+        self.assertEqual(resolve_state_role_name("Guest", self.roleset), "Guest")
+
+    def test_state_without_role_is_dropped_when_role_required(self):
+        self.set_require_existing_role(True)
+        self.assertIsNone(resolve_state_role_name("Guest", self.roleset))
+
+    def test_user_role_names_drop_missing_state(self):
+        Group.objects.create(name="Alpha")
+        guild = FakeGuild(
+            [
+                {"id": 1, "name": "@everyone", "position": 0},
+                {"id": 10, "name": "Member", "position": 1},
+                {"id": 11, "name": "Alpha", "position": 2},
+            ]
+        )
+        self.set_require_existing_role(True)
+
+        with fake_bot_client(guild):
+            member = obfuscated_names_for_role_names(
+                ["Member", "Alpha"], state_name="Member"
+            )
+            guest = obfuscated_names_for_role_names(
+                ["Guest", "Alpha"], state_name="Guest"
+            )
+
+        self.assertEqual(member, ["Member", "Alpha"])
+        self.assertEqual(guest, ["Alpha"])
@@ -0,0 +1,118 @@
+"""
+Discord Obfuscate sync run history tests
+"""
+
+# Standard Library
+import datetime as dt
+from unittest import mock
+
+# Django
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+# Discord Obfuscate App
+from discord_obfuscate import metrics
+from discord_obfuscate.history import prune_sync_runs
+from discord_obfuscate.models import SyncRun
+
+
+class TestSyncRunHistory(TestCase):
+    """
+    TestSyncRunHistory
+    """
+
+    def test_instrumented_task_writes_one_run(self):
+        @metrics.instrumented
+        def nested():
+            metrics.run_stat("renames", 2)
+            return 2
+
+        @metrics.instrumented
+        def outer():
+            metrics.run_stat("configs_examined", 5)
+            metrics.run_stat("noops", 3)
+            metrics.run_info("roleset_hash", "abc")
+            metrics.inc("discord_obfuscate_rate_limit_wait_seconds_total", 1.5)
+            return nested()
+
+        with self.assertNumQueries(1):
+            outer()
+
+        run = SyncRun.objects.get()
+        self.assertEqual(run.task_name, "outer")
+        self.assertEqual(run.status, SyncRun.STATUS_OK)
+        self.assertEqual(run.result, 2)
+        self.assertEqual(run.configs_examined, 5)
+        self.assertEqual(run.renames_sent, 2)
+        self.assertEqual(run.noops_skipped, 3)
+        self.assertEqual(run.rate_limit_sleep, 1.5)
+        self.assertEqual(run.roleset_hash, "abc")
+
+    def test_failed_task_records_error(self):
+        @metrics.instrumented
+        def broken():
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            broken()
+
+        run = SyncRun.objects.get()
+        self.assertEqual(run.status, SyncRun.STATUS_ERROR)
+        self.assertEqual(run.errors, 1)
+        self.assertEqual(run.error_message, "RuntimeError: boom")
+
+    def test_prune_removes_old_runs(self):
+        now = timezone.now()
+        for age in (1, 40):
+            started = now - dt.timedelta(days=age)
+            SyncRun.objects.create(
+                task_name="sync_all_roles",
+                started_at=started,
+                finished_at=started,
+                duration=0,
+            )
+
+        self.assertEqual(prune_sync_runs(days=30), 1)
+        self.assertEqual(SyncRun.objects.count(), 1)
+
+
+class TestSampledProfiling(TestCase):
+    """
+    TestSampledProfiling
+    """
+
+    def test_sampled_run_stores_profile_and_downloads(self):
+        @metrics.instrumented
+        def sync_everything():
+            return sum(range(1000))
+
+        with mock.patch("discord_obfuscate.metrics.should_profile", return_value=True):
+            sync_everything()
+
+        run = SyncRun.objects.get()
+        self.assertEqual(run.profiler, "cprofile")
+        self.assertIn("sync_everything", run.profile)
+
+        user = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        self.client.force_login(user)
+        response = self.client.get(
+            reverse("admin:discord_obfuscate_syncrun_profile", args=[run.pk])
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("attachment", response["Content-Disposition"])
+        self.assertIn(b"sync_everything", response.content)
+
+    def test_unsampled_run_has_no_profile(self):
+        @metrics.instrumented
+        def sync_everything():
+            return 0
+
+        with mock.patch("discord_obfuscate.metrics.random.random", return_value=0.5):
+            with mock.patch(
+                "discord_obfuscate.metrics.DISCORD_OBFUSCATE_PROFILE_SAMPLE_RATE", 0.1
+            ):
+                sync_everything()
+
+        self.assertEqual(SyncRun.objects.get().profile, "")
@@ -0,0 +1,97 @@
+"""
+Discord Obfuscate import cost
+
+Starts a fresh interpreter with ``python -X importtime`` and measures what
+loading the app costs a web or worker process that has not used it yet.
+"""
+
+# Standard Library
+import os
+import subprocess
+import sys
+
+# Django
+from django.conf import settings
+from django.test import SimpleTestCase
+
+# Cumulative microseconds spent importing discord_obfuscate and everything it
+# pulls in first, measured on a fresh Django setup. The default is about twenty
+# times the usual cost so slow machines pass; set the variable to hold a quiet
+# machine to a tighter budget, e.g. DISCORD_OBFUSCATE_IMPORT_TIME_BUDGET_US=50000.
+IMPORT_TIME_BUDGET_ENV = "DISCORD_OBFUSCATE_IMPORT_TIME_BUDGET_US"
+DEFAULT_IMPORT_TIME_BUDGET_US = 500000
+
+# Loaded on first use only; none of these may be imported during startup.
+LAZY_MODULES = (
+    "allianceauth.services.modules.discord.discord_client",
+    "discord_obfuscate.tasks",
+    "discord_obfuscate.discord_async",
+    "discord_obfuscate.profiling",
+    "httpx",
+)
+
+IMPORT_SCRIPT = (
+    "import django; django.setup(); "
+    "import discord_obfuscate.obfuscation, discord_obfuscate.patches"
+)
+
+
+def _import_tree() -> list[tuple[str, int, tuple[str, ...]]]:
+    """Run the import script and return (module, cumulative us, ancestors) rows."""
+    env = dict(os.environ)
+    env["DJANGO_SETTINGS_MODULE"] = settings.SETTINGS_MODULE
+    env["PYTHONPATH"] = os.pathsep.join(path for path in sys.path if path)
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_SCRIPT],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    lines = [
+        line[len("import time:") :]
+        for line in completed.stderr.splitlines()
+        if line.startswith("import time:") and "imported package" not in line
+    ]
+
+    # Children are reported before their parent, so walk the output backwards.
+    rows = []
+    stack: list[str] = []
+    for line in reversed(lines):
+        _self_us, cumulative_us, name = line.split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        del stack[depth:]
+        rows.append((name.strip(), int(cumulative_us), tuple(stack)))
+        stack.append(name.strip())
+    return rows
+
+
+class TestImportTime(SimpleTestCase):
+    """
+    TestImportTime
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.rows = _import_tree()
+
+    def test_app_import_cost_within_budget(self):
+        budget = int(
+            os.environ.get(IMPORT_TIME_BUDGET_ENV) or DEFAULT_IMPORT_TIME_BUDGET_US
+        )
+        cost = sum(
+            cumulative
+            for name, cumulative, ancestors in self.rows
+            if name.startswith("discord_obfuscate")
+            and not any(parent.startswith("discord_obfuscate") for parent in ancestors)
+        )
+
+        self.assertLess(cost, budget)
+
+    def test_heavy_modules_are_not_imported_at_startup(self):
+        imported = {name for name, _cumulative, _ancestors in self.rows}
+
+        for module in LAZY_MODULES:
+            with self.subTest(module=module):
+                self.assertNotIn(module, imported)
@@ -0,0 +1,81 @@
+"""
+Discord Obfuscate metrics tests
+"""
+
+# Standard Library
+import json
+from unittest import mock
+
+# Django
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+# Discord Obfuscate App
+from discord_obfuscate import metrics, obfuscation
+
+
+class TestMetrics(TestCase):
+    """
+    TestMetrics
+    """
+
+    def test_normalize_route(self):
+        self.assertEqual(
+            metrics.normalize_route("guilds/123/roles/456"), "guilds/{id}/roles/{id}"
+        )
+
+    def test_render_merges_process_snapshots(self):
+        snapshot = {
+            "counters": [
+                ["discord_obfuscate_fallbacks_total", {"kind": "roleset_refetch"}, 2]
+            ],
+            "histograms": [
+                ["discord_obfuscate_hook_seconds", {}, [1] + [0] * 11, 0.001, 1]
+            ],
+        }
+
+        text = metrics.render_prometheus([snapshot, snapshot])
+
+        self.assertIn(
+            'discord_obfuscate_fallbacks_total{kind="roleset_refetch"} 4', text
+        )
+        self.assertIn('discord_obfuscate_hook_seconds_bucket{le="+Inf"} 2', text)
+        self.assertIn("discord_obfuscate_hook_seconds_count 2", text)
+
+    def test_instrumented_logs_run_totals(self):
+        @metrics.instrumented
+        def task():
+            metrics.inc(
+                "discord_obfuscate_role_updates_total", 3, kind="name", result="ok"
+            )
+            return 3
+
+        with mock.patch.object(metrics.logger, "info") as log:
+            self.assertEqual(task(), 3)
+
+        payload = json.loads(log.call_args.args[1])
+        self.assertEqual(payload["task"], "task")
+        self.assertEqual(payload["result"], 3)
+        self.assertEqual(payload["role_updates"], 3)
+
+    def test_admin_endpoint_serves_prometheus_text(self):
+        user = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        self.client.force_login(user)
+        metrics.inc("discord_obfuscate_fallbacks_total", kind="hook_error")
+
+        response = self.client.get(reverse("admin:discord_obfuscate_metrics"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"discord_obfuscate_fallbacks_total", response.content)
+
+    def test_raw_role_fetch_counts_outcome(self):
+        client = mock.Mock()
+        client._api_request.side_effect = [[{"id": "1"}], RuntimeError("down")]
+
+        with mock.patch.object(metrics, "inc") as inc:
+            self.assertEqual(obfuscation._fetch_raw_roles(client, 1), [{"id": "1"}])
+            self.assertIsNone(obfuscation._fetch_raw_roles(client, 1))
+
+        results = [call.kwargs["result"] for call in inc.call_args_list]
+        self.assertEqual(results, ["ok", "error"])
@@ -0,0 +1,88 @@
+"""
+Discord Obfuscate rate limiter and threaded update tests
+"""
+
+# Standard Library
+import threading
+from unittest import mock
+
+# Django
+from django.test import TestCase
+
+# Discord Obfuscate App
+from discord_obfuscate import tasks
+from discord_obfuscate.discord_async import RoleUpdate
+from discord_obfuscate.fake_discord import FakeGuild, fake_bot_client
+from discord_obfuscate.rate_limit import RateLimiter
+
+
+class TestRateLimiter(TestCase):
+    """
+    TestRateLimiter
+    """
+
+    def test_spaces_requests_and_honors_block(self):
+        limiter = RateLimiter(rate_per_second=2)
+        with mock.patch("discord_obfuscate.rate_limit.time") as fake_time:
+            fake_time.monotonic.return_value = 100.0
+            limiter.wait()
+            limiter.wait()
+            fake_time.sleep.assert_called_once_with(0.5)
+
+            limiter.block_for(3.0)
+            limiter.wait()
+            fake_time.sleep.assert_called_with(3.0)
+
+
+class TestThreadedRoleUpdates(TestCase):
+    """
+    TestThreadedRoleUpdates
+    """
+
+    def test_keeps_per_role_order_and_result_positions(self):
+        seen = []
+        lock = threading.Lock()
+
+        def fake_update(role_id, name=None, color=None, limiter=None, client=None):
+            with lock:
+                seen.append((role_id, name, color))
+            return role_id != 3
+
+        updates = [
+            RoleUpdate(1, name="first"),
+            RoleUpdate(2, color=5),
+            RoleUpdate(1, color=7),
+            RoleUpdate(3, name="broken"),
+        ]
+        with (
+            mock.patch.object(tasks, "_update_role", side_effect=fake_update),
+            mock.patch.object(tasks, "DISCORD_OBFUSCATE_ROLE_UPDATE_CONCURRENCY", 3),
+            mock.patch.object(tasks, "DISCORD_OBFUSCATE_ROLE_UPDATE_RATE", 0),
+        ):
+            results = tasks._apply_role_updates(updates)
+
+        self.assertEqual(results, [True, True, True, False])
+        role_one = [entry for entry in seen if entry[0] == 1]
+        self.assertEqual(role_one, [(1, "first", None), (1, None, 7)])
+
+    def test_each_worker_thread_uses_its_own_client(self):
+        guild = FakeGuild(
+            [{"id": 1, "name": "@everyone", "position": 0}]
+            + [{"id": 10 + i, "name": f"Role {i}", "position": i + 1} for i in range(6)]
+        )
+        updates = [RoleUpdate(10 + i, name=f"Renamed {i}") for i in range(6)]
+
+        with (
+            fake_bot_client(guild) as client,
+            mock.patch.object(tasks, "DISCORD_OBFUSCATE_ROLE_UPDATE_CONCURRENCY", 3),
+            mock.patch.object(tasks, "DISCORD_OBFUSCATE_ROLE_UPDATE_RATE", 0),
+        ):
+            results = tasks._apply_role_updates(updates)
+
+        self.assertEqual(results, [True] * 6)
+        self.assertEqual(guild.roles[15]["name"], "Renamed 5")
+        self.assertEqual(client.threads, set())
+        self.assertTrue(1 <= len(client.spawned) <= 3)
+        threads = [worker.threads for worker in client.spawned]
+        self.assertTrue(all(len(used) == 1 for used in threads))
+        self.assertEqual(len(set().union(*threads)), len(client.spawned))
@@ -0,0 +1,117 @@
+"""
+Discord Obfuscate role index tests
+"""
+
+# Django
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.test import TestCase
+
+# Discord Obfuscate App
+from discord_obfuscate.constants import (
+    ROLE_MATCH_DESIRED,
+    ROLE_MATCH_LAST,
+    ROLE_MATCH_NONE,
+    ROLE_MATCH_ORIGINAL,
+)
+from discord_obfuscate.models import DiscordRoleObfuscation
+from discord_obfuscate.obfuscation import RawRole, SimpleRolesSet, role_name_for_group
+from discord_obfuscate.role_index import (
+    build_role_index,
+    get_role_index,
+    refresh_role_index,
+    store_match_state,
+)
+
+
+class TestRoleIndex(TestCase):
+    """
+    TestRoleIndex
+    """
+
+    def test_matches_configs_to_roles(self):
+        obfuscated = DiscordRoleObfuscation.objects.create(
+            group=Group.objects.create(name="Obfuscated"), opt_out=False
+        )
+        original = DiscordRoleObfuscation.objects.create(
+            group=Group.objects.create(name="Original"), opt_out=False
+        )
+        renamed = DiscordRoleObfuscation.objects.create(
+            group=Group.objects.create(name="Renamed"), opt_out=False, role_id=30
+        )
+        missing = DiscordRoleObfuscation.objects.create(
+            group=Group.objects.create(name="Missing"), opt_out=True
+        )
+        roleset = SimpleRolesSet(
+            [
+                RawRole(id=10, name=role_name_for_group(obfuscated.group, obfuscated)),
+                RawRole(id=20, name="Original"),
+                RawRole(id=30, name="Something else"),
+            ]
+        )
+
+        index = build_role_index(roleset)
+
+        self.assertEqual(
+            index.match_for_config(obfuscated.pk).match_kind, ROLE_MATCH_DESIRED
+        )
+        self.assertEqual(
+            index.match_for_config(original.pk).match_kind, ROLE_MATCH_ORIGINAL
+        )
+        self.assertEqual(index.match_for_config(renamed.pk).match_kind, ROLE_MATCH_LAST)
+        self.assertEqual(index.match_for_config(missing.pk).match_kind, ROLE_MATCH_NONE)
+        self.assertEqual(index.match_for_role(20).config_id, original.pk)
+        self.assertFalse(index.role_exists(missing.pk))
+
+    def test_stored_role_id_wins_over_desired_name(self):
+        config = DiscordRoleObfuscation.objects.create(
+            group=Group.objects.create(name="Alpha"), opt_out=False, role_id=30
+        )
+        desired = role_name_for_group(config.group, config)
+        roleset = SimpleRolesSet(
+            [RawRole(id=10, name=desired), RawRole(id=30, name="Renamed by hand")]
+        )
+
+        match = build_role_index(roleset).match_for_config(config.pk)
+        self.assertEqual((match.role_id, match.match_kind), (30, ROLE_MATCH_LAST))
+
+        roleset = SimpleRolesSet(
+            [RawRole(id=10, name="Other"), RawRole(id=30, name=desired)]
+        )
+        match = build_role_index(roleset).match_for_config(config.pk)
+        self.assertEqual((match.role_id, match.match_kind), (30, ROLE_MATCH_DESIRED))
+
+        roleset = SimpleRolesSet([RawRole(id=30, name="Alpha")])
+        match = build_role_index(roleset).match_for_config(config.pk)
+        self.assertEqual((match.role_id, match.match_kind), (30, ROLE_MATCH_ORIGINAL))
+
+    def test_store_match_state_persists_columns(self):
+        config = DiscordRoleObfuscation.objects.create(
+            group=Group.objects.create(name="Original"), opt_out=False
+        )
+        roleset = SimpleRolesSet([RawRole(id=20, name="Original")])
+
+        store_match_state(build_role_index(roleset))
+
+        config.refresh_from_db()
+        self.assertEqual(config.role_id, 20)
+        self.assertEqual(config.role_match, ROLE_MATCH_ORIGINAL)
+        self.assertIsNotNone(config.role_verified_at)
+
+    def test_cache_miss_does_not_persist_match_state(self):
+        config = DiscordRoleObfuscation.objects.create(
+            group=Group.objects.create(name="Original"), opt_out=False
+        )
+        roleset = SimpleRolesSet([RawRole(id=20, name="Original")])
+        cache.clear()
+
+        index = get_role_index(roleset)
+
+        self.assertEqual(index.match_for_config(config.pk).role_id, 20)
+        config.refresh_from_db()
+        self.assertIsNone(config.role_verified_at)
+
+        refresh_role_index(roleset)
+
+        config.refresh_from_db()
+        self.assertEqual(config.role_match, ROLE_MATCH_ORIGINAL)
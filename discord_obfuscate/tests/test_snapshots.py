@@ -0,0 +1,194 @@
+"""
+Discord Obfuscate roleset snapshot tests
+"""
+
+# Standard Library
+import datetime as dt
+import time
+from io import StringIO
+from unittest import mock
+
+# Django
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils import timezone
+
+# Discord Obfuscate App
+from discord_obfuscate import snapshots, tasks
+from discord_obfuscate.fake_discord import FakeGuild, fake_bot_client
+from discord_obfuscate.models import DiscordRoleObfuscation, RolesetSnapshot
+from discord_obfuscate.obfuscation import fetch_roleset, role_name_for_group
+from discord_obfuscate.role_index import ELIGIBLE_GROUPS_KEY, get_eligible_group_ids
+from discord_obfuscate.snapshots import (
+    load_roleset_snapshot,
+    prune_roleset_snapshots,
+    save_roleset_snapshot,
+    snapshot_fingerprint,
+    warm_from_snapshot,
+)
+
+
+class TestRolesetSnapshots(TestCase):
+    """
+    TestRolesetSnapshots
+    """
+
+    def setUp(self):
+        snapshots._latest = None
+        self.guild = FakeGuild(
+            [
+                {"id": 1, "name": "@everyone", "position": 0},
+                {"id": 10, "name": "Alpha", "position": 1},
+                {"id": 11, "name": "Bravo", "position": 2},
+            ]
+        )
+
+    def fetch(self):
+        """Run a task that reads the roleset from Discord and stores it."""
+        with fake_bot_client(self.guild):
+            tasks.refresh_role_status()
+        snapshots._latest = None
+
+    def test_task_stores_one_row_per_roleset(self):
+        self.fetch()
+        self.fetch()
+
+        snapshot = RolesetSnapshot.objects.get()
+        self.assertEqual(snapshot.role_count, 3)
+        self.assertEqual(snapshot.roles[1][:3], [10, "Alpha", 1])
+
+        self.guild.roles[11]["name"] = "Charlie"
+        self.fetch()
+
+        self.assertEqual(RolesetSnapshot.objects.count(), 2)
+        self.assertEqual(RolesetSnapshot.objects.first().roles[2][1], "Charlie")
+
+    def test_new_roleset_costs_two_queries_and_repeats_none(self):
+        with fake_bot_client(self.guild):
+            with self.assertNumQueries(0):
+                roleset = fetch_roleset(use_cache=False)
+        with self.assertNumQueries(2):
+            save_roleset_snapshot(roleset)
+        with self.assertNumQueries(0):
+            save_roleset_snapshot(roleset)
+
+    def test_fetch_serves_fresh_snapshot(self):
+        self.fetch()
+        requests = len(self.guild.requests)
+
+        with fake_bot_client(self.guild):
+            with self.assertNumQueries(1):
+                roleset = fetch_roleset(use_cache=True)
+            with self.assertNumQueries(0):
+                fetch_roleset(use_cache=True)
+
+        self.assertEqual(len(self.guild.requests), requests)
+        self.assertEqual(roleset.role_by_name("Bravo").position, 2)
+
+    def test_fetch_skips_stale_snapshot_without_storing(self):
+        self.fetch()
+        stale = timezone.now() - dt.timedelta(hours=2)
+        RolesetSnapshot.objects.update(last_seen_at=stale)
+        requests = len(self.guild.requests)
+
+        with fake_bot_client(self.guild):
+            roleset = fetch_roleset(use_cache=True)
+
+        self.assertEqual(len(roleset), 3)
+        self.assertEqual(len(self.guild.requests), requests + 2)
+        self.assertEqual(RolesetSnapshot.objects.get().last_seen_at, stale)
+
+    def test_snapshot_from_another_process_is_picked_up(self):
+        self.fetch()
+        roles = RolesetSnapshot.objects.get().roles
+        roles[2][1] = "Charlie"
+
+        with fake_bot_client(self.guild):
+            fetch_roleset(use_cache=True)
+            # Another worker stores a newer roleset.
+            RolesetSnapshot.objects.create(
+                fingerprint=snapshot_fingerprint(roles),
+                roles=roles,
+                role_count=len(roles),
+                last_seen_at=timezone.now(),
+            )
+            self.assertIsNone(fetch_roleset(use_cache=True).role_by_name("Charlie"))
+
+            later = time.monotonic() + snapshots.TOUCH_INTERVAL
+            with mock.patch.object(snapshots.time, "monotonic", return_value=later):
+                roleset = fetch_roleset(use_cache=True)
+
+        self.assertEqual(roleset.role_by_id(11).name, "Charlie")
+
+    def test_sync_stores_roleset_with_its_renames(self):
+        group = Group.objects.create(name="Alpha")
+        config = DiscordRoleObfuscation.objects.create(group=group, opt_out=False)
+
+        with fake_bot_client(self.guild):
+            tasks.sync_all_roles()
+
+        snapshot = RolesetSnapshot.objects.get()
+        self.assertEqual(snapshot.roles[1][1], role_name_for_group(group, config))
+        self.assertEqual(snapshot.roles[1][1], self.guild.roles[10]["name"])
+
+    def test_load_respects_max_age(self):
+        self.fetch()
+        RolesetSnapshot.objects.update(
+            last_seen_at=timezone.now() - dt.timedelta(hours=2)
+        )
+
+        self.assertIsNone(load_roleset_snapshot(max_age=3600))
+        roleset = load_roleset_snapshot()
+        self.assertEqual(
+            sorted(role.name for role in roleset), ["@everyone", "Alpha", "Bravo"]
+        )
+        self.assertEqual(roleset.role_by_name("Bravo").position, 2)
+
+    def test_warm_start_seeds_eligible_groups(self):
+        group = Group.objects.create(name="Alpha")
+        self.fetch()
+        cache.delete(ELIGIBLE_GROUPS_KEY)
+
+        self.assertTrue(warm_from_snapshot())
+
+        self.assertIn(group.pk, get_eligible_group_ids())
+
+    def test_prune_keeps_latest(self):
+        self.fetch()
+        self.guild.roles[11]["name"] = "Charlie"
+        self.fetch()
+        stale = timezone.now() - dt.timedelta(days=90)
+        RolesetSnapshot.objects.update(last_seen_at=stale)
+        RolesetSnapshot.objects.filter(
+            pk=RolesetSnapshot.objects.order_by("pk").values("pk")[:1]
+        ).update(last_seen_at=stale - dt.timedelta(days=1))
+
+        self.assertEqual(prune_roleset_snapshots(days=30), 1)
+        self.assertEqual(RolesetSnapshot.objects.get().roles[2][1], "Charlie")
+
+    def test_dry_run_from_snapshot_skips_discord(self):
+        DiscordRoleObfuscation.objects.create(
+            group=Group.objects.create(name="Alpha"), opt_out=False
+        )
+        self.fetch()
+        requests = len(self.guild.requests)
+        out = StringIO()
+
+        with fake_bot_client(self.guild):
+            call_command(
+                "obfuscate_sync",
+                "--phases",
+                "sync",
+                "--dry-run",
+                "--from-snapshot",
+                stdout=out,
+            )
+            with self.assertRaises(CommandError):
+                call_command("obfuscate_sync", "--from-snapshot", stdout=StringIO())
+
+        self.assertIn("Using roleset snapshot with 3 roles.", out.getvalue())
+        self.assertEqual(len(self.guild.requests), requests)
+        self.assertEqual(self.guild.roles[10]["name"], "Alpha")
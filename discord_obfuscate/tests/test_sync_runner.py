@@ -0,0 +1,140 @@
+"""
+Discord Obfuscate obfuscate_sync command tests against the fake guild
+"""
+
+# Standard Library
+from io import StringIO
+from unittest import mock
+
+# Django
+from django.contrib.auth.models import Group
+from django.core.management import call_command
+from django.test import TestCase
+
+# Discord Obfuscate App
+from discord_obfuscate import tasks
+from discord_obfuscate.discord_async import RoleUpdate
+from discord_obfuscate.fake_discord import FakeGuild, fake_bot_client
+from discord_obfuscate.models import DiscordRoleObfuscation, SyncRun
+from discord_obfuscate.obfuscation import role_name_for_group
+from discord_obfuscate.sync_runner import run_sync
+
+
+class SyncRunnerTestCase(TestCase):
+    """
+    Three configured groups whose roles still carry the original names
+    """
+
+    def setUp(self):
+        self.configs = [
+            DiscordRoleObfuscation.objects.create(
+                group=Group.objects.create(name=name), opt_out=False
+            )
+            for name in ("Alpha", "Bravo", "Charlie")
+        ]
+        roles = [{"id": 1, "name": "@everyone", "position": 0}]
+        roles.extend(
+            {"id": 10 + index, "name": config.group.name, "position": index + 1}
+            for index, config in enumerate(self.configs)
+        )
+        self.guild = FakeGuild(roles)
+
+
+class TestRunSync(SyncRunnerTestCase):
+    """
+    TestRunSync
+    """
+
+    def test_syncs_in_batches_with_progress(self):
+        seen = []
+
+        with fake_bot_client(self.guild):
+            results = run_sync(
+                phases=["sync"],
+                batch_size=2,
+                progress=lambda result: seen.append((result.processed, result.total)),
+            )
+
+        self.assertEqual(seen, [(2, 3), (3, 3)])
+        self.assertEqual(len(self.guild.calls("PATCH")), 3)
+        self.assertEqual([result.phase for result in results], ["sync"])
+        self.assertEqual(results[0].count, 3)
+        self.assertEqual(results[0].renames, 3)
+        for config in self.configs:
+            config.refresh_from_db()
+            self.assertEqual(
+                self.guild.roles[config.role_id]["name"],
+                role_name_for_group(config.group, config),
+            )
+        run = SyncRun.objects.get()
+        self.assertEqual(run.task_name, "obfuscate_sync_names")
+        self.assertEqual(run.renames_sent, 3)
+
+    def test_only_changed_skips_synced_configs(self):
+        with fake_bot_client(self.guild):
+            run_sync(phases=["sync"])
+            patches = len(self.guild.calls("PATCH"))
+            results = run_sync(phases=["sync"], only_changed=True)
+
+        self.assertEqual(results[0].total, 0)
+        self.assertEqual(len(self.guild.calls("PATCH")), patches)
+
+    def test_only_changed_after_single_group_syncs(self):
+        self.configs[0].role_color = "#112233"
+        self.configs[0].save()
+        with fake_bot_client(self.guild):
+            for config in self.configs:
+                tasks.sync_group_role(config.group_id)
+            patches = len(self.guild.calls("PATCH"))
+            results = run_sync(phases=["sync"], only_changed=True)
+
+            self.assertEqual(results[0].total, 0)
+            self.assertEqual(len(self.guild.calls("PATCH")), patches)
+
+            self.guild.roles[10]["color"] = 0
+            results = run_sync(phases=["sync"], only_changed=True)
+
+        self.assertEqual(results[0].total, 1)
+        self.assertEqual(self.guild.roles[10]["color"], 0x112233)
+
+    def test_dry_run_sends_nothing_and_rolls_back(self):
+        with fake_bot_client(self.guild):
+            results = run_sync(phases=["sync", "rotate"], dry_run=True)
+
+        self.assertEqual(self.guild.calls("PATCH"), [])
+        self.assertTrue(self.guild.calls("GET"))
+        self.assertEqual(results[0].renames, 3)
+        self.assertEqual(self.guild.roles[10]["name"], "Alpha")
+        self.assertFalse(DiscordRoleObfuscation.objects.exclude(role_id=None).exists())
+        self.assertFalse(SyncRun.objects.exists())
+
+    def test_concurrency_overrides_setting(self):
+        updates = [RoleUpdate(10, name="A"), RoleUpdate(11, name="B")]
+
+        with (
+            mock.patch.object(
+                tasks, "_apply_role_updates_threaded", return_value=[True, True]
+            ) as threaded,
+            tasks.role_update_options(concurrency=4),
+        ):
+            tasks._apply_role_updates(updates)
+
+        threaded.assert_called_once_with(updates, 4)
+
+
+class TestObfuscateSyncCommand(SyncRunnerTestCase):
+    """
+    TestObfuscateSyncCommand
+    """
+
+    def test_prints_progress_and_phase_timings(self):
+        out = StringIO()
+
+        with fake_bot_client(self.guild):
+            call_command("obfuscate_sync", "--phases", "sync", "--dry-run", stdout=out)
+
+        output = out.getvalue()
+        self.assertIn("3/3", output)
+        self.assertIn("renames", output)
+        self.assertIn("Dry run", output)
+        self.assertEqual(self.guild.calls("PATCH"), [])
@@ -0,0 +1,170 @@
+"""
+Discord Obfuscate task tests against the fake guild
+"""
+
+# Standard Library
+from unittest import mock
+
+# Django
+from django.contrib.auth.models import Group
+from django.test import TestCase
+
+# Discord Obfuscate App
+from discord_obfuscate import tasks
+from discord_obfuscate.constants import ROLE_MATCH_DESIRED, ROLE_MATCH_NONE
+from discord_obfuscate.fake_discord import (
+    FakeDiscordError,
+    FakeGuild,
+    fake_bot_client,
+)
+from discord_obfuscate.models import DiscordRoleObfuscation
+from discord_obfuscate.obfuscation import fetch_roleset, role_name_for_group
+
+
+class TestFakeGuild(TestCase):
+    """
+    TestFakeGuild
+    """
+
+    def test_enforces_role_cap(self):
+        guild = FakeGuild.synthetic(3, max_roles=4)
+
+        with fake_bot_client(guild) as client:
+            with self.assertRaises(FakeDiscordError) as ctx:
+                client._api_request("post", "guilds/1/roles", {"name": "Extra"})
+
+        self.assertEqual(ctx.exception.body["code"], 30005)
+
+    def test_reorder_follows_position_semantics(self):
+        guild = FakeGuild.synthetic(3)
+
+        with fake_bot_client(guild):
+            self.assertTrue(tasks._reorder_roles_payload([{"id": 4, "position": 1}]))
+
+        names = [role["name"] for role in guild.ordered_roles()]
+        self.assertEqual(names, ["@everyone", "Role 3", "Role 1", "Role 2"])
+
+
+class TestTasksWithFakeGuild(TestCase):
+    """
+    TestTasksWithFakeGuild
+    """
+
+    def test_fetch_roleset_reads_positions(self):
+        guild = FakeGuild.synthetic(2)
+
+        with fake_bot_client(guild):
+            roleset = fetch_roleset(use_cache=False)
+
+        self.assertEqual(len(roleset), 3)
+        self.assertEqual(roleset.role_by_name("Role 2").position, 2)
+
+    def test_update_role_retries_after_rate_limit(self):
+        guild = FakeGuild.synthetic(1, rate_limit_first=1)
+
+        with (
+            fake_bot_client(guild) as client,
+            mock.patch.object(tasks.time, "sleep") as sleep,
+        ):
+            self.assertTrue(tasks._update_role(2, name="Renamed"))
+
+        sleep.assert_called_once()
+        self.assertEqual(len(guild.calls("PATCH")), 2)
+        self.assertEqual(guild.roles[2]["name"], "Renamed")
+        self.assertEqual(client.invalidations, 1)
+
+    def test_sync_all_roles_renames_roles(self):
+        group = Group.objects.create(name="Alpha")
+        config = DiscordRoleObfuscation.objects.create(group=group, opt_out=False)
+        guild = FakeGuild(
+            [{"id": "1", "name": "@everyone"}, {"id": "2", "name": "Alpha"}]
+        )
+
+        with fake_bot_client(guild):
+            self.assertEqual(tasks.sync_all_roles(), 1)
+
+        config.refresh_from_db()
+        self.assertEqual(guild.roles[2]["name"], role_name_for_group(group, config))
+        self.assertEqual(config.role_id, 2)
+        self.assertEqual(config.role_match, ROLE_MATCH_DESIRED)
+        self.assertEqual(len(guild.calls("PATCH")), 1)
+        # The role index is built from the renamed roleset, not a second fetch.
+        self.assertEqual(len(guild.calls("GET")), 2)
+
+
+class TestRotationWithFakeGuild(TestCase):
+    """
+    TestRotationWithFakeGuild
+    """
+
+    def setUp(self):
+        self.configs = {
+            name: DiscordRoleObfuscation.objects.create(
+                group=Group.objects.create(name=name),
+                opt_out=False,
+                use_random_key=True,
+                random_key=f"{name}-key",
+                random_key_rotate_name=True,
+            )
+            for name in ("Alpha", "Bravo", "Charlie")
+        }
+        roles = [{"id": 1, "name": "@everyone", "position": 0}]
+        roles.extend(
+            {"id": role_id, "name": role_name_for_group(config.group, config)}
+            for role_id, config in zip(
+                (10, 11), (self.configs["Alpha"], self.configs["Bravo"])
+            )
+        )
+        # Bravo's role cannot be edited and Charlie has no role at all.
+        self.guild = FakeGuild(roles, locked_role_ids={11})
+
+    def test_promotes_keys_only_for_renamed_roles(self):
+        with (
+            fake_bot_client(self.guild),
+            self.assertLogs("discord_obfuscate.tasks", level="INFO") as logs,
+        ):
+            self.assertEqual(tasks.rotate_random_keys_and_reorder_roles(), 1)
+
+        alpha, bravo, charlie = (
+            DiscordRoleObfuscation.objects.get(pk=config.pk)
+            for config in self.configs.values()
+        )
+        self.assertNotEqual(alpha.random_key, "Alpha-key")
+        self.assertEqual(
+            self.guild.roles[10]["name"], role_name_for_group(alpha.group, alpha)
+        )
+        self.assertEqual(alpha.role_match, ROLE_MATCH_DESIRED)
+
+        self.assertEqual(bravo.random_key, "Bravo-key")
+        self.assertEqual(
+            self.guild.roles[11]["name"], role_name_for_group(bravo.group, bravo)
+        )
+        self.assertEqual(charlie.random_key, "Charlie-key")
+        self.assertEqual(charlie.role_match, ROLE_MATCH_NONE)
+        for config in (alpha, bravo, charlie):
+            self.assertEqual(config.pending_random_key, "")
+
+        output = "\n".join(logs.output)
+        self.assertIn("Rotation rename failed for 1 groups", output)
+        self.assertIn("No Discord role found for 1 groups", output)
+
+
+class TestDiscoverConfigs(TestCase):
+    """
+    TestDiscoverConfigs
+    """
+
+    def test_created_count_skips_existing_configs(self):
+        existing = Group.objects.create(name="Alpha")
+        DiscordRoleObfuscation.objects.create(group=existing, opt_out=True)
+        new = Group.objects.create(name="Bravo")
+        seen = []
+
+        created = tasks.create_discovered_configs(
+            [existing.pk, new.pk], progress=lambda done, total: seen.append(done)
+        )
+
+        self.assertEqual(created, 1)
+        self.assertEqual(seen, [2])
+        self.assertEqual(DiscordRoleObfuscation.objects.count(), 2)
+        self.assertTrue(DiscordRoleObfuscation.objects.get(group=existing).opt_out)
@@ -0,0 +1,156 @@
+"""
+Discord Obfuscate JSONL export and import tests
+"""
+
+# Standard Library
+import json
+import sys
+from io import StringIO
+from unittest import mock
+
+# Django
+from django.contrib.auth.models import Group
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+# Discord Obfuscate App
+from discord_obfuscate.models import (
+    DiscordRoleColorRule,
+    DiscordRoleObfuscation,
+    DiscordRoleOrder,
+)
+from discord_obfuscate.transfer import export_jsonl, import_jsonl
+
+
+class TestTransfer(TestCase):
+    """
+    TestTransfer
+    """
+
+    def setUp(self):
+        for index in range(3):
+            DiscordRoleObfuscation.objects.create(
+                group=Group.objects.create(name=f"Group {index}"),
+                opt_out=False,
+                use_random_key=True,
+                random_key=f"key{index}",
+                divider_characters="┃,┆",
+            )
+        DiscordRoleColorRule.objects.create(
+            name="Pilots", pattern="Pilot *", priority=5
+        )
+        DiscordRoleOrder.objects.create(role_id=10, role_name="Alpha", sort_order=2)
+
+    def export(self) -> str:
+        out = StringIO()
+        call_command("obfuscate_export", stdout=out, stderr=StringIO())
+        return out.getvalue()
+
+    def test_round_trip_restores_rows(self):
+        data = self.export()
+        self.assertEqual(len(data.splitlines()), 5)
+        DiscordRoleObfuscation.objects.all().delete()
+        DiscordRoleColorRule.objects.all().delete()
+        DiscordRoleOrder.objects.all().delete()
+
+        stats = import_jsonl(data.splitlines())
+
+        self.assertEqual(stats["obfuscation"]["created"], 3)
+        config = DiscordRoleObfuscation.objects.get(group__name="Group 1")
+        self.assertEqual(config.random_key, "key1")
+        self.assertEqual(config.get_dividers(), ["┃", "┆"])
+        self.assertEqual(DiscordRoleColorRule.objects.get().priority, 5)
+        self.assertEqual(DiscordRoleOrder.objects.get().role_name, "Alpha")
+
+    def test_import_updates_by_key_and_skips_unknown_groups(self):
+        lines = [
+            {"model": "obfuscation", "group": "Group 0", "opt_out": True},
+            {"model": "obfuscation", "group": "Missing", "opt_out": True},
+            {"model": "color_rule", "name": "Pilots", "pattern": "Pilots *"},
+            {"model": "role_order", "role_id": "10", "sort_order": 7},
+            {"model": "role_order", "role_id": 11, "role_name": "Bravo"},
+        ]
+
+        stats = import_jsonl(json.dumps(line) for line in lines)
+
+        self.assertEqual(
+            stats["obfuscation"], {"created": 0, "updated": 1, "skipped": 1}
+        )
+        self.assertEqual(
+            stats["role_order"], {"created": 1, "updated": 1, "skipped": 0}
+        )
+        config = DiscordRoleObfuscation.objects.get(group__name="Group 0")
+        self.assertTrue(config.opt_out)
+        self.assertEqual(config.random_key, "key0")
+        self.assertEqual(DiscordRoleColorRule.objects.get().pattern, "Pilots *")
+        self.assertEqual(DiscordRoleOrder.objects.get(role_id=10).sort_order, 7)
+
+    def test_import_queries_do_not_grow_with_rows(self):
+        Group.objects.bulk_create([Group(name=f"Extra {index}") for index in range(40)])
+        counts = []
+        for size in (10, 40):
+            lines = [
+                json.dumps({"model": "obfuscation", "group": f"Extra {index}"})
+                for index in range(size)
+            ]
+            DiscordRoleObfuscation.objects.filter(
+                group__name__startswith="Extra"
+            ).delete()
+            with CaptureQueriesContext(connection) as queries:
+                import_jsonl(lines)
+            counts.append(len(queries.captured_queries))
+
+        self.assertEqual(counts[0], counts[1])
+        self.assertEqual(
+            DiscordRoleObfuscation.objects.filter(
+                group__name__startswith="Extra"
+            ).count(),
+            40,
+        )
+
+    def test_import_drops_disallowed_dividers(self):
+        line = {
+            "model": "obfuscation",
+            "group": "Group 0",
+            "divider_characters": "-,┇,_",
+        }
+
+        import_jsonl([json.dumps(line)])
+
+        config = DiscordRoleObfuscation.objects.get(group__name="Group 0")
+        self.assertEqual(config.get_dividers(), ["┇"])
+
+    def test_invalid_line_imports_nothing(self):
+        lines = [
+            json.dumps({"model": "role_order", "role_id": 12}),
+            json.dumps({"model": "role_order", "role_id": 13, "sort_order": "x"}),
+        ]
+
+        with (
+            mock.patch.object(sys, "stdin", StringIO("\n".join(lines))),
+            self.assertRaises(CommandError),
+        ):
+            call_command("obfuscate_import", "-", stdout=StringIO())
+
+        self.assertFalse(DiscordRoleOrder.objects.filter(role_id=12).exists())
+
+    def test_export_streams_selected_models(self):
+        out = StringIO()
+
+        count = export_jsonl(out, ["role_order"])
+
+        self.assertEqual(count, 1)
+        self.assertEqual(
+            json.loads(out.getvalue()),
+            {
+                "model": "role_order",
+                "role_id": 10,
+                "role_name": "Alpha",
+                "role_color": "",
+                "sort_order": 2,
+                "locked": False,
+            },
+        )
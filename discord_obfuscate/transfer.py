@@ -0,0 +1,198 @@
+"""Streaming JSONL export and import of obfuscation configs, color rules and role order.
+
+One JSON object per line, tagged with its ``model``. Obfuscation configs are keyed
+by group name, color rules by name and role order entries by role id, so an import
+updates matching rows and creates the rest. Rows are read and written in chunks,
+keeping memory flat for any number of rows.
+"""
+
+# Standard Library
+import json
+from typing import Iterable, Iterator
+
+# Django
+from django.contrib.auth.models import Group
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+# Discord Obfuscate App
+from discord_obfuscate.cache import bump_mapping_version
+from discord_obfuscate.models import (
+    DiscordRoleColorRule,
+    DiscordRoleObfuscation,
+    DiscordRoleOrder,
+)
+
+CHUNK_SIZE = 500
+
+OBFUSCATION_FIELDS = [
+    "opt_out",
+    "obfuscation_type",
+    "obfuscation_format",
+    "divider_characters",
+    "min_chars_before_divider",
+    "custom_name",
+    "use_random_key",
+    "random_key",
+    "random_key_rotate_name",
+    "random_key_rotate_position",
+    "role_color",
+]
+COLOR_RULE_FIELDS = ["pattern", "enabled", "case_sensitive", "priority"]
+ROLE_ORDER_FIELDS = ["role_name", "role_color", "sort_order", "locked"]
+
+# model tag -> (model, key in the file, key lookup, exported fields)
+MODELS = {
+    "obfuscation": (
+        DiscordRoleObfuscation,
+        "group",
+        "group__name",
+        OBFUSCATION_FIELDS,
+    ),
+    "color_rule": (DiscordRoleColorRule, "name", "name", COLOR_RULE_FIELDS),
+    "role_order": (DiscordRoleOrder, "role_id", "role_id", ROLE_ORDER_FIELDS),
+}
+
+
+class TransferError(ValueError):
+    """A line in an import file could not be applied."""
+
+
+def export_rows(models: Iterable[str] = tuple(MODELS)) -> Iterator[dict]:
+    """Yield one dict per row, streamed from the database in chunks."""
+    for tag in MODELS:
+        if tag not in models:
+            continue
+        model, key, lookup, fields = MODELS[tag]
+        queryset = model.objects.order_by(lookup).values(lookup, *fields)
+        for row in queryset.iterator(chunk_size=CHUNK_SIZE):
+            yield {"model": tag, key: row.pop(lookup), **row}
+
+
+def export_jsonl(handle, models: Iterable[str] = tuple(MODELS)) -> int:
+    """Write rows as JSON lines and return how many were written."""
+    count = 0
+    for row in export_rows(models):
+        handle.write(json.dumps(row, sort_keys=True) + "\n")
+        count += 1
+    return count
+
+
+def _clean(model, fields: list[str], row: dict, line_number: int) -> dict:
+    values = {}
+    for name in fields:
+        if name not in row:
+            continue
+        try:
+            values[name] = model._meta.get_field(name).to_python(row[name])
+        except ValidationError as exc:
+            raise TransferError(
+                f"Line {line_number}: invalid {name}: {'; '.join(exc.messages)}"
+            ) from exc
+    return values
+
+
+def _existing(tag: str, keys: list) -> dict:
+    model, _key, lookup, _fields = MODELS[tag]
+    if tag == "obfuscation":
+        queryset = model.objects.select_related("group").filter(group__name__in=keys)
+        return {obj.group.name: obj for obj in queryset}
+    return {
+        getattr(obj, lookup): obj
+        for obj in model.objects.filter(**{f"{lookup}__in": keys})
+    }
+
+
+def _apply_chunk(tag: str, rows: list[tuple[int, dict]], stats: dict) -> None:
+    """Upsert one chunk with one lookup query, a bulk_create and a bulk_update."""
+    model, key, _lookup, fields = MODELS[tag]
+    existing = _existing(tag, [row[key] for _, row in rows])
+    group_ids = {}
+    if tag == "obfuscation":
+        group_ids = dict(
+            Group.objects.filter(
+                name__in=[row[key] for _, row in rows if row[key] not in existing]
+            ).values_list("name", "pk")
+        )
+
+    now = timezone.now()
+    to_create = {}
+    to_update = {}
+    updated_fields = set()
+    for line_number, row in rows:
+        values = _clean(model, fields, row, line_number)
+        obj = existing.get(row[key]) or to_create.get(row[key])
+        if obj is None:
+            if tag == "obfuscation":
+                group_id = group_ids.get(row[key])
+                if group_id is None:
+                    stats["skipped"] += 1
+                    continue
+                obj = model(group_id=group_id)
+            else:
+                obj = model(**{key: row[key]})
+            to_create[row[key]] = obj
+        elif row[key] in existing:
+            to_update[row[key]] = obj
+            updated_fields.update(values)
+        for name, value in values.items():
+            setattr(obj, name, value)
+        if tag == "obfuscation":
+            obj.set_dividers(obj.get_dividers())
+        obj.updated_at = now
+
+    if to_create:
+        model.objects.bulk_create(to_create.values(), batch_size=CHUNK_SIZE)
+    if to_update:
+        model.objects.bulk_update(
+            to_update.values(),
+            sorted(updated_fields | {"updated_at"}),
+            batch_size=CHUNK_SIZE,
+        )
+    stats["created"] += len(to_create)
+    stats["updated"] += len(to_update)
+
+
+def _parse(lines: Iterable[str]) -> Iterator[tuple[int, str, dict]]:
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise TransferError(f"Line {line_number}: {exc.msg}") from exc
+        tag = row.get("model") if isinstance(row, dict) else None
+        if tag not in MODELS:
+            raise TransferError(f"Line {line_number}: unknown model {tag!r}")
+        key = MODELS[tag][1]
+        if row.get(key) in (None, ""):
+            raise TransferError(f"Line {line_number}: missing {key}")
+        if tag == "role_order":
+            try:
+                row[key] = int(row[key])
+            except (TypeError, ValueError) as exc:
+                raise TransferError(f"Line {line_number}: invalid {key}") from exc
+        yield line_number, tag, row
+
+
+def import_jsonl(lines: Iterable[str]) -> dict[str, dict[str, int]]:
+    """Upsert rows from JSON lines in one transaction; returns per-model counts.
+
+    Obfuscation configs for groups that do not exist are skipped, and divider
+    characters outside ALLOWED_DIVIDERS are dropped as they are in admin.
+    """
+    stats = {tag: {"created": 0, "updated": 0, "skipped": 0} for tag in MODELS}
+    pending = {tag: [] for tag in MODELS}
+    with transaction.atomic():
+        for line_number, tag, row in _parse(lines):
+            pending[tag].append((line_number, row))
+            if len(pending[tag]) >= CHUNK_SIZE:
+                _apply_chunk(tag, pending[tag], stats[tag])
+                pending[tag] = []
+        for tag, rows in pending.items():
+            if rows:
+                _apply_chunk(tag, rows, stats[tag])
+    bump_mapping_version()
+    return stats